@@ -18,7 +18,7 @@
   touch bitable <name>创建多维表格
   mv <src> <dst>      移动到当前目录下的文件夹
   rename <old> <new>  重命名
-  rm <name>           删除（带确认）
+  rm [-y] <name> ...  删除（可一次多个，带确认；-y 跳过确认）
   refresh             刷新当前目录缓存
 
 知识库命令：
@@ -37,15 +37,18 @@
   exit / q            退出
 """
 
+import atexit
 import os
 import sys
 import json
+import bisect
+import functools
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
-# 加载项目根目录的 .env 文件（override=True 防止旧 Shell 变量干扰）
 from feishu_kit.config import load_config as _load_feishu_config
-_load_feishu_config()
-
-from typing import List, Dict, Optional, Tuple, Any
+from typing import List, Dict, Callable, Iterator, Optional, Tuple, Any
 from prompt_toolkit import PromptSession
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.formatted_text import HTML
@@ -53,6 +56,8 @@ from prompt_toolkit.styles import Style
 from prompt_toolkit.history import InMemoryHistory
 
 from feishu_kit.drive_api import FeishuDriveAPI, FILE_TYPE_FOLDER
+from feishu_kit.http_session import build_session
+from feishu_kit.token_cache import DEFAULT_CACHE_DIR, cache_key
 from feishu_kit.sheet_builder import FeishuSheetBuilder
 from feishu_kit.bitable_builder import FeishuBitableBuilder
 from feishu_kit.wiki_api import FeishuWikiAPI
@@ -80,23 +85,152 @@ COL_BLUE    = "\033[94m"
 COL_MAGENTA = "\033[95m"   # wiki 模式使用紫色
 
 
+# 目录缓存有效期（秒）：过期后先返回旧数据，再在后台刷新
+CACHE_TTL = 5.0
+
+# 跨会话持久化的目录缓存：按应用分文件（与 token 缓存同目录），启动时只恢复 PERSIST_TTL 秒内写入的条目
+CACHE_DIR = DEFAULT_CACHE_DIR
+PERSIST_TTL = 60.0
+
+# 命令中阻塞 API 调用的最长等待时间（秒），等待期间可 Ctrl-C 放弃
+IO_TIMEOUT = 30.0
+# 云盘权限检测结果的有效期（秒）：期内启动直接信任上次的成功结果，跳过探测请求
+DRIVE_PROBE_TTL = 24 * 3600
+
+SPINNER_FRAMES = "|/-\\"
+
+
+# 文件类型图标缓存：(is_wiki, 类型) → 图标，由 FeishuShell._icon 按需填充
+_ICON_CACHE: Dict[Tuple[bool, str], str] = {}
+
+# 视为"文件夹"（可 cd 进入 / 作为 mv 目标）的云盘类型
+_FOLDER_TYPES = frozenset({FILE_TYPE_FOLDER})
+
+# 启动时判断一次 stdout 是否为终端（导入后再重定向 stdout 不会被感知）
+_IS_TTY = sys.stdout.isatty()
+
+
 def _c(text: str, color: str) -> str:
     """包裹 ANSI 颜色（终端非 TTY 时自动跳过）。"""
-    if not sys.stdout.isatty():
-        return text
-    return f"{color}{text}{COL_RESET}"
+    return f"{color}{text}{COL_RESET}" if _IS_TTY else text
+
+
+def _atomic_write(path: str, data: bytes, mode: Optional[int] = None) -> None:
+    """
+    先写同目录临时文件并 fsync，再原子替换目标文件，避免中途中断留下半个文件。
+    指定 mode 时临时文件按该权限创建（如含目录名 / token 的缓存用 0o600）。
+    """
+    tmp = path + ".tmp"
+    if mode is None:
+        f = open(tmp, "wb")
+    else:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        os.fchmod(fd, mode)   # 临时文件已存在时 os.open 不会改权限
+        f = os.fdopen(fd, "wb")
+    with f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ────────────────────────────────────────────
+# 帮助文本
+# ────────────────────────────────────────────
+
+_DRIVE_CMDS: Tuple[Tuple[str, str], ...] = (
+    ("ls / ls -l",          "列出当前目录（-l 显示 token）"),
+    ("cd <name>",           "进入子文件夹 / wiki 节点"),
+    ("cd ..",               "返回上一级"),
+    ("pwd",                 "显示当前路径"),
+    ("open <name>",         "打印飞书网页链接"),
+    ("mkdir <name>",        "创建文件夹（仅云盘模式）"),
+    ("touch sheet <name>",  "创建电子表格（云盘）/ wiki 节点（wiki 模式）"),
+    ("touch bitable <name>","创建多维表格（云盘）/ wiki 节点（wiki 模式）"),
+    ("touch doc <name>",    "创建文档节点（仅 wiki 模式）"),
+    ("mv <src> <dst>",      "移动文件 / wiki 节点"),
+    ("rename <old> <new>",  "重命名（仅云盘模式）"),
+    ("rm [-y] <name> ...",  "删除文件 / wiki 节点（可多个，-y 跳过确认）"),
+    ("refresh",             "刷新缓存"),
+)
+_WIKI_CMDS: Tuple[Tuple[str, str], ...] = (
+    ("wiki spaces",         "列出可访问的知识库空间"),
+    ("wiki <space_id>",     "进入指定知识库空间"),
+    ("wiki node <token>",   "通过节点 token 直接跳转"),
+    ("wiki @<别名>",        "通过书签别名跳转"),
+    ("bm <别名>",           "将当前 wiki 节点保存为书签"),
+    ("bm list",             "列出所有书签"),
+    ("bm rm <别名>",        "删除书签"),
+)
+_OTHER_CMDS: Tuple[Tuple[str, str], ...] = (
+    ("help",   "显示此帮助"),
+    ("exit / q", "退出"),
+)
+
+
+@functools.lru_cache(maxsize=2)
+def _render_help(tty: bool) -> str:
+    """渲染完整帮助文本（按是否 TTY 各缓存一份）。"""
+    def col(text: str, color: str) -> str:
+        return f"{color}{text}{COL_RESET}" if tty else text
+
+    lines = [""]
+    lines.append(col("  ── 云盘 & 通用 ──────────────────────────────────────", COL_GREY))
+    lines += [f"  {col(cmd, COL_CYAN):<32}  {desc}" for cmd, desc in _DRIVE_CMDS]
+    lines.append("")
+    lines.append(col("  ── 知识库（Wiki）────────────────────────────────────", COL_GREY))
+    lines += [f"  {col(cmd, COL_MAGENTA):<32}  {desc}" for cmd, desc in _WIKI_CMDS]
+    lines.append("")
+    lines += [f"  {col(cmd, COL_CYAN):<32}  {desc}" for cmd, desc in _OTHER_CMDS]
+    lines.append("")
+    return "\n".join(lines)
 
 
 # ────────────────────────────────────────────
 # Tab 补全
 # ────────────────────────────────────────────
 
+# 命令与子命令候选（预先排序，补全时用二分查找定位前缀区间）
+_COMMANDS: List[str] = sorted([
+    "ls", "cd", "pwd", "open", "mkdir", "touch", "mv",
+    "rename", "rm", "refresh", "wiki", "bm", "help", "exit", "q",
+])
+_TOUCH_SUBS_WIKI: List[str]  = sorted(["doc", "sheet", "bitable"])
+_TOUCH_SUBS_DRIVE: List[str] = sorted(["sheet", "bitable"])
+_WIKI_SUBS: List[str]        = sorted(["spaces", "node"])
+_BM_SUBS: List[str]          = sorted(["list", "rm"])
+
+# 参数无需补全的命令（输入参数时直接返回）与需要补全文件名的命令
+_NO_COMPLETE_CMDS = frozenset({"ls", "pwd", "mkdir", "refresh", "help", "exit", "q"})
+_FILE_ARG_CMDS    = frozenset({"cd", "open", "mv", "rename", "rm"})
+
+
+def _iter_prefixed(sorted_items: List[str], prefix: str) -> Iterator[str]:
+    """在已排序列表中二分定位前缀区间，依次产出以 prefix 开头的项。"""
+    i = bisect.bisect_left(sorted_items, prefix)
+    while i < len(sorted_items) and sorted_items[i].startswith(prefix):
+        yield sorted_items[i]
+        i += 1
+
+
 class FeishuCompleter(Completer):
     """根据命令上下文动态补全文件名。"""
 
     def __init__(self, shell: "FeishuShell"):
         self._shell = shell
 
+    def _alias_completions(self, prefix: str, with_at: bool) -> Iterator[Completion]:
+        """补全书签别名；with_at=True 时候选带 @ 前缀（prefix 也应以 @ 开头）。"""
+        bookmarks = self._shell._bookmarks
+        bare = prefix[1:] if with_at else prefix
+        for alias in _iter_prefixed(self._shell._bm_sorted, bare):
+            candidate = "@" + alias if with_at else alias
+            yield Completion(
+                candidate,
+                start_position=-len(prefix),
+                display=f"{candidate}  ({bookmarks[alias].get('title', '')})",
+            )
+
     def get_completions(self, document, complete_event):
         text = document.text_before_cursor.lstrip()
         words = text.split()
@@ -106,95 +240,60 @@ class FeishuCompleter(Completer):
         cmd = words[0].lower()
         # 正在输入命令本身
         if len(words) == 1 and not text.endswith(" "):
-            cmds = ["ls", "cd", "pwd", "open", "mkdir", "touch", "mv",
-                    "rename", "rm", "refresh", "wiki", "bm", "help", "exit", "q"]
-            for c in cmds:
-                if c.startswith(cmd):
-                    yield Completion(c, start_position=-len(words[0]))
+            for c in _iter_prefixed(_COMMANDS, cmd):
+                yield Completion(c, start_position=-len(words[0]))
+            return
+        if cmd in _NO_COMPLETE_CMDS:
             return
 
         # touch 子命令补全（wiki 模式多一个 doc）
         if cmd == "touch" and len(words) == 2 and not text.endswith(" "):
-            subs = ["doc", "sheet", "bitable"] if self._shell.is_wiki_mode else ["sheet", "bitable"]
-            for sub in subs:
-                if sub.startswith(words[1].lower()):
-                    yield Completion(sub, start_position=-len(words[1]))
+            subs = _TOUCH_SUBS_WIKI if self._shell.is_wiki_mode else _TOUCH_SUBS_DRIVE
+            for sub in _iter_prefixed(subs, words[1].lower()):
+                yield Completion(sub, start_position=-len(words[1]))
             return
 
         # wiki 子命令 / 书签别名补全
         if cmd == "wiki" and len(words) == 2 and not text.endswith(" "):
             prefix = words[1]
-            for sub in ["spaces", "node"]:
-                if sub.startswith(prefix.lower()):
-                    yield Completion(sub, start_position=-len(prefix))
+            for sub in _iter_prefixed(_WIKI_SUBS, prefix.lower()):
+                yield Completion(sub, start_position=-len(prefix))
             # @别名补全
-            if prefix.startswith("@") or not prefix:
-                for alias in self._shell._bookmarks:
-                    candidate = "@" + alias
-                    if candidate.startswith(prefix):
-                        info = self._shell._bookmarks[alias]
-                        yield Completion(
-                            candidate,
-                            start_position=-len(prefix),
-                            display=f"{candidate}  ({info.get('title', '')})",
-                        )
+            if prefix.startswith("@"):
+                yield from self._alias_completions(prefix, with_at=True)
             return
 
         # bm 子命令补全
         if cmd == "bm" and len(words) == 2 and not text.endswith(" "):
             prefix = words[1]
-            for sub in ["list", "rm"]:
-                if sub.startswith(prefix.lower()):
-                    yield Completion(sub, start_position=-len(prefix))
+            for sub in _iter_prefixed(_BM_SUBS, prefix.lower()):
+                yield Completion(sub, start_position=-len(prefix))
             # 书签别名补全（用于 bm rm）
-            for alias in self._shell._bookmarks:
-                if alias.startswith(prefix):
-                    yield Completion(alias, start_position=-len(prefix),
-                                     display=f"{alias}  ({self._shell._bookmarks[alias].get('title', '')})")
+            yield from self._alias_completions(prefix, with_at=False)
             return
 
         # bm rm <别名> 的第三个词补全
         if cmd == "bm" and len(words) == 3 and words[1] == "rm" and not text.endswith(" "):
-            prefix = words[2]
-            for alias in self._shell._bookmarks:
-                if alias.startswith(prefix):
-                    yield Completion(alias, start_position=-len(prefix),
-                                     display=f"{alias}  ({self._shell._bookmarks[alias].get('title', '')})")
+            yield from self._alias_completions(words[2], with_at=False)
             return
 
         # 文件名/节点名补全
-        if cmd in ("cd", "open", "mv", "rename", "rm"):
+        if cmd in _FILE_ARG_CMDS:
             is_wiki = self._shell.is_wiki_mode
             folders_only = not is_wiki and (cmd == "cd" or (cmd == "mv" and len(words) >= 3))
             prefix = words[-1] if len(words) > 1 else ""
 
             # @别名补全（cd / wiki 都支持）
             if prefix.startswith("@"):
-                for alias in self._shell._bookmarks:
-                    candidate = "@" + alias
-                    if candidate.startswith(prefix):
-                        info = self._shell._bookmarks[alias]
-                        yield Completion(
-                            candidate,
-                            start_position=-len(prefix),
-                            display=f"{candidate}  ({info.get('title', '')})",
-                        )
+                yield from self._alias_completions(prefix, with_at=True)
                 return
 
-            files = self._shell.get_cached_files()
-            for f in files:
-                name = f.get("name", "") or f.get("title", "")
-                ftype = f.get("type") or f.get("obj_type", "")
-                is_folder = ftype == FILE_TYPE_FOLDER or f.get("has_child", False)
+            prefix_lower = prefix.lower()
+            for name_lower, name, is_folder, display in self._shell.get_completion_index():
                 if folders_only and not is_folder:
                     continue
-                if name.lower().startswith(prefix.lower()):
-                    icon = "📁 " if is_folder else ""
-                    yield Completion(
-                        name,
-                        start_position=-len(prefix),
-                        display=f"{icon}{name}",
-                    )
+                if name_lower.startswith(prefix_lower):
+                    yield Completion(name, start_position=-len(prefix), display=display)
 
 
 # ────────────────────────────────────────────
@@ -211,26 +310,53 @@ class FeishuShell:
     """
 
     def __init__(self):
-        self.api = FeishuDriveAPI()
+        # 四个 API 实例共用一个 HTTP 会话，命令之间复用到 open.feishu.cn 的连接
+        self._http = build_session(pool_connections=4, pool_maxsize=10)
+        self._http.headers.update({"User-Agent": "feishu-kit-cli"})
+
+        self.api = FeishuDriveAPI(session=self._http)
         self.wiki_api = FeishuWikiAPI(
             app_id=self.api.app_id,
             app_secret=self.api.app_secret,
             domain=self.api.domain,
+            session=self._http,
         )
         self.sheet_builder  = FeishuSheetBuilder(
-            app_id=self.api.app_id, app_secret=self.api.app_secret
+            app_id=self.api.app_id, app_secret=self.api.app_secret, session=self._http
         )
         self.bitable_builder = FeishuBitableBuilder(
-            app_id=self.api.app_id, app_secret=self.api.app_secret
+            app_id=self.api.app_id, app_secret=self.api.app_secret, session=self._http
         )
 
         self.path_stack: List[Tuple[str, str]] = []
         self.mode_stack: List[str] = []          # "drive" | "wiki"
         self.wiki_space_id: str = ""             # 当前 wiki 空间 ID
 
-        # drive 和 wiki 各自独立的缓存
-        self.file_cache: Dict[str, List[Dict]] = {}
-        self.wiki_cache: Dict[str, List[Dict]] = {}
+        # drive 和 wiki 各自独立的缓存：token → (写入时间, 列表)
+        self.file_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        self.wiki_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        # 正在进行的列表请求 (is_wiki, token) → Future，保证同一目录同时只有一个请求
+        self._inflight: Dict[Tuple[bool, str], Future] = {}
+        # 每个目录被 invalidate 的次数，用于丢弃失效前发起的请求结果
+        self._cache_gen: Dict[str, int] = {}
+        self._cache_lock = threading.Lock()
+        # 目录列表的 ETag (is_wiki, token) → etag，refresh 时用于条件请求（304 则无需重新下载）
+        self._dir_etag: Dict[Tuple[bool, str], str] = {}
+
+        # 目录索引（随缓存列表构建一次，缓存列表对象被替换后重建）：
+        #   _completion_index: token → [(小写名, 名称, 是否文件夹, 显示文本), ...]
+        #   _name_index / _name_index_lower: token → {名称 / 小写名: 条目}
+        #   _dup_names: token → 目录内重名的名称集合（按名称操作时提示歧义）
+        self._index_source: Dict[str, List[Dict]] = {}
+        self._completion_index: Dict[str, List[Tuple[str, str, bool, str]]] = {}
+        self._name_index: Dict[str, Dict[str, Dict]] = {}
+        self._name_index_lower: Dict[str, Dict[str, Dict]] = {}
+        self._dup_names: Dict[str, frozenset] = {}
+
+        # 后台预取：进入目录后提前拉取列表，首次 Tab / ls 无需等待网络
+        self._warm_executor = ThreadPoolExecutor(max_workers=2)
+        # 命令中的阻塞 API 调用放到 IO 线程池执行，主线程只负责等待（可被 Ctrl-C 打断）
+        self._io_pool = ThreadPoolExecutor(max_workers=4)
 
         # 权限标志（start() 中赋值）
         self._drive_available: bool = False
@@ -242,7 +368,22 @@ class FeishuShell:
             os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
             ".feishu_bookmarks.json",
         )
-        self._bookmarks: Dict[str, Dict] = self._load_bookmarks()
+        # 运行状态（云盘权限检测结果等），与目录缓存一样按应用存放在 CACHE_DIR
+        app_key = cache_key(self.api.app_id, self.api.app_secret)
+        self._state_path = str(CACHE_DIR / f"state-{app_key}.json")
+        # 书签在首次用到时才读取（见 _bookmarks 属性）
+        self._bookmarks_data: Optional[Dict[str, Dict]] = None
+        self._bm_sorted: List[str] = []   # 已排序的别名，供补全二分查找
+
+        # 恢复上次会话的目录缓存，退出时写回（仅写这一次，不在每次 cd 时写盘）
+        self._cache_file = str(CACHE_DIR / f"dirs-{app_key}.json")
+        self._load_persisted_cache()
+        atexit.register(self._persist_cache)
+
+        self._prompt_cache: Optional[Tuple[Tuple[bool, bool, str], HTML]] = None
+
+        # 命令分发表：命令 → handler(parts)，parts[0] 为命令本身
+        self._dispatch = self._build_dispatch()
 
         self._session = PromptSession(
             history=InMemoryHistory(),
@@ -274,50 +415,325 @@ class FeishuShell:
             return "/"
         return "/" + "/".join(name for name, _ in self.path_stack)
 
+    def _run_io(self, fn, *args, spinner: bool = False, **kwargs):
+        """
+        在 IO 线程池中执行阻塞调用并等待结果。
+
+        等待期间按 Ctrl-C 会取消该调用并向上抛出 KeyboardInterrupt（由 REPL 吞掉），
+        超过 IO_TIMEOUT 抛出 RuntimeError。spinner=True 时在终端显示转圈提示。
+        """
+        return self._wait(self._io_pool.submit(fn, *args, **kwargs), spinner=spinner)
+
+    def _wait(self, fut: Future, spinner: bool = False, cancel: bool = True):
+        """分段等待 Future（可被 Ctrl-C 打断）；cancel=False 用于多方共享的 Future。"""
+        show = spinner and _IS_TTY
+        deadline = time.monotonic() + IO_TIMEOUT
+        frame = 0
+        try:
+            while True:
+                try:
+                    return fut.result(timeout=0.1)
+                except FutureTimeoutError:
+                    if time.monotonic() >= deadline:
+                        if cancel:
+                            fut.cancel()
+                        raise RuntimeError(f"请求超时（{IO_TIMEOUT:.0f}s）")
+                    if show:
+                        sys.stdout.write(SPINNER_FRAMES[frame % len(SPINNER_FRAMES)] + "\b")
+                        sys.stdout.flush()
+                        frame += 1
+        except KeyboardInterrupt:
+            if cancel:
+                fut.cancel()
+            raise
+        finally:
+            if show and frame:
+                sys.stdout.write(" \b")
+                sys.stdout.flush()
+
     def get_cached_files(self) -> List[Dict]:
-        """返回当前目录的文件/节点列表（优先使用缓存）。"""
+        """
+        返回当前目录的文件/节点列表。
+
+        缓存未过期直接返回；已过期则先返回旧数据，同时在后台刷新
+        （stale-while-revalidate）；无缓存时同步拉取。
+        """
         token = self.current_token
-        if self.is_wiki_mode:
-            if token not in self.wiki_cache:
-                self.wiki_cache[token] = self.wiki_api.list_nodes(
-                    self.wiki_space_id, token
-                )
-            return self.wiki_cache[token]
+        is_wiki = self.is_wiki_mode
+        cache = self.wiki_cache if is_wiki else self.file_cache
+        hit = cache.get(token)
+        if hit is None:
+            fut = self._fetch_shared(token, is_wiki, self.wiki_space_id)
+            return self._wait(fut, cancel=False)
+        ts, entries = hit
+        if time.monotonic() - ts >= CACHE_TTL:
+            # 过期：后台刷新，同一目录已有请求在进行时不会重复发起
+            self._fetch_shared(token, is_wiki, self.wiki_space_id)
+        return entries
+
+    def _ensure_index(self) -> str:
+        """按当前缓存列表构建补全索引与名称索引（已是最新则跳过），返回当前 token。"""
+        entries = self.get_cached_files()
+        token = self.current_token
+        if self._index_source.get(token) is entries:
+            return token
+        completions: List[Tuple[str, str, bool, str]] = []
+        by_name: Dict[str, Dict] = {}
+        by_lower: Dict[str, Dict] = {}
+        dups = set()
+        for f in entries:
+            name = f.get("name", "") or f.get("title", "")
+            ftype = f.get("type") or f.get("obj_type", "")
+            is_folder = ftype in _FOLDER_TYPES or bool(f.get("has_child", False))
+            display = f"📁 {name}" if is_folder else name
+            name_lower = name.lower()
+            completions.append((name_lower, name, is_folder, display))
+            # 重名时保留第一个，与原先线性查找的行为一致
+            if by_name.setdefault(name, f) is not f:
+                dups.add(name)
+            by_lower.setdefault(name_lower, f)
+        self._completion_index[token] = completions
+        self._name_index[token] = by_name
+        self._name_index_lower[token] = by_lower
+        self._dup_names[token] = frozenset(dups)
+        self._index_source[token] = entries
+        return token
+
+    def get_completion_index(self) -> List[Tuple[str, str, bool, str]]:
+        """返回当前目录的补全索引，每项为 (小写名, 名称, 是否文件夹, 显示文本)。"""
+        return self._completion_index[self._ensure_index()]
+
+    def _fetch(
+        self, token: str, is_wiki: bool, space_id: str = "", etag: Optional[str] = None,
+    ) -> Optional[List[Dict]]:
+        """
+        直接调用 API 拉取目录列表（不经过缓存），并记录服务端返回的 ETag。
+
+        传入 etag 时发送条件请求，目录未变化（304）返回 None。
+        """
+        if is_wiki:
+            entries, new_etag = self.wiki_api.list_nodes_if_changed(space_id, token, etag=etag)
         else:
-            if token not in self.file_cache:
-                self.file_cache[token] = self.api.list_files(token)
-            return self.file_cache[token]
+            entries, new_etag = self.api.list_files_if_changed(token, etag=etag)
+        if entries is not None:
+            if new_etag:
+                self._dir_etag[(is_wiki, token)] = new_etag
+            else:
+                self._dir_etag.pop((is_wiki, token), None)
+        return entries
+
+    def _store(self, token: str, is_wiki: bool, entries: List[Dict]) -> None:
+        with self._cache_lock:
+            cache = self.wiki_cache if is_wiki else self.file_cache
+            cache[token] = (time.monotonic(), entries)
+
+    def _fetch_shared(
+        self,
+        token: str,
+        is_wiki: bool,
+        space_id: str,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ) -> Future:
+        """
+        单飞（single-flight）拉取目录列表并写入缓存。
+
+        同一目录已有请求在进行时直接返回该请求的 Future，同步读取、后台预取和
+        过期刷新共用一次 API 调用。请求期间目录被 invalidate_cache 清除时，
+        结果不再写回缓存（避免写入修改前的旧列表）。
+        """
+        key = (is_wiki, token)
+        with self._cache_lock:
+            fut = self._inflight.get(key)
+            if fut is not None:
+                return fut
+            gen = self._cache_gen.get(token, 0)
+            fut = (executor or self._io_pool).submit(
+                self._fetch_and_store, token, is_wiki, space_id, gen
+            )
+            self._inflight[key] = fut
+        fut.add_done_callback(lambda f: self._drop_inflight(key, f))
+        return fut
+
+    def _fetch_and_store(self, token: str, is_wiki: bool, space_id: str, gen: int) -> List[Dict]:
+        entries = self._fetch(token, is_wiki, space_id)
+        with self._cache_lock:
+            if self._cache_gen.get(token, 0) == gen:
+                cache = self.wiki_cache if is_wiki else self.file_cache
+                cache[token] = (time.monotonic(), entries)
+        return entries
+
+    def _drop_inflight(self, key: Tuple[bool, str], fut: Future) -> None:
+        with self._cache_lock:
+            if self._inflight.get(key) is fut:
+                del self._inflight[key]
+
+    def _warm_current(self) -> None:
+        """为当前目录提交一次后台预取（已缓存则跳过；失败时由 get_cached_files 同步兜底）。"""
+        if not self.path_stack:
+            return
+        token = self.current_token
+        is_wiki = self.is_wiki_mode
+        if token not in (self.wiki_cache if is_wiki else self.file_cache):
+            self._fetch_shared(token, is_wiki, self.wiki_space_id, self._warm_executor)
 
     def invalidate_cache(self, token: Optional[str] = None) -> None:
         """清除指定 token（或当前目录）的缓存。"""
         key = token or self.current_token
-        self.file_cache.pop(key, None)
-        self.wiki_cache.pop(key, None)
+        with self._cache_lock:
+            self._cache_gen[key] = self._cache_gen.get(key, 0) + 1
+            self._inflight.pop((False, key), None)
+            self._inflight.pop((True, key), None)
+            self.file_cache.pop(key, None)
+            self.wiki_cache.pop(key, None)
+            self._index_source.pop(key, None)
+            self._completion_index.pop(key, None)
+            self._name_index.pop(key, None)
+            self._name_index_lower.pop(key, None)
+            self._dup_names.pop(key, None)
+
+    def revalidate_cache(self) -> bool:
+        """
+        刷新当前目录缓存：有 ETag 时先发条件请求，未变化（304）只续期缓存时间；
+        否则退回 invalidate_cache 后重新拉取。返回目录内容是否有变化。
+        """
+        token = self.current_token
+        is_wiki = self.is_wiki_mode
+        etag = self._dir_etag.get((is_wiki, token))
+        cache = self.wiki_cache if is_wiki else self.file_cache
+        cached = cache.get(token)
+        if etag and cached is not None:
+            entries = self._run_io(self._fetch, token, is_wiki, self.wiki_space_id, etag)
+            if entries is None:
+                # 沿用原列表对象，目录索引无需重建
+                self._store(token, is_wiki, cached[1])
+                return False
+            self.invalidate_cache(token)
+            self._store(token, is_wiki, entries)
+            return True
+        self.invalidate_cache(token)
+        self.get_cached_files()
+        return True
+
+    # ──────────────────────────────────────────
+    # 目录缓存持久化（~/.cache/feishu_kit/dirs-<应用>.json）
+    # ──────────────────────────────────────────
+
+    def _load_persisted_cache(self) -> None:
+        """读取上次会话的目录缓存，丢弃超过 PERSIST_TTL 的条目。"""
+        try:
+            with open(self._cache_file, "r", encoding="utf-8") as f:
+                records = json.load(f)
+        except Exception:
+            return
+        if not isinstance(records, list):
+            return
+        now_wall, now_mono = time.time(), time.monotonic()
+        for rec in records:
+            try:
+                age = now_wall - float(rec["ts"])
+                mode, token, entries = rec["mode"], rec["token"], rec["entries"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not 0 <= age < PERSIST_TTL:
+                continue
+            if mode == "wiki":
+                # 空间根目录的 token 为空串，无法区分属于哪个空间，不恢复
+                if not token or not rec.get("space_id"):
+                    continue
+                self.wiki_cache[token] = (now_mono - age, entries)
+            elif mode == "drive":
+                self.file_cache[token] = (now_mono - age, entries)
+
+    def _persist_cache(self) -> None:
+        """退出时将未过期的目录缓存写入本应用的缓存文件，权限 0600（失败静默）。"""
+        now_wall, now_mono = time.time(), time.monotonic()
+        with self._cache_lock:
+            snapshot = [(False, t, v) for t, v in self.file_cache.items()]
+            snapshot += [(True, t, v) for t, v in self.wiki_cache.items()]
+        records = []
+        for is_wiki, token, (ts, entries) in snapshot:
+            age = now_mono - ts
+            if age >= PERSIST_TTL:
+                continue
+            rec: Dict[str, Any] = {
+                "mode":    "wiki" if is_wiki else "drive",
+                "token":   token,
+                "ts":      now_wall - age,
+                "entries": entries,
+            }
+            if is_wiki:
+                rec["space_id"] = entries[0].get("space_id", "") if entries else ""
+            records.append(rec)
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _atomic_write(
+                self._cache_file, json.dumps(records, ensure_ascii=False).encode("utf-8"), mode=0o600,
+            )
+        except OSError:
+            pass
+
+    def _icon(self, ftype: str, is_wiki: Optional[bool] = None) -> str:
+        """某类型的显示图标（模块级缓存，同一类型只查一次）；is_wiki 缺省为当前模式。"""
+        key = (self.is_wiki_mode if is_wiki is None else is_wiki, ftype)
+        icon = _ICON_CACHE.get(key)
+        if icon is None:
+            api = self.wiki_api if key[0] else self.api
+            icon = _ICON_CACHE[key] = api.icon(ftype)
+        return icon
 
     def find_file(self, name: str) -> Optional[Dict]:
-        """在当前目录中按名称查找文件/节点，大小写精确匹配。"""
-        for f in self.get_cached_files():
-            fname = f.get("name") or f.get("title", "")
-            if fname == name:
-                return f
-        return None
+        """在当前目录中按名称查找文件/节点，大小写精确匹配；重名时取第一个并提示。"""
+        return self.find_files(name)[0]
+
+    def find_files(self, *names: str) -> List[Optional[Dict]]:
+        """一次解析多个名称（目录索引只确认一次），返回与 names 顺序一致的条目列表。"""
+        token = self._ensure_index()
+        index = self._name_index[token]
+        dups = self._dup_names[token]
+        result = []
+        for name in names:
+            if name in dups:
+                print(_c(f'注意: 当前目录有多个「{name}」，将使用列表中的第一个', COL_YELLOW))
+            result.append(index.get(name))
+        return result
 
     # ──────────────────────────────────────────
     # 书签（持久化到 .feishu_bookmarks.json）
     # ──────────────────────────────────────────
 
+    @property
+    def _bookmarks(self) -> Dict[str, Dict]:
+        """书签字典，首次访问时从文件加载。"""
+        if self._bookmarks_data is None:
+            self._bookmarks_data = self._load_bookmarks()
+            self._bm_sorted = sorted(self._bookmarks_data)
+        return self._bookmarks_data
+
     def _load_bookmarks(self) -> Dict[str, Dict]:
-        if os.path.exists(self._bm_path):
+        if not os.path.exists(self._bm_path):
+            return {}
+        with open(self._bm_path, "rb") as fb:
+            raw = fb.read()
+        try:
+            # 优先用 orjson 解析（可选依赖，未安装时回退到标准库 json）
             try:
-                with open(self._bm_path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {}
+                import orjson
+                return orjson.loads(raw)
+            except ImportError:
+                return json.loads(raw.decode("utf-8"))
+        except ValueError as e:
+            print(_c(f"[!] 书签文件损坏，已忽略: {self._bm_path}（{e}）", COL_YELLOW), file=sys.stderr)
+            return {}
 
     def _save_bookmarks(self) -> None:
-        with open(self._bm_path, "w", encoding="utf-8") as f:
-            json.dump(self._bookmarks, f, ensure_ascii=False, indent=2)
+        bookmarks = self._bookmarks
+        self._bm_sorted = sorted(bookmarks)
+        try:
+            import orjson
+            data = orjson.dumps(bookmarks, option=orjson.OPT_INDENT_2)
+        except ImportError:
+            data = json.dumps(bookmarks, ensure_ascii=False, indent=2).encode("utf-8")
+        _atomic_write(self._bm_path, data)
 
     def _cmd_bm(self, args: List[str]) -> None:
         """
@@ -333,14 +749,16 @@ class FeishuShell:
             print()
             print(_c(f"  {'别名':<20} {'标题':<30} TOKEN", COL_BOLD))
             print(_c("  " + "─" * 70, COL_GREY))
+            rows: List[str] = []
             for alias, info in sorted(self._bookmarks.items()):
                 title = info.get("title", "")
                 token = info.get("token", "")
-                print(
+                rows.append(
                     f"  {_c('@' + alias, COL_MAGENTA):<20} "
                     f"{_c(title, COL_RESET):<30} "
                     f"{_c(token, COL_GREY)}"
                 )
+            sys.stdout.write("\n".join(rows) + "\n")
             print()
             return
 
@@ -374,23 +792,76 @@ class FeishuShell:
         self._save_bookmarks()
         print(_c(f'[✓] 已保存书签 "@{alias}" → 「{title}」  ({token})', COL_GREEN))
 
+    # ──────────────────────────────────────────
+    # 运行状态（持久化到 CACHE_DIR/state-<hash>.json）
+    # ──────────────────────────────────────────
+
+    def _load_state(self) -> Dict[str, Any]:
+        if os.path.exists(self._state_path):
+            try:
+                with open(self._state_path, "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if isinstance(state, dict):
+                    return state
+            except Exception:
+                pass
+        return {}
+
+    def _drive_probe_fresh(self) -> bool:
+        """上次云盘检测是否在 DRIVE_PROBE_TTL 内对同一根文件夹成功。"""
+        state = self._load_state()
+        try:
+            checked_at = float(state.get("drive_checked_at", 0))
+        except (TypeError, ValueError):
+            return False   # 状态文件损坏：当作未检测过
+        return (
+            bool(state.get("drive_available"))
+            and state.get("folder_token") == self.api.root_folder_token
+            and time.time() - checked_at < DRIVE_PROBE_TTL
+        )
+
+    def _save_drive_probe(self) -> None:
+        """记录云盘检测成功的时间（写入失败不影响使用）。"""
+        state = self._load_state()
+        state.update({
+            "drive_available":  True,
+            "drive_checked_at": time.time(),
+            "folder_token":     self.api.root_folder_token,
+        })
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            _atomic_write(
+                self._state_path,
+                json.dumps(state, ensure_ascii=False, indent=2).encode("utf-8"),
+                mode=0o600,
+            )
+        except OSError:
+            pass
+
     def _prompt_message(self):
+        """返回提示符 HTML；路径与模式不变时复用上次构建的对象。"""
+        key = (bool(self.path_stack), self.is_wiki_mode, self.current_path)
+        if self._prompt_cache is not None and self._prompt_cache[0] == key:
+            return self._prompt_cache[1]
         if not self.path_stack:
             # wiki-only 模式，尚未导航到任何节点
-            return HTML(
+            html = HTML(
                 '<prompt.bracket>[</prompt.bracket>'
                 '<prompt.wiki>📖 wiki-only</prompt.wiki>'
                 '<prompt.bracket>]</prompt.bracket>'
                 '<prompt.arrow> ❯ </prompt.arrow>'
             )
-        mode_prefix = "📖 " if self.is_wiki_mode else ""
-        path_color  = "prompt.wiki" if self.is_wiki_mode else "prompt.path"
-        return HTML(
-            f'<prompt.bracket>[</prompt.bracket>'
-            f'<{path_color}>{mode_prefix}{self.current_path}</{path_color}>'
-            f'<prompt.bracket>]</prompt.bracket>'
-            f'<prompt.arrow> ❯ </prompt.arrow>'
-        )
+        else:
+            mode_prefix = "📖 " if self.is_wiki_mode else ""
+            path_color  = "prompt.wiki" if self.is_wiki_mode else "prompt.path"
+            html = HTML(
+                f'<prompt.bracket>[</prompt.bracket>'
+                f'<{path_color}>{mode_prefix}{self.current_path}</{path_color}>'
+                f'<prompt.bracket>]</prompt.bracket>'
+                f'<prompt.arrow> ❯ </prompt.arrow>'
+            )
+        self._prompt_cache = (key, html)
+        return html
 
     # ──────────────────────────────────────────
     # 启动与主循环
@@ -417,11 +888,17 @@ class FeishuShell:
         self._drive_available = False
         drive_err = ""
         if default_mode != "wiki" and self.api.root_folder_token:
-            try:
-                self.api.list_files(self.api.root_folder_token)
+            if self._drive_probe_fresh():
+                # 最近已检测成功：跳过探测，根目录列表由后台预取
                 self._drive_available = True
-            except Exception as e:
-                drive_err = str(e)
+            else:
+                try:
+                    root_files = self.api.list_files(self.api.root_folder_token)
+                    self._store(self.api.root_folder_token, False, root_files)
+                    self._drive_available = True
+                    self._save_drive_probe()
+                except Exception as e:
+                    drive_err = str(e)
 
         # ── 步骤3：wiki 始终可用（与 drive 共用 token）────────────────────
         self._wiki_available = True  # token 已在步骤1验证成功
@@ -462,11 +939,15 @@ class FeishuShell:
         # ── Wiki 启动：自动显示书签列表（如有） ─────────────────────────
         if use_wiki_start and self._bookmarks:
             print(_c("  书签（可用 cd @<别名> 或 wiki @<别名> 快速跳转）:", COL_BOLD))
-            for alias, info in sorted(self._bookmarks.items()):
-                title = info.get("title", "")
-                print(f"    {_c('@' + alias, COL_MAGENTA):<22} {title}")
+            rows = [
+                f"    {_c('@' + alias, COL_MAGENTA):<22} {info.get('title', '')}"
+                for alias, info in sorted(self._bookmarks.items())
+            ]
+            sys.stdout.write("\n".join(rows) + "\n")
             print()
 
+        self._warm_current()
+
         while True:
             try:
                 raw = self._session.prompt(self._prompt_message())
@@ -483,102 +964,55 @@ class FeishuShell:
             parts = line.split()
             cmd = parts[0].lower()
 
+            if cmd in ("exit", "q"):
+                break
+            handler = self._dispatch.get(cmd)
+            if handler is None:
+                print(_c(f"未知命令: {cmd}（输入 help 查看帮助）", COL_YELLOW))
+                continue
+
             try:
-                if cmd in ("exit", "q"):
-                    break
-                elif cmd == "help":
-                    self._cmd_help()
-                elif cmd == "pwd":
-                    self._cmd_pwd()
-                elif cmd == "ls":
-                    verbose = len(parts) > 1 and parts[1] == "-l"
-                    self._cmd_ls(verbose=verbose)
-                elif cmd == "cd":
-                    target = parts[1] if len(parts) > 1 else ""
-                    self._cmd_cd(target)
-                elif cmd == "open":
-                    name = " ".join(parts[1:]) if len(parts) > 1 else ""
-                    self._cmd_open(name)
-                elif cmd == "mkdir":
-                    name = " ".join(parts[1:]) if len(parts) > 1 else ""
-                    self._cmd_mkdir(name)
-                elif cmd == "touch":
-                    sub = parts[1].lower() if len(parts) > 1 else ""
-                    name = " ".join(parts[2:]) if len(parts) > 2 else ""
-                    self._cmd_touch(sub, name)
-                elif cmd == "mv":
-                    src  = parts[1] if len(parts) > 1 else ""
-                    dst  = " ".join(parts[2:]) if len(parts) > 2 else ""
-                    self._cmd_mv(src, dst)
-                elif cmd == "rename":
-                    old = parts[1] if len(parts) > 1 else ""
-                    new = " ".join(parts[2:]) if len(parts) > 2 else ""
-                    self._cmd_rename(old, new)
-                elif cmd == "rm":
-                    name = " ".join(parts[1:]) if len(parts) > 1 else ""
-                    self._cmd_rm(name)
-                elif cmd == "refresh":
-                    self._cmd_refresh()
-                elif cmd == "wiki":
-                    arg1 = parts[1] if len(parts) > 1 else ""
-                    arg2 = parts[2] if len(parts) > 2 else ""
-                    self._cmd_wiki(arg1, arg2)
-                elif cmd == "bm":
-                    self._cmd_bm(parts[1:])
-                else:
-                    print(_c(f"未知命令: {cmd}（输入 help 查看帮助）", COL_YELLOW))
+                handler(parts)
             except KeyboardInterrupt:
                 print()
             except Exception as e:
                 print(_c(f"错误: {e}", COL_RED))
 
+        self._warm_executor.shutdown(wait=False)
+        self._io_pool.shutdown(wait=False)
+        self._http.close()
         print(_c("再见！", COL_GREY))
 
+    def _build_dispatch(self) -> Dict[str, Callable[[List[str]], None]]:
+        """构建命令分发表，参数切分逻辑集中在这里。"""
+        def arg(parts: List[str], i: int) -> str:
+            return parts[i] if len(parts) > i else ""
+
+        def rest(parts: List[str], i: int) -> str:
+            return " ".join(parts[i:]) if len(parts) > i else ""
+
+        return {
+            "help":    lambda p: self._cmd_help(),
+            "pwd":     lambda p: self._cmd_pwd(),
+            "ls":      lambda p: self._cmd_ls(verbose=arg(p, 1) == "-l"),
+            "cd":      lambda p: self._cmd_cd(arg(p, 1)),
+            "open":    lambda p: self._cmd_open(rest(p, 1)),
+            "mkdir":   lambda p: self._cmd_mkdir(rest(p, 1)),
+            "touch":   lambda p: self._cmd_touch(arg(p, 1).lower(), rest(p, 2)),
+            "mv":      lambda p: self._cmd_mv(arg(p, 1), rest(p, 2)),
+            "rename":  lambda p: self._cmd_rename(arg(p, 1), rest(p, 2)),
+            "rm":      lambda p: self._cmd_rm(*p[1:]),
+            "refresh": lambda p: self._cmd_refresh(),
+            "wiki":    lambda p: self._cmd_wiki(arg(p, 1), arg(p, 2)),
+            "bm":      lambda p: self._cmd_bm(p[1:]),
+        }
+
     # ──────────────────────────────────────────
     # 只读命令
     # ──────────────────────────────────────────
 
     def _cmd_help(self) -> None:
-        drive_cmds = [
-            ("ls / ls -l",          "列出当前目录（-l 显示 token）"),
-            ("cd <name>",           "进入子文件夹 / wiki 节点"),
-            ("cd ..",               "返回上一级"),
-            ("pwd",                 "显示当前路径"),
-            ("open <name>",         "打印飞书网页链接"),
-            ("mkdir <name>",        "创建文件夹（仅云盘模式）"),
-            ("touch sheet <name>",  "创建电子表格（云盘）/ wiki 节点（wiki 模式）"),
-            ("touch bitable <name>","创建多维表格（云盘）/ wiki 节点（wiki 模式）"),
-            ("touch doc <name>",    "创建文档节点（仅 wiki 模式）"),
-            ("mv <src> <dst>",      "移动文件 / wiki 节点"),
-            ("rename <old> <new>",  "重命名（仅云盘模式）"),
-            ("rm <name>",           "删除文件 / wiki 节点（带确认）"),
-            ("refresh",             "刷新缓存"),
-        ]
-        wiki_cmds = [
-            ("wiki spaces",         "列出可访问的知识库空间"),
-            ("wiki <space_id>",     "进入指定知识库空间"),
-            ("wiki node <token>",   "通过节点 token 直接跳转"),
-            ("wiki @<别名>",        "通过书签别名跳转"),
-            ("bm <别名>",           "将当前 wiki 节点保存为书签"),
-            ("bm list",             "列出所有书签"),
-            ("bm rm <别名>",        "删除书签"),
-        ]
-        other_cmds = [
-            ("help",   "显示此帮助"),
-            ("exit / q", "退出"),
-        ]
-        print()
-        print(_c("  ── 云盘 & 通用 ──────────────────────────────────────", COL_GREY))
-        for cmd, desc in drive_cmds:
-            print(f"  {_c(cmd, COL_CYAN):<32}  {desc}")
-        print()
-        print(_c("  ── 知识库（Wiki）────────────────────────────────────", COL_GREY))
-        for cmd, desc in wiki_cmds:
-            print(f"  {_c(cmd, COL_MAGENTA):<32}  {desc}")
-        print()
-        for cmd, desc in other_cmds:
-            print(f"  {_c(cmd, COL_CYAN):<32}  {desc}")
-        print()
+        print(_render_help(_IS_TTY))
 
     def _cmd_pwd(self) -> None:
         print(_c(self.current_path, COL_CYAN))
@@ -594,31 +1028,40 @@ class FeishuShell:
         print(_c(f"  {'ICON':<4} {'NAME':<40}{token_col}", COL_BOLD))
         print(_c("  " + "─" * (46 + (34 if verbose else 0)), COL_GREY))
 
-        if self.is_wiki_mode:
+        rows: List[str] = []
+        is_wiki = self.is_wiki_mode
+        icon_for = functools.partial(self._icon, is_wiki=is_wiki)
+
+        if is_wiki:
             # wiki 节点列表
             for node in files:
                 title    = node.get("title", "（无标题）")
                 ntoken   = node.get("node_token", "")
                 obj_type = node.get("obj_type", "wiki")
                 has_child = node.get("has_child", False)
-                icon     = self.wiki_api.icon(obj_type)
+                icon     = icon_for(obj_type)
                 display  = title + "/" if has_child else title
                 color    = COL_MAGENTA if has_child else COL_RESET
                 token_part = f"  {_c(ntoken, COL_GREY)}" if verbose else ""
-                print(f"  {icon:<5} {_c(display, color)}{token_part}")
+                rows.append(f"  {icon:<5} {_c(display, color)}{token_part}")
         else:
             # drive 文件列表（文件夹优先）
-            folders = [f for f in files if f.get("type") == FILE_TYPE_FOLDER]
-            others  = [f for f in files if f.get("type") != FILE_TYPE_FOLDER]
+            folders: List[Dict] = []
+            others:  List[Dict] = []
+            for f in files:
+                (folders if f.get("type") in _FOLDER_TYPES else others).append(f)
             for f in folders + others:
                 ftype  = f.get("type", "file")
                 fname  = f.get("name", "")
                 ftoken = f.get("token", "")
-                icon   = self.api.icon(ftype)
-                display_name = fname + "/" if ftype == FILE_TYPE_FOLDER else fname
-                name_color   = COL_BLUE if ftype == FILE_TYPE_FOLDER else COL_RESET
+                icon   = icon_for(ftype)
+                is_folder = ftype in _FOLDER_TYPES
+                display_name = fname + "/" if is_folder else fname
+                name_color   = COL_BLUE if is_folder else COL_RESET
                 token_part   = f"  {_c(ftoken, COL_GREY)}" if verbose else ""
-                print(f"  {icon:<5} {_c(display_name, name_color)}{token_part}")
+                rows.append(f"  {icon:<5} {_c(display_name, name_color)}{token_part}")
+        # 整个列表一次写出，避免逐行 print 的多次 write/flush
+        sys.stdout.write("\n".join(rows) + "\n")
 
         print()
         print(_c(f"  共 {len(files)} 个{'节点' if self.is_wiki_mode else '文件'}", COL_GREY))
@@ -641,6 +1084,7 @@ class FeishuShell:
                 return
             self.path_stack.pop()
             self.mode_stack.pop()
+            self._warm_current()
             return
 
         f = self.find_file(target)
@@ -653,11 +1097,12 @@ class FeishuShell:
             self.path_stack.append((target, f["node_token"]))
             self.mode_stack.append("wiki")
         else:
-            if f.get("type") != FILE_TYPE_FOLDER:
+            if f.get("type") not in _FOLDER_TYPES:
                 print(_c(f'"{target}" 不是文件夹', COL_YELLOW))
                 return
             self.path_stack.append((target, f["token"]))
             self.mode_stack.append("drive")
+        self._warm_current()
 
     def _cmd_open(self, name: str) -> None:
         if not name:
@@ -695,7 +1140,7 @@ class FeishuShell:
             self.wiki_space_id = space_id
             # 重建完整路径
             print(_c("正在解析节点路径...", COL_GREY), end="", flush=True)
-            chain = self.wiki_api.get_ancestor_chain(token)
+            chain = self._run_io(self.wiki_api.get_ancestor_chain, token, spinner=True)
             self.path_stack = []
             self.mode_stack = []
             for ancestor in chain:
@@ -703,7 +1148,9 @@ class FeishuShell:
                 k = ancestor.get("node_token", "")
                 self.path_stack.append((t, k))
                 self.mode_stack.append("wiki")
-            self.wiki_cache.pop(token, None)
+            with self._cache_lock:
+                self.wiki_cache.pop(token, None)
+            self._warm_current()
             title = info["title"]
             print(_c(f" ✓", COL_GREEN))
             print(_c(f'[✓] 已跳转到书签 "@{alias}" → 「{title}」  路径: {self.current_path}', COL_GREEN))
@@ -711,7 +1158,7 @@ class FeishuShell:
 
         if not arg1 or arg1 == "spaces":
             # 列出知识库空间
-            spaces = self.wiki_api.list_spaces()
+            spaces = self._run_io(self.wiki_api.list_spaces)
             if not spaces:
                 print(_c("  未找到可访问的知识库空间。", COL_YELLOW))
                 print(_c("  请在知识库设置 → 成员 中将应用添加为协作者。", COL_GREY))
@@ -733,16 +1180,16 @@ class FeishuShell:
                 print(_c("用法: wiki node <node_token>", COL_YELLOW))
                 return
             print(_c("正在解析节点路径...", COL_GREY), end="", flush=True)
-            node = self.wiki_api.get_node(node_token)
-            if not node:
+            # 回溯祖先链，构建完整 path_stack（链尾即目标节点本身）
+            chain = self._run_io(self.wiki_api.get_ancestor_chain, node_token, spinner=True)
+            if not chain:
                 print()
                 print(_c("未找到该节点", COL_RED))
                 return
+            node = chain[-1]
             space_id = node.get("space_id", "")
             self.wiki_space_id = space_id
 
-            # 回溯祖先链，构建完整 path_stack
-            chain = self.wiki_api.get_ancestor_chain(node_token)
             self.path_stack = []
             self.mode_stack = []
             for ancestor in chain:
@@ -750,6 +1197,7 @@ class FeishuShell:
                 k = ancestor.get("node_token", "")
                 self.path_stack.append((t, k))
                 self.mode_stack.append("wiki")
+            self._warm_current()
 
             title = node.get("title", node_token)
             print(_c(f" ✓", COL_GREEN))
@@ -760,7 +1208,7 @@ class FeishuShell:
         space_id = arg1
         self.wiki_space_id = space_id
         # 获取空间元信息（名称）
-        spaces = self.wiki_api.list_spaces()
+        spaces = self._run_io(self.wiki_api.list_spaces)
         space_name = next(
             (s.get("name", space_id) for s in spaces if s.get("space_id") == space_id),
             f"wiki:{space_id[-8:]}",
@@ -768,6 +1216,7 @@ class FeishuShell:
         # 进入 wiki 模式：以空字符串作为根节点 token（表示空间根目录）
         self.path_stack = [(space_name, "")]
         self.mode_stack = ["wiki"]
+        self._warm_current()
         print(_c(f"[✓] 已进入知识库: 「{space_name}」  输入 ls 查看节点", COL_GREEN))
 
     # ──────────────────────────────────────────
@@ -794,7 +1243,7 @@ class FeishuShell:
         if not name:
             print(_c("用法: mkdir <文件夹名>", COL_YELLOW))
             return
-        result = self.api.create_folder(name, self.current_folder_token)
+        result = self._run_io(self.api.create_folder, name, self.current_folder_token)
         self.invalidate_cache()
         print(_c(f'[✓] 文件夹已创建: 「{name}」  token={result["token"]}', COL_GREEN))
 
@@ -810,7 +1259,8 @@ class FeishuShell:
                 return
             obj_type = type_map[sub]
             parent = self.current_token
-            node = self.wiki_api.create_node(
+            node = self._run_io(
+                self.wiki_api.create_node,
                 self.wiki_space_id, name, obj_type=obj_type,
                 parent_node_token=parent,
             )
@@ -830,10 +1280,10 @@ class FeishuShell:
 
         folder_token = self.current_folder_token
         if sub == "sheet":
-            token = self.sheet_builder.create_spreadsheet(name, folder_token=folder_token)
+            token = self._run_io(self.sheet_builder.create_spreadsheet, name, folder_token=folder_token)
             ftype = "sheet"
         else:
-            token = self.bitable_builder.create_bitable(name, folder_token=folder_token)
+            token = self._run_io(self.bitable_builder.create_bitable, name, folder_token=folder_token)
             ftype = "bitable"
 
         self.invalidate_cache()
@@ -849,37 +1299,37 @@ class FeishuShell:
             print(_c("用法: mv <源名称> <目标名称>", COL_YELLOW))
             return
 
+        if src == dst:
+            print(_c("源和目标相同", COL_YELLOW))
+            return
+        src_entry, dst_entry = self.find_files(src, dst)
+        if src_entry is None:
+            print(_c(f'未找到: "{src}"', COL_YELLOW))
+            return
+
         if self.is_wiki_mode:
-            src_node = self.find_file(src)
-            if src_node is None:
-                print(_c(f'未找到: "{src}"', COL_YELLOW))
-                return
-            dst_node = self.find_file(dst)
-            if dst_node is None:
+            if dst_entry is None:
                 print(_c(f'目标节点未找到: "{dst}"', COL_YELLOW))
                 return
-            self.wiki_api.move_node(
+            self._run_io(
+                self.wiki_api.move_node,
                 self.wiki_space_id,
-                src_node["node_token"],
-                dst_node["node_token"],
+                src_entry["node_token"],
+                dst_entry["node_token"],
             )
             self.invalidate_cache()
             print(_c(f'[✓] 已移动: 「{src}」 → 「{dst}/」', COL_GREEN))
             return
 
-        src_file = self.find_file(src)
-        if src_file is None:
-            print(_c(f'未找到: "{src}"', COL_YELLOW))
-            return
-        dst_file = self.find_file(dst)
-        if dst_file is None:
+        if dst_entry is None:
             print(_c(f'目标文件夹未找到: "{dst}"', COL_YELLOW))
             return
-        if dst_file.get("type") != FILE_TYPE_FOLDER:
+        if dst_entry.get("type") not in _FOLDER_TYPES:
             print(_c(f'"{dst}" 不是文件夹', COL_YELLOW))
             return
 
-        self.api.move_file(src_file["token"], src_file.get("type", "file"), dst_file["token"])
+        ftype = src_entry.get("type", "file")
+        self._run_io(self.api.move_file, src_entry["token"], ftype, dst_entry["token"])
         self.invalidate_cache()
         print(_c(f'[✓] 已移动: 「{src}」 → 「{dst}/」', COL_GREEN))
 
@@ -899,24 +1349,46 @@ class FeishuShell:
             print(_c(f'未找到: "{old}"', COL_YELLOW))
             return
 
-        self.api.rename_file(f["token"], f.get("type", "file"), new)
+        self._run_io(self.api.rename_file, f["token"], f.get("type", "file"), new)
         self.invalidate_cache()
         print(_c(f'[✓] 已重命名: 「{old}」 → 「{new}」', COL_GREEN))
 
-    def _cmd_rm(self, name: str) -> None:
-        if not name:
-            print(_c("用法: rm <文件名>", COL_YELLOW))
+    def _cmd_rm(self, *args: str) -> None:
+        # -y / --yes 跳过确认；标准输入不是终端（脚本驱动）时同样不询问
+        assume_yes = not sys.stdin.isatty()
+        names = []
+        for a in args:
+            if a in ("-y", "--yes"):
+                assume_yes = True
+            else:
+                names.append(a)
+        if not names:
+            print(_c("用法: rm [-y] <文件名> [文件名 ...]", COL_YELLOW))
             return
 
-        f = self.find_file(name)
-        if f is None:
-            print(_c(f'未找到: "{name}"', COL_YELLOW))
+        # 一次性在目录索引里解析所有名称；整行恰好是一个带空格的文件名时按单个处理
+        index = self._name_index[self._ensure_index()]
+        joined = " ".join(names)
+        names = [joined] if len(names) > 1 and joined in index else list(dict.fromkeys(names))
+        targets: List[Tuple[str, Dict]] = []
+        for name, f in zip(names, self.find_files(*names)):
+            if f is None:
+                print(_c(f'未找到: "{name}"', COL_YELLOW))
+            else:
+                targets.append((name, f))
+        if not targets:
             return
 
         if self.is_wiki_mode:
-            obj_type = f.get("obj_type", "wiki")
-            icon = self.wiki_api.icon(obj_type)
-            print(_c(f"警告：将永久删除 {icon} 「{name}」（含所有子节点），不可恢复！", COL_RED))
+            print(_c("警告：将永久删除以下节点（含所有子节点），不可恢复！", COL_RED))
+            for name, f in targets:
+                print(f"  {self._icon(f.get('obj_type', 'wiki'))} 「{name}」")
+        else:
+            print(_c("警告：将永久删除以下文件，不可恢复！", COL_RED))
+            for name, f in targets:
+                ftype = f.get("type", "file")
+                print(f"  {self._icon(ftype)} 「{name}」（类型: {ftype}）")
+        if not assume_yes:
             try:
                 confirm = input(_c("确认删除？输入 yes 继续: ", COL_YELLOW)).strip().lower()
             except (KeyboardInterrupt, EOFError):
@@ -926,34 +1398,38 @@ class FeishuShell:
             if confirm != "yes":
                 print(_c("已取消", COL_GREY))
                 return
-            self.wiki_api.delete_node(self.wiki_space_id, f["node_token"])
-            self.invalidate_cache()
-            print(_c(f'[✓] 已删除: 「{name}」', COL_GREEN))
-            return
-
-        ftype = f.get("type", "file")
-        icon  = self.api.icon(ftype)
-        print(_c(f"警告：将永久删除 {icon} 「{name}」（类型: {ftype}），不可恢复！", COL_RED))
-        try:
-            confirm = input(_c("确认删除？输入 yes 继续: ", COL_YELLOW)).strip().lower()
-        except (KeyboardInterrupt, EOFError):
-            print()
-            print(_c("已取消", COL_GREY))
-            return
-
-        if confirm != "yes":
-            print(_c("已取消", COL_GREY))
-            return
 
-        self.api.delete_file(f["token"], ftype)
+        if self.is_wiki_mode:
+            keys = [f["node_token"] for _, f in targets]
+            results = self._run_io(self.wiki_api.batch_delete_nodes, self.wiki_space_id, keys)
+        else:
+            keys = [f["token"] for _, f in targets]
+            results = self._run_io(
+                self.api.batch_delete_files,
+                [(f["token"], f.get("type", "file")) for _, f in targets],
+            )
         self.invalidate_cache()
-        print(_c(f'[✓] 已删除: 「{name}」', COL_GREEN))
+
+        for (name, _), key in zip(targets, keys):
+            err = results.get(key)
+            if err is None:
+                print(_c(f'[✓] 已删除: 「{name}」', COL_GREEN))
+            else:
+                print(_c(f'[✗] 删除失败: 「{name}」 {err}', COL_RED))
 
     def _cmd_refresh(self) -> None:
-        self.invalidate_cache()
-        # 预加载，给用户即时反馈
+        if self.is_wiki_mode:
+            # 祖先链（wiki @别名 / wiki node 显示的路径）也重新获取，反映网页端的改名 / 移动
+            self.wiki_api.invalidate_ancestors()
+        changed = self.revalidate_cache()
         files = self.get_cached_files()
-        print(_c(f"[✓] 已刷新，当前目录共 {len(files)} 个文件", COL_GREEN))
+        if not self.is_wiki_mode:
+            # 云盘列表拉取成功，顺带刷新权限检测时间
+            self._save_drive_probe()
+        if changed:
+            print(_c(f"[✓] 已刷新，当前目录共 {len(files)} 个文件", COL_GREEN))
+        else:
+            print(_c(f"[✓] 目录未变化，当前目录共 {len(files)} 个文件", COL_GREEN))
 
 
 # ────────────────────────────────────────────
@@ -961,6 +1437,8 @@ class FeishuShell:
 # ────────────────────────────────────────────
 
 def main() -> None:
+    # 加载项目根目录的 .env 文件（override=True 防止旧 Shell 变量干扰）
+    _load_feishu_config()
     if not os.environ.get("FEISHU_APP_ID") or not os.environ.get("FEISHU_APP_SECRET"):
         print("\033[91m错误：请先在 .env 中配置 FEISHU_APP_ID 和 FEISHU_APP_SECRET\033[0m")
         sys.exit(1)
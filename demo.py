@@ -71,7 +71,7 @@ def main():
 
     print("\n在实验脚本中集成示例：")
     print("  from feishu_bitable_uploader import FeishuBitableUploader")
-    print("  u = FeishuBitableUploader()  # 使用环境变量")
+    print("  u = FeishuBitableUploader(coerce_numeric_to_str=True)  # 使用环境变量；数值写入文本字段时自动转字符串")
     print("  u.add_records([{'实验名称': 'exp_003', '指标A': 0.97, '指标B': 0.91, '备注': 'final'}])")
 
 
@@ -13,6 +13,7 @@
 """
 
 import os
+import logging
 from feishu_kit.config import load_config
 from feishu_kit.bitable_builder import (
     FeishuBitableBuilder,
@@ -22,17 +23,11 @@ from feishu_kit.bitable_builder import (
     FIELD_TYPE_CHECKBOX,
 )
 
-# 加载 .env
-load_config()
-
-APP_ID       = os.environ.get("FEISHU_APP_ID", "")
-APP_SECRET   = os.environ.get("FEISHU_APP_SECRET", "")
-FOLDER_TOKEN = os.environ.get("FEISHU_FOLDER_TOKEN", "")
-
 
 def demo_quick_build():
     """Demo A：一键完成——创建表格 + 配置字段 + 写入数据（推荐入口）。"""
-    builder = FeishuBitableBuilder(app_id=APP_ID, app_secret=APP_SECRET)
+    builder = FeishuBitableBuilder()  # 凭证缺失时自动加载 .env
+    folder_token = os.environ.get("FEISHU_FOLDER_TOKEN", "")
 
     fields_config = [
         {"field_name": "实验名称", "type": FIELD_TYPE_TEXT},
@@ -67,22 +62,20 @@ def demo_quick_build():
         table_name="训练记录",
         fields_config=fields_config,
         records=records,
-        folder_token=FOLDER_TOKEN,
+        folder_token=folder_token,
     )
 
 
 def demo_step_by_step():
     """Demo B：分步演示——逐步调用每个接口（适合理解每步细节）。"""
-    import time
-    builder = FeishuBitableBuilder(app_id=APP_ID, app_secret=APP_SECRET)
+    builder = FeishuBitableBuilder()  # 凭证缺失时自动加载 .env
+    folder_token = os.environ.get("FEISHU_FOLDER_TOKEN", "")
 
     print("\n【步骤 1】在指定文件夹下创建多维表格")
-    app_token = builder.create_bitable(name="分步示例_多维表格", folder_token=FOLDER_TOKEN)
-    time.sleep(0.5)
+    app_token = builder.create_bitable(name="分步示例_多维表格", folder_token=folder_token)
 
     print("\n【步骤 2】在多维表格内新建数据表")
     table_id = builder.create_table(app_token, table_name="指标汇总")
-    time.sleep(0.5)
 
     print("\n【步骤 3】配置字段")
     builder.setup_fields(app_token, table_id, [
@@ -92,7 +85,6 @@ def demo_step_by_step():
         {"field_name": "已部署",     "type": FIELD_TYPE_CHECKBOX},
     ])
 
-    time.sleep(0.3)
     print("\n【步骤 4】写入记录")
     builder.add_records(app_token, table_id, [
         {"模型名": "ResNet-50",   "Top1_Acc": 0.7613, "参数量(M)": 25.6, "已部署": True},
@@ -105,7 +97,9 @@ def demo_step_by_step():
 
 
 if __name__ == "__main__":
-    if not APP_ID or not APP_SECRET:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # 显示构建器的进度信息
+    cfg = load_config()
+    if not cfg["app_id"] or not cfg["app_secret"]:
         print("错误：请先在 .env 中配置 FEISHU_APP_ID 和 FEISHU_APP_SECRET")
         exit(1)
 
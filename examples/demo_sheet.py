@@ -7,20 +7,16 @@
   python examples/demo_sheet.py
 """
 
+import logging
 import os
 from feishu_kit.config import load_config
 from feishu_kit.sheet_builder import FeishuSheetBuilder
 
-load_config()
-
-APP_ID       = os.environ.get("FEISHU_APP_ID", "")
-APP_SECRET   = os.environ.get("FEISHU_APP_SECRET", "")
-FOLDER_TOKEN = os.environ.get("FEISHU_FOLDER_TOKEN", "")
-
 
 def demo_quick_build():
     """Demo A：一键完成——创建表格 + 重命名工作表 + 写入数据（推荐入口）。"""
-    builder = FeishuSheetBuilder(app_id=APP_ID, app_secret=APP_SECRET)
+    builder = FeishuSheetBuilder()  # 凭证缺失时自动加载 .env
+    folder_token = os.environ.get("FEISHU_FOLDER_TOKEN", "")
 
     headers = ["实验名称", "Accuracy", "Loss", "Epochs", "学习率", "状态", "备注"]
     rows = [
@@ -37,30 +33,26 @@ def demo_quick_build():
         sheet_title="训练记录",
         headers=headers,
         rows=rows,
-        folder_token=FOLDER_TOKEN,
+        folder_token=folder_token,
     )
 
 
 def demo_step_by_step():
-    """Demo B：分步演示——逐步调用每个接口。"""
-    import time
-    builder = FeishuSheetBuilder(app_id=APP_ID, app_secret=APP_SECRET)
+    """Demo B：分步演示——逐步调用每个接口（互不依赖的步骤并发执行）。"""
+    from concurrent.futures import ThreadPoolExecutor
+    builder = FeishuSheetBuilder()  # 凭证缺失时自动加载 .env
+    folder_token = os.environ.get("FEISHU_FOLDER_TOKEN", "")
 
     print("\n【步骤 1】创建电子表格")
-    ss_token = builder.create_spreadsheet(title="分步示例_电子表格", folder_token=FOLDER_TOKEN)
-    time.sleep(0.5)
+    ss_token = builder.create_spreadsheet(title="分步示例_电子表格", folder_token=folder_token)
 
     print("\n【步骤 2】获取默认工作表 ID")
     sheets = builder.get_sheets(ss_token)
     sheet_id = sheets[0]["sheetId"]
     print(f"  sheet_id={sheet_id}")
-    time.sleep(0.3)
-
-    print("\n【步骤 3】重命名工作表")
-    builder.rename_sheet(ss_token, sheet_id, "模型对比")
-    time.sleep(0.3)
 
-    print("\n【步骤 4】写入表头 + 数据")
+    # 重命名与写数据只依赖 sheet_id，两者并发执行
+    print("\n【步骤 3+4】重命名工作表 + 写入表头和数据（并发）")
     headers = ["模型名", "Top1_Acc", "参数量(M)", "推理速度(ms)", "是否部署"]
     data = [
         headers,
@@ -68,8 +60,11 @@ def demo_step_by_step():
         ["EfficientB0", 0.7732,  5.3,   8.1, "是"],
         ["ViT-B/16",    0.8145, 86.6,  45.2, "否"],
     ]
-    builder.write_data(ss_token, sheet_id, data)
-    time.sleep(0.3)
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        rename = pool.submit(builder.rename_sheet, ss_token, sheet_id, "模型对比")
+        write = pool.submit(builder.write_data, ss_token, sheet_id, data)
+        rename.result()
+        write.result()
 
     print("\n【步骤 5】追加行")
     builder.append_rows(ss_token, sheet_id, [["Swin-T", 0.8135, 28.3, 18.4, "否"]])
@@ -79,7 +74,9 @@ def demo_step_by_step():
 
 
 if __name__ == "__main__":
-    if not APP_ID or not APP_SECRET:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")  # 显示构建器的进度信息
+    cfg = load_config()
+    if not cfg["app_id"] or not cfg["app_secret"]:
         print("错误：请先在 .env 中配置 FEISHU_APP_ID 和 FEISHU_APP_SECRET")
         exit(1)
 
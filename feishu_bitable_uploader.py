@@ -7,15 +7,83 @@
 """
 
 import os
+import asyncio
+import gzip
+import json
 import time
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Optional, Any
 
+# 安装了 feishu_kit 时与其共用磁盘 / Redis token 缓存，多个脚本进程只换取一次 token
+try:
+    from feishu_kit.token_cache import get_tenant_token
+except ImportError:
+    get_tenant_token = None
+
+# 可选加速：安装 orjson 后请求体序列化 / 响应解析改用 orjson
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
 TOKEN_URL = f"{FEISHU_API_BASE}/auth/v3/tenant_access_token/internal"
 # 单次批量新增最多 500 条，接口 10 QPS
 BATCH_CREATE_LIMIT = 500
+# 多批记录时并发在途的批次数（总速率仍受令牌桶 10 QPS 约束）
+UPLOAD_MAX_WORKERS = 4
+# 请求体超过该字节数时 gzip（level 1）压缩后发送
+GZIP_MIN_BYTES = 4096
+# 字段列表缓存有效期（秒）
+FIELDS_CACHE_TTL = 60.0
+# 多行文本字段类型
+FIELD_TYPE_TEXT = 1
+
+
+def _dumps(obj: Any) -> bytes:
+    """序列化为 UTF-8 JSON 字节串（中文不转义），orjson 不支持的对象回退到标准库。"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+class _TokenBucket:
+    """线程安全的令牌桶限流器：容量 rate 个令牌、每秒匀速补充 rate 个。"""
+
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._tokens = rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+# get_default_uploader 的实例缓存：(app_id, app_secret, app_token, table_id) → uploader
+_DEFAULT_UPLOADERS: Dict[tuple, "FeishuBitableUploader"] = {}
+_DEFAULT_LOCK = threading.Lock()
 
 
 class FeishuBitableUploader:
@@ -23,6 +91,11 @@ class FeishuBitableUploader:
     飞书多维表格上传器。
     支持：获取 token、批量新增记录（单次最多 500 条）。
     多维表格 URL 格式：https://xxx.feishu.cn/base/{app_token}?table={table_id}
+
+    所有请求复用同一个 HTTP 会话；可用 with 语句在结束时自动释放连接::
+
+        with FeishuBitableUploader() as uploader:
+            uploader.add_records(records)
     """
 
     def __init__(
@@ -31,6 +104,8 @@ class FeishuBitableUploader:
         app_secret: Optional[str] = None,
         app_token: Optional[str] = None,
         table_id: Optional[str] = None,
+        session: Optional[requests.Session] = None,
+        coerce_numeric_to_str: bool = False,
     ):
         """
         Args:
@@ -38,19 +113,61 @@ class FeishuBitableUploader:
             app_secret: 飞书应用 App Secret，也可通过环境变量 FEISHU_APP_SECRET 设置
             app_token: 多维表格唯一标识（URL 中 /base/ 后面、?table= 前面的部分），也可用 FEISHU_APP_TOKEN
             table_id: 数据表 ID（URL 中 table= 后面的值），也可用 FEISHU_TABLE_ID
+            session: 复用的 requests.Session；留空则自建一个（带连接池与自动重试），close() 时关闭
+            coerce_numeric_to_str: 为 True 时把写入「文本」类型字段的数值转成字符串
+                                   （需额外查询一次字段列表）；默认原样提交
         """
         self.app_id = app_id or os.environ.get("FEISHU_APP_ID", "")
         self.app_secret = app_secret or os.environ.get("FEISHU_APP_SECRET", "")
         self.app_token = app_token or os.environ.get("FEISHU_APP_TOKEN", "")
         self.table_id = table_id or os.environ.get("FEISHU_TABLE_ID", "")
+        self.coerce_numeric_to_str = coerce_numeric_to_str
         self._token: Optional[str] = None
         self._token_expire_at: float = 0
+        self._auth_headers: tuple = ("", {})  # (token, headers)，token 不变时复用同一个 dict
+        self._rate = _TokenBucket(10)  # 接口 10 QPS
+        self._gzip = True  # 服务端拒收压缩请求体后自动关闭
+        self._fields: Optional[List[Dict]] = None
+        self._fields_at: float = 0
+        self._owns_session = session is None
+        self._session: requests.Session = session or self._build_session()
+
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """keep-alive 连接池 + 限流/5xx 自动重试（POST 不重试，避免重复写入记录）。"""
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "PUT"}),
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+        session.headers.update({"Content-Type": "application/json; charset=utf-8"})
+        return session
+
+    def close(self) -> None:
+        """关闭自建的 HTTP 会话（外部传入的会话由调用方负责关闭）。"""
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self) -> "FeishuBitableUploader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     def _get_token(self) -> str:
         """获取并缓存 tenant_access_token。"""
         if self._token and time.time() < self._token_expire_at - 60:
             return self._token
-        resp = requests.post(
+        if get_tenant_token is not None:
+            self._token, self._token_expire_at = get_tenant_token(
+                self.app_id, self.app_secret, self._session
+            )
+            return self._token
+        resp = self._session.post(
             TOKEN_URL,
             json={"app_id": self.app_id, "app_secret": self.app_secret},
             headers={"Content-Type": "application/json"},
@@ -65,14 +182,19 @@ class FeishuBitableUploader:
         return self._token
 
     def _headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self._get_token()}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
+        # 请求体以 data= 发送预先序列化的 JSON，需显式声明 Content-Type（外部传入的会话不带默认头）；
+        # 返回的 dict 在 token 不变期间共享复用，追加请求头时先复制
+        token = self._get_token()
+        if self._auth_headers[0] != token:
+            self._auth_headers = (token, {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json; charset=utf-8",
+            })
+        return self._auth_headers[1]
 
     def add_records(self, records: List[Dict[str, Any]]) -> dict:
         """
-        向多维表格批量新增记录（单次最多 500 条，超出会自动分批）。
+        向多维表格批量新增记录（单次最多 500 条，超出会自动分批并发提交）。
 
         Args:
             records: 记录列表，每条为字段名到值的映射，例如
@@ -87,23 +209,61 @@ class FeishuBitableUploader:
             raise ValueError("未设置 app_token 或 table_id，请通过参数或环境变量 FEISHU_APP_TOKEN、FEISHU_TABLE_ID 设置")
 
         url = f"{FEISHU_API_BASE}/bitable/v1/apps/{self.app_token}/tables/{self.table_id}/records/batch_create"
-        result = None
-        for i in range(0, len(records), BATCH_CREATE_LIMIT):
-            chunk = records[i : i + BATCH_CREATE_LIMIT]
-            # 将每条记录中的数值自动转为字符串，兼容飞书文本类型字段
-            safe_chunk = [
-                {"fields": {k: str(v) if isinstance(v, (int, float)) else v for k, v in r.items()}}
-                for r in chunk
-            ]
-            body = {"records": safe_chunk}
-            resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
+        if self.coerce_numeric_to_str:
+            records = self._coerce_text_fields(records)
+        headers = self._headers()
+        starts = range(0, len(records), BATCH_CREATE_LIMIT)
+
+        def post(i: int) -> dict:
+            # 长时间上传跨过 token 有效期时才重建请求头
+            h = self._headers() if time.time() > self._token_expire_at - 60 else headers
+            # 按下标直接取记录并立即序列化，不为每批额外复制一份切片
+            end = min(i + BATCH_CREATE_LIMIT, len(records))
+            raw = _dumps({"records": [{"fields": records[j]} for j in range(i, end)]})
+            self._rate.acquire()  # 令牌桶限速，避免超过 10 QPS
+            if self._gzip and len(raw) > GZIP_MIN_BYTES:
+                resp = self._session.post(
+                    url, data=gzip.compress(raw, compresslevel=1),
+                    headers={**h, "Content-Encoding": "gzip"}, timeout=15,
+                )
+                if resp.status_code in (400, 411, 415):
+                    # 服务端不接受压缩请求体，改发原始 JSON
+                    self._gzip = False
+                    resp = self._session.post(url, data=raw, headers=h, timeout=15)
+            else:
+                resp = self._session.post(url, data=raw, headers=h, timeout=15)
             resp.raise_for_status()
-            result = resp.json()
+            result = _loads(resp.content)
             if result.get("code") != 0:
                 raise RuntimeError(f"批量新增记录失败: {result}")
-            if i + BATCH_CREATE_LIMIT < len(records):
-                time.sleep(0.15)  # 简单限速，避免超过 10 QPS
-        return result or {}
+            return result
+
+        if len(starts) <= 1:
+            return post(0) if starts else {}
+        # 多批时并发提交，批次间不再串行等待往返
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_MAX_WORKERS, len(starts))) as pool:
+            results = list(pool.map(post, starts))
+        return results[-1]
+
+    async def add_records_async(self, records: List[Dict[str, Any]]) -> dict:
+        """add_records 的 asyncio 版本：在工作线程中执行，不阻塞事件循环。"""
+        return await asyncio.to_thread(self.add_records, records)
+
+    def _coerce_text_fields(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """只对表中「文本」类型的字段做数值 → 字符串转换，其余字段原样保留。"""
+        text_fields = frozenset(
+            f["field_name"] for f in self.get_fields() if f.get("type") == FIELD_TYPE_TEXT
+        )
+        out = []
+        for r in records:
+            hit = text_fields.intersection(r)
+            if hit:
+                r = dict(r)
+                for k in hit:
+                    if isinstance(r[k], (int, float)):
+                        r[k] = str(r[k])
+            out.append(r)
+        return out
 
     def add_record(self, fields: Dict[str, Any]) -> dict:
         """
@@ -117,25 +277,31 @@ class FeishuBitableUploader:
         """
         return self.add_records([fields])
 
-    def get_fields(self) -> List[Dict]:
+    def get_fields(self, refresh: bool = False) -> List[Dict]:
         """
         查询当前数据表的所有字段（列名）信息，用于确认实际字段名。
         返回字段列表，每项包含 field_id、field_name、type 等。
+        结果缓存 FIELDS_CACHE_TTL 秒，refresh=True 时强制重新查询。
         """
+        if (not refresh and self._fields is not None
+                and time.monotonic() - self._fields_at < FIELDS_CACHE_TTL):
+            return list(self._fields)
         url = f"{FEISHU_API_BASE}/bitable/v1/apps/{self.app_token}/tables/{self.table_id}/fields"
-        resp = requests.get(url, headers=self._headers(), timeout=10)
+        resp = self._session.get(url, headers=self._headers(), timeout=10)
         resp.raise_for_status()
         data = resp.json()
         if data.get("code") != 0:
             raise RuntimeError(f"查询字段失败: {data}")
-        return data.get("data", {}).get("items", [])
+        self._fields = data.get("data", {}).get("items", [])
+        self._fields_at = time.monotonic()
+        return list(self._fields)
 
     def print_fields(self) -> None:
         """打印当前数据表所有字段名，方便对照填写 records。"""
         fields = self.get_fields()
-        print(f"表格共 {len(fields)} 个字段：")
-        for f in fields:
-            print(f"  字段名: {f['field_name']!r:30s}  类型: {f.get('type')}")
+        lines = [f"表格共 {len(fields)} 个字段："]
+        lines += [f"  字段名: {f['field_name']!r:30s}  类型: {f.get('type')}" for f in fields]
+        print("\n".join(lines))
 
     def upload(self, records: List[Dict[str, Any]]) -> dict:
         """
@@ -148,3 +314,25 @@ class FeishuBitableUploader:
             同 add_records
         """
         return self.add_records(records)
+
+
+def get_default_uploader(
+    app_token: Optional[str] = None,
+    table_id: Optional[str] = None,
+) -> FeishuBitableUploader:
+    """
+    返回按凭证与目标表缓存的共享上传器（参数留空时读环境变量）。
+
+    在实验循环里反复调用时复用同一个实例：连接、token 与字段缓存都不必重建。
+    """
+    key = (
+        os.environ.get("FEISHU_APP_ID", ""),
+        os.environ.get("FEISHU_APP_SECRET", ""),
+        app_token or os.environ.get("FEISHU_APP_TOKEN", ""),
+        table_id or os.environ.get("FEISHU_TABLE_ID", ""),
+    )
+    with _DEFAULT_LOCK:
+        uploader = _DEFAULT_UPLOADERS.get(key)
+        if uploader is None:
+            uploader = _DEFAULT_UPLOADERS[key] = FeishuBitableUploader(*key)
+    return uploader
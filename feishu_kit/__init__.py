@@ -23,8 +23,12 @@ feishu_kit — 飞书工具包
     bitable.append_rows([{"实验": "exp_001", "Acc": 0.95}])
 """
 
+import logging
+
 from feishu_kit.client import FeishuClient
 from feishu_kit.config import load_config
+from feishu_kit.http_session import shared_session
+from feishu_kit.token_cache import get_tenant_token
 from feishu_kit.nodes import BitableNode, SheetNode, WikiNode
 
 # 底层 API 类（供进阶使用）
@@ -33,6 +37,10 @@ from feishu_kit.wiki_api import FeishuWikiAPI
 from feishu_kit.bitable_builder import FeishuBitableBuilder
 from feishu_kit.sheet_builder import FeishuSheetBuilder
 
+# 进度信息走 logging（logger 名 feishu_kit.*），默认不输出；需要时由调用方配置，例如
+# logging.basicConfig(level=logging.INFO, format="%(message)s")
+logging.getLogger(__name__).addHandler(logging.NullHandler())
+
 __version__ = "0.1.0"
 __author__ = "feishu-kit"
 
@@ -50,4 +58,6 @@ __all__ = [
     "FeishuSheetBuilder",
     # 配置工具
     "load_config",
+    "shared_session",
+    "get_tenant_token",
 ]
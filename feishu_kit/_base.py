@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+API 封装公共基类
+
+FeishuDriveAPI / FeishuWikiAPI / FeishuSheetBuilder / FeishuBitableBuilder 共用的部分：
+凭证解析、共享 HTTP 会话、tenant_access_token 缓存、统一的请求与响应检查。
+"""
+
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple, TypeVar
+
+from feishu_kit.config import resolve_credentials
+from feishu_kit.http_session import json_dumps, json_loads, shared_session
+from feishu_kit.token_cache import get_tenant_token
+
+if TYPE_CHECKING:
+    import requests
+
+FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
+
+# 新建资源后立即调用相关接口时，"尚未就绪" 类错误的最大重试次数
+READY_MAX_RETRIES = 3
+
+T = TypeVar("T")
+
+# token 距过期不足该秒数时提前刷新
+TOKEN_REFRESH_MARGIN = 60
+
+_monotonic = time.monotonic
+
+
+class _FeishuBaseClient:
+    """各 API 封装的基类，子类只需实现具体接口。"""
+
+    def __init__(
+        self,
+        app_id: Optional[str] = None,
+        app_secret: Optional[str] = None,
+        session: Optional["requests.Session"] = None,
+    ):
+        # 凭证：参数 > 环境变量 > .env（仅在前两者都缺失时才读取文件）
+        self.app_id, self.app_secret = resolve_credentials(app_id, app_secret)
+        self._token: Optional[str] = None
+        # 需要刷新 token 的时刻：time.monotonic 时间轴（不受系统时钟调整影响），已扣除提前量
+        self._token_refresh_at: float = 0.0
+        self._token_lock = threading.Lock()
+        # 按 token 缓存的请求头 (token, headers)：刷新 token 时构建，token 不变时每次请求复用同一个 dict
+        self._auth_headers: Tuple[str, Dict[str, str]] = ("", {})
+        # HTTP 会话（复用 TCP/TLS 连接），可由调用方传入；留空时在首次请求前取进程内共享会话
+        self._http: Optional["requests.Session"] = session
+
+    @property
+    def _session(self) -> "requests.Session":
+        if self._http is None:
+            self._http = shared_session()
+        return self._http
+
+    @_session.setter
+    def _session(self, session: "requests.Session") -> None:
+        self._http = session
+
+    def close(self) -> None:
+        """
+        释放 HTTP 会话中的空闲连接。会话本身可能与其他实例共享，因此不关闭会话，
+        之后的请求会按需重新建立连接。
+        """
+        # HTTP/2 会话（Http2Session）没有 adapters，由 httpx 自行管理空闲连接
+        for adapter in getattr(self._http, "adapters", {}).values():
+            adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    # ──────────────────────────────────────────
+    # 内部：Token 与请求
+    # ──────────────────────────────────────────
+
+    def _get_token(self) -> str:
+        """获取 tenant_access_token（提前 60 秒刷新），未命中实例缓存时走进程 / 磁盘共享缓存。"""
+        if self._token and _monotonic() < self._token_refresh_at:
+            return self._token
+        # 加锁后再检查一次：并发线程（含 asyncio.to_thread 的工作线程）中只有一个去刷新
+        with self._token_lock:
+            if self._token and _monotonic() < self._token_refresh_at:
+                return self._token
+            token, expire_at = get_tenant_token(self.app_id, self.app_secret, self._session)
+            if token != self._auth_headers[0]:
+                self._auth_headers = (token, {
+                    "Authorization": f"Bearer {token}",
+                    "Content-Type": "application/json; charset=utf-8",
+                })
+            # 共享缓存给出的是墙钟过期时刻，换算成单调时钟上的剩余时长
+            self._token_refresh_at = _monotonic() + (expire_at - time.time()) - TOKEN_REFRESH_MARGIN
+            self._token = token
+        return token
+
+    def _headers(self) -> dict:
+        """
+        返回带鉴权的 JSON 请求头。请求头在刷新 token 时构建一次，token 有效期内每次请求
+        直接复用同一个 dict；调用方需要追加请求头时应先复制（``{**self._headers(), ...}``），
+        不要原地修改。
+        """
+        headers = self._auth_headers
+        if headers[0] and headers[0] == self._token and _monotonic() < self._token_refresh_at:
+            return headers[1]
+        token = self._get_token()
+        if self._auth_headers[0] != token:
+            # token 由外部直接赋值（未经 _get_token 刷新）时补建请求头
+            self._auth_headers = (token, {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json; charset=utf-8",
+            })
+        return self._auth_headers[1]
+
+    def _check_resp(self, data: dict, action: str) -> dict:
+        """统一检查响应 code，非 0 时抛出带上下文的异常。"""
+        code = data.get("code")
+        if code == 0:
+            return data
+        raise RuntimeError(f"{action} 失败 (code={code}): {data.get('msg')} | 详情: {data}")
+
+    def _request(
+        self,
+        method: str,
+        url: str,
+        action: str,
+        body: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: float = 15,
+    ) -> dict:
+        """发送请求并返回检查过 code 的响应 JSON；HTTP 错误与业务错误都会抛出。"""
+        resp = self._session.request(
+            method, url,
+            data=None if body is None else json_dumps(body),
+            params=params,
+            headers=self._headers(),
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        return self._check_resp(json_loads(resp.content), action)
+
+    def _get(self, url: str, action: str, params: Optional[Dict[str, Any]] = None, timeout: float = 10) -> dict:
+        return self._request("GET", url, action, params=params, timeout=timeout)
+
+    def _post(self, url: str, body: Dict[str, Any], action: str, timeout: float = 15) -> dict:
+        return self._request("POST", url, action, body=body, timeout=timeout)
+
+    def _put(self, url: str, body: Dict[str, Any], action: str, timeout: float = 15) -> dict:
+        return self._request("PUT", url, action, body=body, timeout=timeout)
+
+    def _get_conditional(
+        self,
+        url: str,
+        action: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None,
+        timeout: float = 15,
+    ) -> Tuple[Optional[dict], Optional[str]]:
+        """
+        条件 GET：带上 etag 时发送 If-None-Match。服务端返回 304 时得到 (None, etag)，
+        否则为 (检查过 code 的响应 JSON, 响应的 ETag)。
+        """
+        headers = self._headers()
+        if etag:
+            headers = {**headers, "If-None-Match": etag}  # _headers() 返回共享 dict，不能原地修改
+        resp = self._session.get(url, params=params, headers=headers, timeout=timeout)
+        if resp.status_code == 304:
+            return None, etag
+        resp.raise_for_status()
+        return self._check_resp(json_loads(resp.content), action), resp.headers.get("ETag")
+
+    def _retry_not_ready(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        调用紧跟在创建之后的接口：新资源偶尔尚未就绪，业务错误（RuntimeError）时
+        按指数退避（带抖动）重试，代替固定 sleep。
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except RuntimeError:
+                if attempt >= READY_MAX_RETRIES:
+                    raise
+            time.sleep(min(0.2 * 2 ** attempt, 2.0) * (0.5 + random.random()))
+            attempt += 1
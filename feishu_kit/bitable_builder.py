@@ -10,15 +10,28 @@ API 参考：
   - 批量新增记录:  POST /open-apis/bitable/v1/apps/{app_token}/tables/{table_id}/records/batch_create
 """
 
-import os
 import time
-import requests
-from typing import List, Dict, Optional, Any
+import functools
+import logging
+import random
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from feishu_kit._base import FEISHU_API_BASE, _FeishuBaseClient, _monotonic
+from feishu_kit.config import resolve_credentials
+from feishu_kit.http_session import (
+    gzip_payload,
+    gzip_rejected,
+    json_dumps,
+    json_loads,
+)
+
+if TYPE_CHECKING:
+    import requests
 
 
-FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
-TOKEN_URL = f"{FEISHU_API_BASE}/auth/v3/tenant_access_token/internal"
-
 # 字段类型常量（type 值）
 FIELD_TYPE_TEXT        = 1   # 多行文本
 FIELD_TYPE_NUMBER      = 2   # 数字；property.formatter 合法值: "0" "0.0" "0.00" "0.000" "0.0000" "0%" "0.00%"
@@ -31,9 +44,67 @@ FIELD_TYPE_AUTO_NO     = 1005  # 自动编号（系统字段，不可新增，
 
 # 单次批量写入记录上限
 BATCH_CREATE_LIMIT = 500
+# add_records 多批写入 / setup_fields 新增字段时的最大并发数
+RECORDS_MAX_WORKERS = 4
+FIELDS_MAX_WORKERS = 4
+# 写接口限流（每个 builder 实例），与开放平台 10 QPS 配额一致
+RATE_LIMIT_QPS = 10
+# 单次写入遇到限流 / 服务端错误 / 写冲突时的最大重试次数
+RECORDS_MAX_RETRIES = 4
+# 可重试的 HTTP 状态码与业务错误码（1254291: 并发写冲突）
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+_RETRY_CODES = frozenset({1254291})
+# 请求在写入前即被拒绝的状态码：不可重放的 POST 只在这些状态下重试（5xx 时服务端可能已写入）
+_REJECTED_STATUS = frozenset({429})
+# get_fields 结果缓存有效期（秒），字段变更时主动失效
+SCHEMA_CACHE_TTL = 60.0
+
+logger = logging.getLogger(__name__)
+
+# get_fields 结果的进程级缓存（所有 builder 实例共享）：
+#   (app_token, table_id) → (获取时刻 monotonic, 字段列表)
+_FIELDS_CACHE: Dict[Tuple[str, str], Tuple[float, List[Dict]]] = {}
+_FIELDS_LOCK = threading.Lock()
+
+# get_default_builder 的实例缓存：(app_id, app_secret) → builder
+_DEFAULT_BUILDERS: Dict[Tuple[str, str], "FeishuBitableBuilder"] = {}
+_DEFAULT_LOCK = threading.Lock()
+
+
+def _field_body(cfg: Dict) -> Dict[str, Any]:
+    """把 setup_fields 风格的字段配置转换为 API 请求体。"""
+    body: Dict[str, Any] = {"field_name": cfg["field_name"], "type": cfg.get("type", FIELD_TYPE_TEXT)}
+    if cfg.get("property"):
+        body["property"] = cfg["property"]
+    return body
+
+
+class _TokenBucket:
+    """
+    线程安全的令牌桶限流器：容量 rate 个令牌、每秒匀速补充 rate 个。
+    acquire() 在无令牌时阻塞到下一个令牌补充出来为止。
+    """
 
-
-class FeishuBitableBuilder:
+    def __init__(self, rate: float):
+        self._rate = rate
+        self._tokens = rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._last) * self._rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class FeishuBitableBuilder(_FeishuBaseClient):
     """
     飞书多维表格构建器：从零开始在指定文件夹创建多维表格并写入数据。
 
@@ -64,45 +135,13 @@ class FeishuBitableBuilder:
         self,
         app_id: Optional[str] = None,
         app_secret: Optional[str] = None,
+        session: Optional["requests.Session"] = None,
     ):
-        self.app_id = app_id or os.environ.get("FEISHU_APP_ID", "")
-        self.app_secret = app_secret or os.environ.get("FEISHU_APP_SECRET", "")
-        self._token: Optional[str] = None
-        self._token_expire_at: float = 0
-
-    # ──────────────────────────────────────────
-    # 内部：Token 管理
-    # ──────────────────────────────────────────
-
-    def _get_token(self) -> str:
-        """获取并缓存 tenant_access_token（提前 60 秒刷新）。"""
-        if self._token and time.time() < self._token_expire_at - 60:
-            return self._token
-        resp = requests.post(
-            TOKEN_URL,
-            json={"app_id": self.app_id, "app_secret": self.app_secret},
-            headers={"Content-Type": "application/json"},
-            timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if data.get("code") != 0:
-            raise RuntimeError(f"获取 token 失败: {data}")
-        self._token = data["tenant_access_token"]
-        self._token_expire_at = time.time() + data.get("expire", 7200)
-        return self._token
-
-    def _headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self._get_token()}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
-
-    def _check_resp(self, data: dict, action: str) -> dict:
-        """统一检查响应 code，非 0 时抛出带上下文的异常。"""
-        if data.get("code") != 0:
-            raise RuntimeError(f"{action} 失败 (code={data.get('code')}): {data.get('msg')} | 详情: {data}")
-        return data
+        super().__init__(app_id, app_secret, session)
+        # 写接口限流：并发写字段 / 记录时共享
+        self._rate = _TokenBucket(RATE_LIMIT_QPS)
+        # 大请求体是否 gzip 压缩；服务端拒收压缩请求体后自动关闭
+        self._gzip = True
 
     # ──────────────────────────────────────────
     # 多维表格（Bitable App）
@@ -126,28 +165,36 @@ class FeishuBitableBuilder:
         body: Dict[str, Any] = {"name": name}
         if folder_token:
             body["folder_token"] = folder_token
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), f"创建多维表格「{name}」")
+        data = self._post(url, body, f"创建多维表格「{name}」")
         app_info = data["data"]["app"]
         app_token = app_info["app_token"]
         app_url = app_info.get("url", "")
         default_table_id = app_info.get("default_table_id", "")
-        print(f"[✓] 多维表格已创建: 「{name}」")
-        print(f"    app_token        : {app_token}")
-        print(f"    default_table_id : {default_table_id}")
-        print(f"    url              : {app_url}")
+        logger.info(
+            "[✓] 多维表格已创建: 「%s」  app_token=%s  default_table_id=%s  url=%s",
+            name, app_token, default_table_id, app_url,
+        )
         return app_token
 
     # ──────────────────────────────────────────
     # 数据表（Table）
     # ──────────────────────────────────────────
 
+    def _list_tables_nonempty(self, app_token: str) -> List[Dict]:
+        """列出数据表（仅首页），为空时抛 RuntimeError，供就绪重试使用。"""
+        url = f"{FEISHU_API_BASE}/bitable/v1/apps/{app_token}/tables"
+        data = self._get(url, "获取数据表列表", params={"page_size": 1})
+        tables = data.get("data", {}).get("items") or []
+        if not tables:
+            raise RuntimeError("未能获取到数据表列表")
+        return tables
+
     def create_table(
         self,
         app_token: str,
         table_name: str,
         default_view_name: str = "默认视图",
+        fields: Optional[List[Dict]] = None,
     ) -> str:
         """
         在指定多维表格内新增一个数据表。
@@ -156,27 +203,40 @@ class FeishuBitableBuilder:
             app_token:         多维表格的 app_token
             table_name:        数据表名称
             default_view_name: 默认视图名称
+            fields:            字段配置（同 setup_fields，第一项为主字段）；
+                               传入时随建表请求一次创建全部字段，无需再调用 setup_fields
 
         Returns:
             新建数据表的 table_id
 
-        注意：飞书 API 要求 fields 数组不能为空，此处传入占位主字段，
+        注意：飞书 API 要求 fields 数组不能为空，未传 fields 时使用占位主字段，
               后续通过 setup_fields 改名即可。
         """
         url = f"{FEISHU_API_BASE}/bitable/v1/apps/{app_token}/tables"
+        if fields:
+            table_fields = [_field_body(cfg) for cfg in fields]
+        else:
+            # fields 为必填项，至少需要一个主字段，后续通过 setup_fields 更新名称
+            table_fields = [{"field_name": "标题", "type": FIELD_TYPE_TEXT}]
         body = {
             "table": {
                 "name": table_name,
                 "default_view_name": default_view_name,
-                # fields 为必填项，至少需要一个主字段，后续通过 setup_fields 更新名称
-                "fields": [{"field_name": "标题", "type": FIELD_TYPE_TEXT}],
+                "fields": table_fields,
             }
         }
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), f"新增数据表「{table_name}」")
+        data = self._post(url, body, f"新增数据表「{table_name}」")
         table_id = data["data"]["table_id"]
-        print(f"[✓] 数据表已创建: 「{table_name}」  table_id={table_id}")
+        # 响应中的 field_id_list 与请求字段一一对应，直接填入字段缓存，后续 setup_fields 无需再查询
+        field_ids = data["data"].get("field_id_list") or []
+        if len(field_ids) == len(table_fields):
+            items = [dict(f, field_id=fid, is_primary=(i == 0))
+                     for i, (f, fid) in enumerate(zip(table_fields, field_ids))]
+            with _FIELDS_LOCK:
+                _FIELDS_CACHE[(app_token, table_id)] = (time.monotonic(), items)
+        logger.info("[✓] 数据表已创建: 「%s」  table_id=%s", table_name, table_id)
+        if fields:
+            logger.info("[✓] 已随建表创建 %d 个字段", len(fields))
         return table_id
 
     # ──────────────────────────────────────────
@@ -185,16 +245,28 @@ class FeishuBitableBuilder:
 
     def get_fields(self, app_token: str, table_id: str) -> List[Dict]:
         """
-        列出数据表的所有字段。
+        列出数据表的所有字段（进程内缓存 SCHEMA_CACHE_TTL 秒，通过 builder 修改字段后自动失效）。
 
         Returns:
             字段列表，每项含 field_id、field_name、type 等
         """
+        key = (app_token, table_id)
+        with _FIELDS_LOCK:
+            cached = _FIELDS_CACHE.get(key)
+        if cached is not None and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            return list(cached[1])
         url = f"{FEISHU_API_BASE}/bitable/v1/apps/{app_token}/tables/{table_id}/fields"
-        resp = requests.get(url, headers=self._headers(), timeout=10)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), "列出字段")
-        return data.get("data", {}).get("items", [])
+        data = self._get(url, "列出字段")
+        items = data.get("data", {}).get("items", [])
+        with _FIELDS_LOCK:
+            _FIELDS_CACHE[key] = (time.monotonic(), items)
+        return list(items)
+
+    @staticmethod
+    def invalidate_fields(app_token: str, table_id: str) -> None:
+        """使某张数据表的字段缓存失效（在飞书网页端改过字段后可手动调用）。"""
+        with _FIELDS_LOCK:
+            _FIELDS_CACHE.pop((app_token, table_id), None)
 
     def update_field(
         self,
@@ -221,10 +293,11 @@ class FeishuBitableBuilder:
         body: Dict[str, Any] = {"field_name": field_name, "type": field_type}
         if property:
             body["property"] = property
-        resp = requests.put(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), f"更新字段「{field_name}」")
-        print(f"[✓] 字段已更新: 「{field_name}」(type={field_type})")
+        try:
+            data = self._post_retrying(url, body, f"更新字段「{field_name}」", timeout=15, method="PUT")
+        finally:
+            self.invalidate_fields(app_token, table_id)
+        logger.info("[✓] 字段已更新: 「%s」(type=%s)", field_name, field_type)
         return data.get("data", {})
 
     def add_field(
@@ -252,11 +325,12 @@ class FeishuBitableBuilder:
         body: Dict[str, Any] = {"field_name": field_name, "type": field_type}
         if property:
             body["property"] = property
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), f"新增字段「{field_name}」")
+        try:
+            data = self._post_retrying(url, body, f"新增字段「{field_name}」", timeout=15)
+        finally:
+            self.invalidate_fields(app_token, table_id)
         field_id = data["data"]["field"]["field_id"]
-        print(f"[✓] 字段已新增: 「{field_name}」(type={field_type})  field_id={field_id}")
+        logger.info("[✓] 字段已新增: 「%s」(type=%s)  field_id=%s", field_name, field_type, field_id)
         return field_id
 
     def setup_fields(
@@ -266,8 +340,10 @@ class FeishuBitableBuilder:
         fields_config: List[Dict],
     ) -> None:
         """
-        一次完成字段配置：第一项自动用于更新默认主字段，后续项逐个新增。
-        每次操作之间自动 sleep 0.2s，避免并发写冲突（错误码 1254291）。
+        一次完成字段配置：第一项自动用于更新默认主字段，后续项新增，全部并发提交。
+        已存在的同名字段会跳过（主字段名称和类型都一致时也不再更新）；
+        并发写入经令牌桶限流，遇到写冲突（错误码 1254291）自动退避重试。
+        新建数据表时优先用 create_table(fields=...) 一次建好全部字段。
 
         Args:
             fields_config: 字段配置列表，每项为 dict，支持以下键：
@@ -291,24 +367,37 @@ class FeishuBitableBuilder:
         existing = self.get_fields(app_token, table_id)
         if not existing:
             raise RuntimeError("获取默认字段失败，无法设置主字段名")
-        primary_field_id = existing[0]["field_id"]
-        time.sleep(0.2)
-        self.update_field(
-            app_token, table_id, primary_field_id,
-            field_name=primary_cfg["field_name"],
-            field_type=primary_cfg.get("type", FIELD_TYPE_TEXT),
-            property=primary_cfg.get("property"),
-        )
-
-        # 后续字段：逐个新增
+        primary = existing[0]
+        primary_type = primary_cfg.get("type", FIELD_TYPE_TEXT)
+        existing_names = {f.get("field_name") for f in existing}
+        tasks: List[Callable[[], Any]] = []
+        if primary.get("field_name") != primary_cfg["field_name"] or primary.get("type") != primary_type:
+            tasks.append(functools.partial(
+                self.update_field,
+                app_token, table_id, primary["field_id"],
+                field_name=primary_cfg["field_name"],
+                field_type=primary_type,
+                property=primary_cfg.get("property"),
+            ))
+
+        # 后续字段：只新增尚不存在的；与主字段更新一起并发提交
         for cfg in fields_config[1:]:
-            time.sleep(0.2)
-            self.add_field(
-                app_token, table_id,
-                field_name=cfg["field_name"],
-                field_type=cfg["type"],
-                property=cfg.get("property"),
-            )
+            if cfg["field_name"] not in existing_names:
+                tasks.append(functools.partial(
+                    self.add_field,
+                    app_token, table_id,
+                    field_name=cfg["field_name"],
+                    field_type=cfg["type"],
+                    property=cfg.get("property"),
+                ))
+
+        if len(tasks) <= 1:
+            for task in tasks:
+                task()
+            return
+        with ThreadPoolExecutor(max_workers=min(FIELDS_MAX_WORKERS, len(tasks))) as pool:
+            for future in [pool.submit(task) for task in tasks]:
+                future.result()
 
     # ──────────────────────────────────────────
     # 记录（Record）
@@ -321,7 +410,7 @@ class FeishuBitableBuilder:
         records: List[Dict[str, Any]],
     ) -> dict:
         """
-        向数据表批量新增记录（单次最多 500 条，超出自动分批）。
+        向数据表批量新增记录（单次最多 500 条，超出自动分批并发写入）。
 
         Args:
             records: 记录列表，每条为 {字段名: 值} 的映射。
@@ -333,21 +422,99 @@ class FeishuBitableBuilder:
         if not records:
             return {}
         url = f"{FEISHU_API_BASE}/bitable/v1/apps/{app_token}/tables/{table_id}/records/batch_create"
-        result: dict = {}
         total = len(records)
-        for i in range(0, total, BATCH_CREATE_LIMIT):
-            chunk = records[i: i + BATCH_CREATE_LIMIT]
-            body = {
-                "records": [{"fields": r} for r in chunk]
-            }
-            resp = requests.post(url, json=body, headers=self._headers(), timeout=20)
-            resp.raise_for_status()
-            result = self._check_resp(resp.json(), "批量新增记录")
+        if total <= BATCH_CREATE_LIMIT:
+            # 单批（含 add_record 的单条）直接提交，不走分批与线程池
+            result = self._post_retrying(
+                url, {"records": [{"fields": r} for r in records]}, "批量新增记录", timeout=20,
+                params={"client_token": str(uuid.uuid4())},
+            )
+            logger.info("[✓] 写入记录 %d 条", len(result.get("data", {}).get("records", [])))
+            return result
+
+        starts = range(0, total, BATCH_CREATE_LIMIT)
+        headers = self._headers()  # 所有批次共用，token 临近过期时由 _post_retrying 重建
+
+        def post(i: int) -> dict:
+            # 按下标直接取记录，不为每批额外复制一份切片
+            end = min(i + BATCH_CREATE_LIMIT, total)
+            body = {"records": [{"fields": records[j]} for j in range(i, end)]}
+            # 每批一个 client_token，重试同一批时由服务端去重，不会重复写入
+            result = self._post_retrying(
+                url, body, "批量新增记录", timeout=20, headers=headers,
+                params={"client_token": str(uuid.uuid4())},
+            )
             added = len(result.get("data", {}).get("records", []))
-            print(f"[✓] 写入记录 {i + 1}~{min(i + BATCH_CREATE_LIMIT, total)} / {total}  (本批实际入库: {added} 条)")
-            if i + BATCH_CREATE_LIMIT < total:
-                time.sleep(0.2)
-        return result
+            logger.info(
+                "[✓] 写入记录 %d~%d / %d  (本批实际入库: %d 条)",
+                i + 1, end, total, added,
+            )
+            return result
+
+        workers = min(RECORDS_MAX_WORKERS, len(starts))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(post, starts))
+        return results[-1]
+
+    async def add_records_async(
+        self,
+        app_token: str,
+        table_id: str,
+        records: List[Dict[str, Any]],
+    ) -> dict:
+        """add_records 的 asyncio 版本：在工作线程中执行（批次照常并发），不阻塞事件循环。"""
+        import asyncio
+        return await asyncio.to_thread(self.add_records, app_token, table_id, records)
+
+    def _post_retrying(
+        self,
+        url: str,
+        body: Dict[str, Any],
+        action: str,
+        timeout: float,
+        headers: Optional[Dict[str, str]] = None,
+        method: str = "POST",
+        params: Optional[Dict[str, Any]] = None,
+    ) -> dict:
+        """
+        经限流器发送写请求（默认 POST，更新字段时为 PUT）；限流与写冲突按指数退避（带抖动）重试。
+        PUT 的限流与 5xx 已由会话的重试策略处理，这里只重试写冲突，不叠加第二层重试。
+        POST 不在会话的自动重试范围内：params 带 client_token（服务端按其去重）时 5xx 也重试，
+        其余 POST 只在写入前即被拒（429）时重试，避免服务端已写入后重复写入。
+        可传入调用方预先构造的 headers，仅在 token 临近过期时重建。
+        较大的请求体（如 500 条记录）以 gzip 压缩发送。
+        """
+        if method != "POST":
+            retry_status = frozenset()   # 会话已按 RETRY_STATUS 重试过
+        elif params and params.get("client_token"):
+            retry_status = _RETRY_STATUS
+        else:
+            retry_status = _REJECTED_STATUS
+        raw = json_dumps(body)  # 只序列化 / 压缩一次，重试时复用
+        payload, gzipped = gzip_payload(raw) if self._gzip else (raw, False)
+        attempt = 0
+        while True:
+            if headers is None or _monotonic() >= self._token_refresh_at:
+                headers = self._headers()
+            req_headers = {**headers, "Content-Encoding": "gzip"} if gzipped else headers
+            self._rate.acquire()
+            resp = self._session.request(
+                method, url, data=payload, params=params, headers=req_headers, timeout=timeout,
+            )
+            if gzipped and gzip_rejected(resp):
+                # 服务端不接受压缩请求体：之后都发未压缩的，本次立即重发（不计入重试次数）
+                self._gzip = False
+                payload, gzipped = raw, False
+                continue
+            if resp.status_code not in retry_status:
+                resp.raise_for_status()
+                data = json_loads(resp.content)
+                if data.get("code") not in _RETRY_CODES or attempt >= RECORDS_MAX_RETRIES:
+                    return self._check_resp(data, action)
+            elif attempt >= RECORDS_MAX_RETRIES:
+                resp.raise_for_status()
+            time.sleep(min(0.2 * 2 ** attempt, 3.0) * (0.5 + random.random()))
+            attempt += 1
 
     # ──────────────────────────────────────────
     # 一键建表（组合步骤）
@@ -362,7 +529,7 @@ class FeishuBitableBuilder:
         folder_token: str = "",
     ) -> Dict[str, str]:
         """
-        一步完成：创建多维表格 → 建数据表 → 配置字段 → 写入记录。
+        一步完成：创建多维表格 → 建数据表（同时创建字段） → 写入记录。
 
         Args:
             bitable_name:  多维表格名称
@@ -374,28 +541,36 @@ class FeishuBitableBuilder:
         Returns:
             {"app_token": ..., "table_id": ...}
         """
-        print(f"\n{'=' * 50}")
-        print(f"  开始构建: 「{bitable_name}」 > 「{table_name}」")
-        print(f"{'=' * 50}")
+        logger.info("开始构建: 「%s」 > 「%s」", bitable_name, table_name)
 
         app_token = self.create_bitable(bitable_name, folder_token=folder_token)
-        time.sleep(0.5)  # 等待服务端创建完成
 
-        table_id = self.create_table(app_token, table_name)
-        time.sleep(0.5)
+        # 新建的多维表格偶尔尚未就绪：只对幂等的读请求重试，等到就绪后再建表。
+        # 建表是不可重放的 POST，重试可能产生重名数据表，或把永久性错误（字段配置有误等）白白重试几遍
+        self._retry_not_ready(self._list_tables_nonempty, app_token)
 
-        if fields_config:
-            print("\n── 配置字段 ──")
-            self.setup_fields(app_token, table_id, fields_config)
+        # 字段随建表请求一次创建，省去逐个新增字段的往返
+        table_id = self.create_table(app_token, table_name, fields=fields_config)
 
         if records:
-            print(f"\n── 写入 {len(records)} 条记录 ──")
+            logger.info("── 写入 %d 条记录 ──", len(records))
             self.add_records(app_token, table_id, records)
 
-        print(f"\n{'=' * 50}")
-        print(f"  全部完成！")
-        print(f"  app_token : {app_token}")
-        print(f"  table_id  : {table_id}")
-        print(f"{'=' * 50}\n")
+        logger.info("全部完成！ app_token=%s  table_id=%s", app_token, table_id)
 
         return {"app_token": app_token, "table_id": table_id}
+
+
+def get_default_builder() -> FeishuBitableBuilder:
+    """
+    返回按当前凭证（环境变量 / .env）缓存的共享 builder。
+
+    同一应用的写接口共用 10 QPS 配额；在循环或多个函数里反复建表 / 写记录时，
+    用这个共享实例可以让它们共用同一个限流器，也省去重复构造。
+    """
+    key = resolve_credentials(None, None)
+    with _DEFAULT_LOCK:
+        builder = _DEFAULT_BUILDERS.get(key)
+        if builder is None:
+            builder = _DEFAULT_BUILDERS[key] = FeishuBitableBuilder(*key)
+    return builder
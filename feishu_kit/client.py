@@ -29,18 +29,31 @@ FeishuClient — 飞书工具包统一门面层
 
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Optional, Union
 
-from feishu_kit.config import load_config
+from feishu_kit.config import _config_from_env, load_config
+from feishu_kit.http_session import json_dumps, json_loads
 from feishu_kit.nodes import BitableNode, SheetNode, WikiNode, _make_node
 
+if TYPE_CHECKING:
+    import requests
 
-# 书签文件路径（与项目根目录的 .feishu_bookmarks.json 保持一致）
-def _bookmark_path() -> Path:
-    return Path(__file__).parent.parent / ".feishu_bookmarks.json"
+
+# 书签文件路径（与项目根目录的 .feishu_bookmarks.json 保持一致），模块加载时算一次
+_BOOKMARK_PATH = Path(__file__).resolve().parent.parent / ".feishu_bookmarks.json"
+_BOOKMARK_PATH_STR = str(_BOOKMARK_PATH)
+
+
+# goto 时写回书签的节点信息，有了它们再次 goto 不必请求 get_node
+_BOOKMARK_NODE_FIELDS = ("obj_type", "obj_token", "has_child", "parent_node_token")
+
+
+def _normalize_alias(alias: str) -> str:
+    """书签别名统一带 @ 前缀（已带前缀时原样返回，不重新拼接）。"""
+    return alias if alias[:1] == "@" else "@" + alias
 
 
 class FeishuClient:
@@ -52,28 +65,39 @@ class FeishuClient:
     Args:
         env_path: 指定 .env 文件路径；留空则自动查找项目根目录的 .env
         auto_load_env: 是否自动加载 .env（默认 True）
+        session: 所有底层 API 共用的 requests.Session；留空则使用进程内共享会话
     """
 
+    __slots__ = (
+        "_cfg", "_safe_cfg", "_session",
+        "_wiki_api", "_drive_api", "_bitable_builder", "_sheet_builder",
+        "_bm_cache", "_bm_stat",
+    )
+
     def __init__(
         self,
         env_path: str = "",
         auto_load_env: bool = True,
+        session: Optional[requests.Session] = None,
     ):
         if auto_load_env:
             self._cfg = load_config(env_path)
         else:
-            self._cfg = {
-                "app_id":       os.environ.get("FEISHU_APP_ID", ""),
-                "app_secret":   os.environ.get("FEISHU_APP_SECRET", ""),
-                "domain":       os.environ.get("FEISHU_DOMAIN", ""),
-                "folder_token": os.environ.get("FEISHU_FOLDER_TOKEN", ""),
-                "default_mode": os.environ.get("FEISHU_DEFAULT_MODE", "auto"),
-            }
-
+            self._cfg = _config_from_env()
+        # 对外展示的配置（隐藏 app_secret），初始化后不再变化，只读视图避免被调用方改动
+        self._safe_cfg: Mapping[str, Any] = MappingProxyType(
+            {**self._cfg, "app_secret": "***" if self._cfg.get("app_secret") else ""}
+        )
+
+        # 留空时各底层 API 在首次使用时取进程内共享会话（此时才导入 requests）
+        self._session = session
         self._wiki_api: Any = None
         self._drive_api: Any = None
         self._bitable_builder: Any = None
         self._sheet_builder: Any = None
+        # 书签文件解析结果缓存，文件 (mtime_ns, size) 变化时重新读取
+        self._bm_cache: Optional[Dict[str, Dict[str, str]]] = None
+        self._bm_stat: Optional[tuple] = None
 
     # ──────────────────────────────────────────
     # 内部：懒加载 API 实例
@@ -86,6 +110,7 @@ class FeishuClient:
                 app_id=self._cfg["app_id"],
                 app_secret=self._cfg["app_secret"],
                 domain=self._cfg["domain"],
+                session=self._session,
             )
         return self._wiki_api
 
@@ -96,6 +121,7 @@ class FeishuClient:
                 app_id=self._cfg["app_id"],
                 app_secret=self._cfg["app_secret"],
                 domain=self._cfg["domain"],
+                session=self._session,
             )
         return self._drive_api
 
@@ -105,6 +131,7 @@ class FeishuClient:
             self._bitable_builder = FeishuBitableBuilder(
                 app_id=self._cfg["app_id"],
                 app_secret=self._cfg["app_secret"],
+                session=self._session,
             )
         return self._bitable_builder
 
@@ -114,6 +141,7 @@ class FeishuClient:
             self._sheet_builder = FeishuSheetBuilder(
                 app_id=self._cfg["app_id"],
                 app_secret=self._cfg["app_secret"],
+                session=self._session,
             )
         return self._sheet_builder
 
@@ -122,28 +150,53 @@ class FeishuClient:
     # ──────────────────────────────────────────
 
     def _load_bookmarks(self) -> Dict[str, Dict[str, str]]:
-        """加载 .feishu_bookmarks.json，返回 {alias: {node_token, space_id, title}} 字典。"""
-        path = _bookmark_path()
-        if path.exists():
-            try:
-                return json.loads(path.read_text(encoding="utf-8"))
-            except Exception:
-                pass
-        return {}
+        """
+        加载 .feishu_bookmarks.json，返回 {alias: {node_token, space_id, title}} 字典。
+        文件未变化（mtime / 大小相同）时直接返回缓存，调用方不要原地修改返回值。
+        """
+        try:
+            st = os.stat(_BOOKMARK_PATH_STR)
+        except OSError:
+            self._bm_cache, self._bm_stat = {}, None
+            return self._bm_cache
+        stat_key = (st.st_mtime_ns, st.st_size)
+        if self._bm_cache is not None and stat_key == self._bm_stat:
+            return self._bm_cache
+        # 直接按字节读取并解析（不经文本解码）；缓存键取自同一文件描述符，读与 stat 之间被改写也不会错配
+        try:
+            with open(_BOOKMARK_PATH_STR, "rb") as f:
+                st = os.fstat(f.fileno())
+                raw = f.read()
+            stat_key = (st.st_mtime_ns, st.st_size)
+            bm = json_loads(raw)
+        except FileNotFoundError:
+            self._bm_cache, self._bm_stat = {}, None
+            return self._bm_cache
+        except (OSError, ValueError):
+            bm = {}  # 无法读取或内容损坏（JSON 解析错误均为 ValueError）
+        self._bm_cache, self._bm_stat = bm, stat_key
+        return bm
 
     def _save_bookmarks(self, bm: Dict[str, Dict[str, str]]) -> None:
-        """将书签字典写回 .feishu_bookmarks.json。"""
-        path = _bookmark_path()
-        path.write_text(json.dumps(bm, ensure_ascii=False, indent=2), encoding="utf-8")
+        """
+        将书签字典写回 .feishu_bookmarks.json，并同步更新内存缓存。
+        先写临时文件再原子替换，进程中途被杀也不会留下半个文件；书签不是关键数据，不做 fsync。
+        """
+        tmp = _BOOKMARK_PATH_STR + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(json_dumps(bm, indent=True))
+        os.replace(tmp, _BOOKMARK_PATH_STR)
+        st = os.stat(_BOOKMARK_PATH_STR)
+        self._bm_cache, self._bm_stat = bm, (st.st_mtime_ns, st.st_size)
 
     def list_bookmarks(self) -> Dict[str, Dict[str, str]]:
         """
         返回所有书签。
 
         Returns:
-            {alias: {"node_token": ..., "space_id": ..., "title": ...}} 字典
+            {alias: {"node_token": ..., "space_id": ..., "title": ...}} 字典（副本，可随意修改）
         """
-        return self._load_bookmarks()
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in self._load_bookmarks().items()}
 
     def save_bookmark(
         self,
@@ -161,8 +214,8 @@ class FeishuClient:
             space_id:    知识库空间 ID
             title:       节点标题（可选，用于显示）
         """
-        key = alias if alias.startswith("@") else f"@{alias}"
-        bm = self._load_bookmarks()
+        key = _normalize_alias(alias)
+        bm = dict(self._load_bookmarks())
         bm[key] = {"node_token": node_token, "space_id": space_id, "title": title}
         self._save_bookmarks(bm)
 
@@ -173,8 +226,8 @@ class FeishuClient:
         Returns:
             True 表示删除成功，False 表示别名不存在
         """
-        key = alias if alias.startswith("@") else f"@{alias}"
-        bm = self._load_bookmarks()
+        key = _normalize_alias(alias)
+        bm = dict(self._load_bookmarks())
         if key in bm:
             del bm[key]
             self._save_bookmarks(bm)
@@ -185,12 +238,16 @@ class FeishuClient:
     # 导航与路径解析
     # ──────────────────────────────────────────
 
-    def goto(self, alias: str) -> WikiNode:
+    def goto(self, alias: str, refresh: bool = False) -> WikiNode:
         """
         通过书签别名跳转到 Wiki 节点。
 
+        书签中已缓存节点类型（obj_type / obj_token）时直接用缓存构造，不发请求；
+        否则调用 get_node 获取最新信息，并把节点类型写回书签供下次使用。
+
         Args:
-            alias: 书签别名（如 "@bot" 或 "bot"）
+            alias:   书签别名（如 "@bot" 或 "bot"）
+            refresh: 为 True 时忽略书签缓存，总是请求最新节点信息
 
         Returns:
             WikiNode 对象
@@ -198,12 +255,14 @@ class FeishuClient:
         Raises:
             KeyError: 别名不存在
         """
-        key = alias if alias.startswith("@") else f"@{alias}"
+        key = _normalize_alias(alias)
         bm = self._load_bookmarks()
         if key not in bm:
             raise KeyError(f"书签 '{key}' 不存在，请先用 save_bookmark 保存")
         info = bm[key]
         api = self._get_wiki_api()
+        if not refresh and info.get("title") and info.get("obj_type") and info.get("obj_token"):
+            return WikiNode._from_raw(info, api)
         # 通过 get_node 获取最新节点信息
         try:
             raw = api.get_node(info["node_token"])
@@ -216,6 +275,12 @@ class FeishuClient:
                 "obj_type": "docx",
                 "obj_token": "",
             }
+            return WikiNode._from_raw(raw, api)
+        cached = {f: raw[f] for f in _BOOKMARK_NODE_FIELDS if f in raw}
+        if any(info.get(f) != v for f, v in cached.items()):
+            bm = dict(bm)
+            bm[key] = {**info, **cached}
+            self._save_bookmarks(bm)
         return WikiNode._from_raw(raw, api)
 
     def resolve(
@@ -239,7 +304,7 @@ class FeishuClient:
         Raises:
             ValueError: 路径格式错误（不以 @ 开头）
         """
-        parts = [p.strip() for p in path.split("/") if p.strip()]
+        parts = [p for p in map(str.strip, path.split("/")) if p]  # 每段只 strip 一次
         if not parts or not parts[0].startswith("@"):
             raise ValueError(f"路径必须以 @alias 开头，当前: '{path}'")
 
@@ -364,12 +429,9 @@ class FeishuClient:
     # ──────────────────────────────────────────
 
     @property
-    def config(self) -> Dict[str, Any]:
-        """返回当前配置（隐藏 app_secret）。"""
-        safe = dict(self._cfg)
-        if safe.get("app_secret"):
-            safe["app_secret"] = "***"
-        return safe
+    def config(self) -> Mapping[str, Any]:
+        """返回当前配置的只读视图（隐藏 app_secret）；需要可修改的副本时用 dict(client.config)。"""
+        return self._safe_cfg
 
     def __repr__(self) -> str:
         return f"FeishuClient(domain={self._cfg.get('domain')!r}, mode={self._cfg.get('default_mode')!r})"
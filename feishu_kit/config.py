@@ -15,8 +15,21 @@ feishu_kit 配置加载模块
 """
 
 import os
+import functools
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional, Tuple
+
+# 配置键 → (环境变量名, 默认值)
+_ENV_MAP: Tuple[Tuple[str, str, str], ...] = (
+    ("app_id",       "FEISHU_APP_ID",       ""),
+    ("app_secret",   "FEISHU_APP_SECRET",   ""),
+    ("domain",       "FEISHU_DOMAIN",       ""),
+    ("folder_token", "FEISHU_FOLDER_TOKEN", ""),
+    ("default_mode", "FEISHU_DEFAULT_MODE", "auto"),
+)
+
+# python-dotenv 的 dotenv_values，首次解析 .env 时才导入；False 表示未安装
+_dotenv_values: Any = None
 
 
 def get_env_path() -> Path:
@@ -47,20 +60,60 @@ def load_config(env_path: str = "") -> Dict[str, Any]:
     Raises:
         RuntimeError: 若 app_id 或 app_secret 为空，说明配置未正确设置
     """
-    # 动态导入 dotenv，避免将其列为强制依赖（但实际已在 requirements.txt 中）
+    # .env 内容按 (路径, 修改时间) 缓存，重复调用只需把变量写回 os.environ（仍保持 override 语义）
+    target = env_path or str(get_env_path())
     try:
-        from dotenv import load_dotenv
-        target = env_path or str(get_env_path())
-        if os.path.exists(target):
-            load_dotenv(target, override=True)
-    except ImportError:
-        pass  # python-dotenv 未安装时直接使用环境变量
-
-    cfg: Dict[str, Any] = {
-        "app_id":       os.environ.get("FEISHU_APP_ID", ""),
-        "app_secret":   os.environ.get("FEISHU_APP_SECRET", ""),
-        "domain":       os.environ.get("FEISHU_DOMAIN", ""),
-        "folder_token": os.environ.get("FEISHU_FOLDER_TOKEN", ""),
-        "default_mode": os.environ.get("FEISHU_DEFAULT_MODE", "auto"),
-    }
-    return cfg
+        mtime = os.stat(target).st_mtime
+    except OSError:
+        mtime = None
+    if mtime is not None:
+        os.environ.update(_read_env_file(target, mtime))
+
+    return _config_from_env()
+
+
+def _config_from_env() -> Dict[str, Any]:
+    """按 _ENV_MAP 从环境变量构造配置字典（不读取 .env）。"""
+    environ = os.environ
+    return {key: environ.get(env, default) for key, env, default in _ENV_MAP}
+
+
+@functools.lru_cache(maxsize=8)
+def _read_env_file(path: str, mtime: float) -> Tuple[Tuple[str, str], ...]:
+    """解析 .env 文件（mtime 参与缓存键，文件改动后自动重新解析）。"""
+    dotenv_values = _get_dotenv_values()
+    if dotenv_values is None:
+        return ()  # python-dotenv 未安装时直接使用环境变量
+    return tuple((k, v) for k, v in dotenv_values(path).items() if v is not None)
+
+
+def _get_dotenv_values() -> Optional[Callable[..., Dict[str, Optional[str]]]]:
+    """动态导入 dotenv（避免将其列为强制依赖，但实际已在 requirements.txt 中），结果缓存在模块级。"""
+    global _dotenv_values
+    if _dotenv_values is None:
+        try:
+            from dotenv import dotenv_values
+            _dotenv_values = dotenv_values
+        except ImportError:
+            _dotenv_values = False
+    return _dotenv_values or None
+
+
+def resolve_credentials(
+    app_id: Optional[str] = None,
+    app_secret: Optional[str] = None,
+) -> Tuple[str, str]:
+    """
+    解析应用凭证：参数优先，其次 .env，最后 shell 环境变量（与 load_config 的 override 语义一致）。
+
+    .env 按修改时间缓存解析结果，重复调用只需一次 stat。
+
+    Returns:
+        (app_id, app_secret)
+    """
+    if not (app_id and app_secret):
+        load_config()
+    return (
+        app_id or os.environ.get("FEISHU_APP_ID", ""),
+        app_secret or os.environ.get("FEISHU_APP_SECRET", ""),
+    )
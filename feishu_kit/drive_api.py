@@ -12,45 +12,62 @@ API 参考：
   - 删除文件:      DELETE /open-apis/drive/v1/files/{token}?type={type}
 """
 
+import logging
 import os
-import time
-import requests
-from typing import List, Dict, Optional, Any
-
-
-FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
-TOKEN_URL = f"{FEISHU_API_BASE}/auth/v3/tenant_access_token/internal"
-
-# 文件类型常量
-FILE_TYPE_FOLDER  = "folder"
-FILE_TYPE_SHEET   = "sheet"
-FILE_TYPE_BITABLE = "bitable"
-FILE_TYPE_DOC     = "doc"
-FILE_TYPE_DOCX    = "docx"
-FILE_TYPE_FILE    = "file"
-
-# 文件类型 → 显示图标
-FILE_TYPE_ICONS: Dict[str, str] = {
-    FILE_TYPE_FOLDER:  "📁",
-    FILE_TYPE_SHEET:   "📊",
-    FILE_TYPE_BITABLE: "🗃 ",
-    FILE_TYPE_DOC:     "📝",
-    FILE_TYPE_DOCX:    "📝",
-    FILE_TYPE_FILE:    "📄",
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime as _dt
+from typing import List, Dict, Iterator, Optional, Any, Tuple, Union, TYPE_CHECKING
+
+from feishu_kit._base import FEISHU_API_BASE, _FeishuBaseClient
+
+if TYPE_CHECKING:
+    import requests
+
+# batch_delete_files / list_files_many 的最大并发数
+BATCH_MAX_WORKERS = 8
+
+logger = logging.getLogger(__name__)
+
+
+# 文件类型常量（驻留字符串：与 _intern_types 处理过的响应字段比较 / 查表时按身份命中）
+FILE_TYPE_FOLDER  = sys.intern("folder")
+FILE_TYPE_SHEET   = sys.intern("sheet")
+FILE_TYPE_BITABLE = sys.intern("bitable")
+FILE_TYPE_DOC     = sys.intern("doc")
+FILE_TYPE_DOCX    = sys.intern("docx")
+FILE_TYPE_FILE    = sys.intern("file")
+
+# 文件类型 → (显示图标, URL 路径模板)；模板中 {domain} 和 {token} 占位。一次查表即可拿到两者
+_FILE_TYPE_INFO: Dict[str, Tuple[str, str]] = {
+    FILE_TYPE_FOLDER:  ("📁", "https://{domain}.feishu.cn/drive/folder/{token}"),
+    FILE_TYPE_SHEET:   ("📊", "https://{domain}.feishu.cn/sheets/{token}"),
+    FILE_TYPE_BITABLE: ("🗃 ", "https://{domain}.feishu.cn/base/{token}"),
+    FILE_TYPE_DOC:     ("📝", "https://{domain}.feishu.cn/docs/{token}"),
+    FILE_TYPE_DOCX:    ("📝", "https://{domain}.feishu.cn/docx/{token}"),
+    FILE_TYPE_FILE:    ("📄", "https://{domain}.feishu.cn/file/{token}"),
 }
+# 未知类型按普通文件处理
+_DEFAULT_FILE_TYPE_INFO = _FILE_TYPE_INFO[FILE_TYPE_FILE]
 
-# URL 路径模板（{domain} 和 {token} 占位）
-FILE_URL_PATTERNS: Dict[str, str] = {
-    FILE_TYPE_FOLDER:  "https://{domain}.feishu.cn/drive/folder/{token}",
-    FILE_TYPE_SHEET:   "https://{domain}.feishu.cn/sheets/{token}",
-    FILE_TYPE_BITABLE: "https://{domain}.feishu.cn/base/{token}",
-    FILE_TYPE_DOC:     "https://{domain}.feishu.cn/docs/{token}",
-    FILE_TYPE_DOCX:    "https://{domain}.feishu.cn/docx/{token}",
-    FILE_TYPE_FILE:    "https://{domain}.feishu.cn/file/{token}",
-}
+# 兼容旧接口的派生视图
+FILE_TYPE_ICONS: Dict[str, str] = {ft: info[0] for ft, info in _FILE_TYPE_INFO.items()}
+FILE_URL_PATTERNS: Dict[str, str] = {ft: info[1] for ft, info in _FILE_TYPE_INFO.items()}
+
+
+def _intern_types(files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    把响应中各文件的 type 换成驻留字符串：上千个文件共用少数几个对象，
+    之后按类型查表 / 比较时命中身份比较的快速路径。原地修改并返回原列表。
+    """
+    for f in files:
+        t = f.get("type")
+        if isinstance(t, str):
+            f["type"] = sys.intern(t)
+    return files
 
 
-class FeishuDriveAPI:
+class FeishuDriveAPI(_FeishuBaseClient):
     """
     飞书云盘操作封装。
 
@@ -69,58 +86,36 @@ class FeishuDriveAPI:
         app_id: Optional[str] = None,
         app_secret: Optional[str] = None,
         domain: Optional[str] = None,
+        session: Optional["requests.Session"] = None,
     ):
         """
         Args:
             app_id:     飞书 App ID，或从环境变量 FEISHU_APP_ID 读取
             app_secret: 飞书 App Secret，或从环境变量 FEISHU_APP_SECRET 读取
             domain:     企业域前缀（如 "n3kyhtp7sz"），或从 FEISHU_DOMAIN 读取
+            session:    HTTP 会话（requests.Session 或 Http2Session）；留空时在首次请求前
+                        取进程内共享会话 shared_session()。close() 只释放空闲连接，不关闭会话
         """
-        self.app_id = app_id or os.environ.get("FEISHU_APP_ID", "")
-        self.app_secret = app_secret or os.environ.get("FEISHU_APP_SECRET", "")
+        super().__init__(app_id, app_secret, session)
         self.domain = domain or os.environ.get("FEISHU_DOMAIN", "")
         # 应用被授权的根文件夹 token（tenant token 只能访问此类已授权文件夹，
         # 不能访问"我的空间"个人根目录——那需要 user_access_token）
         self.root_folder_token = os.environ.get("FEISHU_FOLDER_TOKEN", "")
-        self._token: Optional[str] = None
-        self._token_expire_at: float = 0
-
-    # ──────────────────────────────────────────
-    # 内部：Token 与请求
-    # ──────────────────────────────────────────
 
-    def _get_token(self) -> str:
-        """获取并缓存 tenant_access_token（提前 60 秒刷新）。"""
-        if self._token and time.time() < self._token_expire_at - 60:
-            return self._token
-        resp = requests.post(
-            TOKEN_URL,
-            json={"app_id": self.app_id, "app_secret": self.app_secret},
-            headers={"Content-Type": "application/json"},
-            timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if data.get("code") != 0:
-            raise RuntimeError(f"获取 token 失败: {data}")
-        self._token = data["tenant_access_token"]
-        self._token_expire_at = time.time() + data.get("expire", 7200)
-        return self._token
-
-    def _headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self._get_token()}",
-            "Content-Type": "application/json; charset=utf-8",
+    @property
+    def domain(self) -> str:
+        """企业域前缀。"""
+        return self._domain
+
+    @domain.setter
+    def domain(self, value: str) -> None:
+        # 设置 domain 时预先拼好各类型的 URL 前缀，逐行渲染列表时 get_file_url 只需拼接 token
+        self._domain = value or ""
+        self._url_prefixes: Dict[str, str] = {
+            ft: pat.replace("{domain}", self._domain).replace("{token}", "")
+            for ft, (_, pat) in _FILE_TYPE_INFO.items()
         }
 
-    def _check_resp(self, data: dict, action: str) -> dict:
-        """统一检查响应 code，非 0 时抛出带上下文的异常。"""
-        if data.get("code") != 0:
-            raise RuntimeError(
-                f"{action} 失败 (code={data.get('code')}): {data.get('msg')} | {data}"
-            )
-        return data
-
     # ──────────────────────────────────────────
     # 目录操作
     # ──────────────────────────────────────────
@@ -133,9 +128,7 @@ class FeishuDriveAPI:
             根目录 folder_token 字符串
         """
         url = f"{FEISHU_API_BASE}/drive/explorer/v2/root_folder/meta"
-        resp = requests.get(url, headers=self._headers(), timeout=10)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), "获取根目录")
+        data = self._request("GET", url, "获取根目录", timeout=10)
         token = data["data"]["token"]
         return token
 
@@ -160,37 +153,108 @@ class FeishuDriveAPI:
               - url: str          网页链接（如有）
               - modified_time: str 最后修改时间戳（秒）
         """
-        url = f"{FEISHU_API_BASE}/drive/v1/files"
-        all_files: List[Dict] = []
-        page_token: Optional[str] = None
+        return list(self.iter_files(folder_token, page_size=page_size))
 
+    def iter_files(
+        self,
+        folder_token: str,
+        page_size: int = 200,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐个产出文件夹内的文件，边翻页边产出：调用方可以边拉取边处理，找到目标后提前结束，
+        不必等所有分页返回、也不必把整个目录同时放在内存里。字段同 list_files。
+        """
+        for payload, _ in self._iter_pages(folder_token, page_size):
+            yield from _intern_types(payload.get("files", ()))
+
+    def list_files_if_changed(
+        self,
+        folder_token: str,
+        etag: Optional[str] = None,
+        page_size: int = 200,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        条件列出文件：带上次的 ETag 发送 If-None-Match，服务端返回 304 时不重新下载列表。
+
+        Returns:
+            (文件列表, 新 ETag)；未变化时文件列表为 None。
+            仅单页列表才返回 ETag（多页时首页 ETag 不能代表整个目录）。
+        """
+        all_files: List[Dict[str, Any]] = []
+        new_etag: Optional[str] = None
+        for page_no, (payload, page_etag) in enumerate(self._iter_pages(folder_token, page_size, etag)):
+            if payload is None:
+                return None, etag
+            all_files.extend(_intern_types(payload.get("files", ())))
+            new_etag = page_etag if page_no == 0 else None
+        return all_files, new_etag
+
+    def _iter_pages(
+        self,
+        folder_token: str,
+        page_size: int,
+        etag: Optional[str] = None,
+    ) -> Iterator[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        逐页请求 /drive/v1/files，产出 (页内 data, 该页 ETag)；iter_files 与 list_files_if_changed 共用。
+        只有首页带 If-None-Match：首页 304 时产出 (None, etag) 后结束。
+        """
+        url = f"{FEISHU_API_BASE}/drive/v1/files"
         # nod... 是个人空间的节点 token，/drive/v1/files 不接受，
         # 不传 folder_token（或传空串）才会返回"我的空间"根目录列表。
-        effective_token = "" if folder_token.startswith("nod") else folder_token
-
+        # 注意：该接口仅支持 folder_token / page_size / page_token 三个参数，
+        # 传其他字段（如 order_by / direction）会导致 400 params error。
+        # 翻页时只更新 page_token，其余参数在循环外构造一次
+        params: Dict[str, Any] = {
+            "folder_token": "" if folder_token.startswith("nod") else folder_token,
+            "page_size": page_size,
+        }
         while True:
-            # 注意：/drive/v1/files 仅支持 folder_token / page_size / page_token 三个参数，
-            # 传其他字段（如 order_by / direction）会导致 400 params error。
-            params: Dict[str, Any] = {
-                "folder_token": effective_token,
-                "page_size": page_size,
-            }
-            if page_token:
-                params["page_token"] = page_token
-
-            resp = requests.get(url, params=params, headers=self._headers(), timeout=15)
-            resp.raise_for_status()
-            data = self._check_resp(resp.json(), "列出文件")
-
-            files = data.get("data", {}).get("files", [])
-            all_files.extend(files)
+            data, page_etag = self._get_conditional(url, "列出文件", params, etag)
+            if data is None:
+                yield None, page_etag
+                return
+            payload = data.get("data") or {}
+            yield payload, page_etag
+
+            page_token = payload.get("next_page_token")
+            if not payload.get("has_more", False) or not page_token:
+                return
+            params["page_token"] = page_token
+            etag = None
+
+    def list_files_many(
+        self,
+        folder_tokens: List[str],
+        page_size: int = 200,
+        return_exceptions: bool = False,
+    ) -> Dict[str, Union[List[Dict[str, Any]], Exception]]:
+        """
+        并发列出多个目录（单个目录的分页依赖 next_page_token，只能串行；多个目录之间用线程池并发）。
 
-            has_more = data.get("data", {}).get("has_more", False)
-            page_token = data.get("data", {}).get("next_page_token")
-            if not has_more or not page_token:
-                break
+        Args:
+            folder_tokens:     目录 token 列表
+            page_size:         每页数量，最大 200
+            return_exceptions: 为 False（默认）时任一目录失败即抛出该异常；
+                               为 True 时失败的目录记录日志，结果中对应的值为异常对象
 
-        return all_files
+        Returns:
+            {folder_token: 文件列表（或异常）}
+        """
+        def fetch(token: str) -> Union[List[Dict[str, Any]], Exception]:
+            try:
+                return self.list_files(token, page_size=page_size)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                logger.warning("列出目录 %s 失败: %s", token, e, exc_info=True)
+                return e
+
+        if len(folder_tokens) <= 1:
+            return {t: fetch(t) for t in folder_tokens}
+        workers = min(BATCH_MAX_WORKERS, len(folder_tokens))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(folder_tokens, pool.map(fetch, folder_tokens)))
 
     def create_folder(self, name: str, parent_folder_token: str) -> Dict[str, str]:
         """
@@ -205,9 +269,7 @@ class FeishuDriveAPI:
         """
         url = f"{FEISHU_API_BASE}/drive/v1/files/create_folder"
         body = {"name": name, "folder_token": parent_folder_token}
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), f"创建文件夹「{name}」")
+        data = self._request("POST", url, f"创建文件夹「{name}」", body=body, timeout=15)
         return {
             "token": data["data"]["token"],
             "name": name,
@@ -233,9 +295,7 @@ class FeishuDriveAPI:
         """
         url = f"{FEISHU_API_BASE}/drive/v1/files/{file_token}/move"
         body = {"type": file_type, "folder_token": target_folder_token}
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        self._check_resp(resp.json(), "移动文件")
+        self._request("POST", url, "移动文件", body=body, timeout=15)
 
     def rename_file(
         self,
@@ -253,9 +313,7 @@ class FeishuDriveAPI:
         """
         url = f"{FEISHU_API_BASE}/drive/v1/files/{file_token}"
         body = {"name": new_name, "type": file_type}
-        resp = requests.patch(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        self._check_resp(resp.json(), f"重命名 → 「{new_name}」")
+        self._request("PATCH", url, f"重命名 → 「{new_name}」", body=body, timeout=15)
 
     def delete_file(self, file_token: str, file_type: str) -> None:
         """
@@ -267,9 +325,30 @@ class FeishuDriveAPI:
         """
         url = f"{FEISHU_API_BASE}/drive/v1/files/{file_token}"
         params = {"type": file_type}
-        resp = requests.delete(url, params=params, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        self._check_resp(resp.json(), "删除文件")
+        self._request("DELETE", url, "删除文件", params=params, timeout=15)
+
+    def batch_delete_files(self, files: List[Tuple[str, str]]) -> Dict[str, Optional[str]]:
+        """
+        批量删除文件（开放平台没有批量删除接口，这里用线程池并发逐个删除）。
+
+        Args:
+            files: [(file_token, file_type), ...]
+
+        Returns:
+            {file_token: None 表示成功，否则为错误信息}
+        """
+        def delete(item: Tuple[str, str]) -> Optional[str]:
+            try:
+                self.delete_file(*item)
+                return None
+            except Exception as e:
+                return str(e)
+
+        if len(files) <= 1:
+            return {t: delete((t, ft)) for t, ft in files}
+        workers = min(BATCH_MAX_WORKERS, len(files))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip((t for t, _ in files), pool.map(delete, files)))
 
     # ──────────────────────────────────────────
     # URL 生成（本地拼接，无需 API）
@@ -286,10 +365,10 @@ class FeishuDriveAPI:
         Returns:
             可直接在浏览器打开的 URL；若 domain 未配置则返回提示信息
         """
-        if not self.domain:
+        if not self._domain:
             return f"（未配置 FEISHU_DOMAIN，token={file_token}，type={file_type}）"
-        pattern = FILE_URL_PATTERNS.get(file_type, FILE_URL_PATTERNS[FILE_TYPE_FILE])
-        return pattern.format(domain=self.domain, token=file_token)
+        prefixes = self._url_prefixes
+        return prefixes.get(file_type, prefixes[FILE_TYPE_FILE]) + file_token
 
     # ──────────────────────────────────────────
     # 工具方法
@@ -298,7 +377,7 @@ class FeishuDriveAPI:
     @staticmethod
     def icon(file_type: str) -> str:
         """返回文件类型对应的显示图标。"""
-        return FILE_TYPE_ICONS.get(file_type, "📄")
+        return _FILE_TYPE_INFO.get(file_type, _DEFAULT_FILE_TYPE_INFO)[0]
 
     @staticmethod
     def format_modified_time(ts: Any) -> str:
@@ -308,9 +387,8 @@ class FeishuDriveAPI:
         try:
             ts_int = int(ts)
             # 飞书有些接口返回毫秒
-            if ts_int > 1e12:
+            if ts_int > 1_000_000_000_000:
                 ts_int = ts_int // 1000
-            import datetime
-            return datetime.datetime.fromtimestamp(ts_int).strftime("%Y-%m-%d")
+            return _dt.fromtimestamp(ts_int).strftime("%Y-%m-%d")
         except Exception:
             return str(ts)
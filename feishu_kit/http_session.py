@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+"""
+共享 HTTP 会话
+
+所有 API 封装默认共用同一个 requests.Session，复用到 open.feishu.cn 的 TCP/TLS 连接，
+并对幂等请求（GET/PUT/DELETE 等）在限流或服务端错误时自动重试。
+
+安装了 ``httpx[http2]``（pip install feishu-kit[http2]）时，共享会话改为 HTTP/2 客户端：
+并发的字段创建 / 记录批量写入复用同一条连接上的多路流，重复的请求头经 HPACK 压缩。
+设置环境变量 ``FEISHU_HTTP2=0`` 可强制使用 requests。
+
+典型用法::
+
+    from feishu_kit.http_session import shared_session
+
+    api = FeishuDriveAPI(session=shared_session())   # 不传 session 时默认即为此会话
+"""
+
+import gzip
+import importlib.util
+import json
+import os
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Union
+
+# requests / urllib3 / httpx 在首次创建会话时才导入，``import feishu_kit`` 不为此付出冷启动开销
+if TYPE_CHECKING:
+    import httpx
+    import requests
+
+# 连接池大小：每个 host 的池数 / 每池最大连接数
+POOL_CONNECTIONS = 16
+POOL_MAXSIZE = 32
+
+# 自动重试：429 与 5xx，指数退避 0.5s 起；POST 不在默认重试方法内，避免重复写入。
+# 只按状态码重试：连接 / 读取错误（DNS 失败、超时等）直接抛出，不在每次失败上叠加数秒退避。
+# 自带重试循环的写接口（sheet/bitable builder）不再对会话已重试过的状态码重复重试
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+# 请求体超过该字节数时 gzip 压缩（更小的请求体压缩收益抵不过帧开销）
+GZIP_MIN_BYTES = 4096
+# 服务端不接受压缩请求体时返回的状态码，遇到后改发未压缩请求体。
+# 400 也是飞书普通业务 / 参数错误的状态码，只有响应体提到编码问题时才视为拒收压缩（见 gzip_rejected）
+GZIP_REJECT_STATUS = (411, 415)
+GZIP_REJECT_HINTS = (b"gzip", b"encoding", b"decompress")
+
+# 可选加速：安装 orjson 后请求体序列化 / 响应解析改用 orjson（pip install feishu-kit[speed]）
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 可选：HTTP/2 客户端（需要 httpx 与 h2；httpx 的 http2=True 依赖 h2），这里只探测是否已安装
+_HTTPX_INSTALLED = all(importlib.util.find_spec(m) is not None for m in ("httpx", "h2"))
+
+# HTTP/2 客户端连接上限：单连接即可承载并发流，少量备用连接应对连接级错误
+HTTP2_MAX_KEEPALIVE = 4
+HTTP2_MAX_CONNECTIONS = 10
+
+# 可安全重试的请求方法（与 urllib3 Retry 的默认集合一致，不含 POST）
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS", "TRACE"})
+
+_shared: Optional["requests.Session"] = None
+_shared_lock = threading.Lock()
+
+
+def build_session(
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+) -> "requests.Session":
+    """新建一个挂载了连接池与重试策略的 Session。"""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=0,
+        read=0,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class Http2Session:
+    """
+    httpx.Client（HTTP/2）的 requests 风格包装，供各 API 类当作 requests.Session 使用。
+
+    接受 requests 的常用参数（json / data / params / headers / timeout），``data`` 为
+    bytes / str 时按原始请求体发送；幂等请求遇到 RETRY_STATUS 时按与 build_session
+    相同的策略退避重试。返回 httpx.Response（status_code / content / json() /
+    headers / raise_for_status() 与 requests 用法一致）。
+    """
+
+    def __init__(
+        self,
+        max_keepalive_connections: int = HTTP2_MAX_KEEPALIVE,
+        max_connections: int = HTTP2_MAX_CONNECTIONS,
+    ):
+        if not _HTTPX_INSTALLED:
+            raise RuntimeError("HTTP/2 需要安装 httpx[http2]：pip install 'httpx[http2]'")
+        import httpx
+
+        self._client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=max_keepalive_connections,
+                max_connections=max_connections,
+            ),
+            timeout=20.0,
+        )
+        self.headers = self._client.headers
+
+    def request(self, method: str, url: str, **kwargs: Any) -> "httpx.Response":
+        data = kwargs.get("data")
+        if isinstance(data, (bytes, str)):
+            kwargs["content"] = kwargs.pop("data")
+        attempt = 0
+        while True:
+            resp = self._client.request(method, url, **kwargs)
+            if (resp.status_code not in RETRY_STATUS
+                    or method.upper() not in _IDEMPOTENT_METHODS
+                    or attempt >= RETRY_TOTAL):
+                return resp
+            retry_after = resp.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else RETRY_BACKOFF * 2 ** attempt
+            time.sleep(delay * (0.5 + random.random()))
+            attempt += 1
+
+    def get(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs: Any) -> "httpx.Response":
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+def http2_available() -> bool:
+    """httpx[http2] 已安装且未通过 FEISHU_HTTP2=0 关闭。"""
+    return _HTTPX_INSTALLED and os.environ.get("FEISHU_HTTP2", "1").strip() not in ("0", "off", "false")
+
+
+def shared_session() -> "requests.Session":
+    """
+    返回进程内共享的会话（首次调用时创建）：
+    httpx[http2] 可用时为 Http2Session，否则为 requests.Session。
+    """
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = Http2Session() if http2_available() else build_session()
+    return _shared
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    把请求体序列化为 UTF-8 JSON 字节串，配合 ``data=`` 发送，避免 requests 内部再编码一次。
+    中文不做 \\u 转义，批量写入时请求体更小；orjson 无法处理的对象回退到标准库。
+    ``indent=True`` 时按 2 空格缩进（写本地文件用）。
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None).encode("utf-8")
+
+
+def json_loads(raw: Union[bytes, str]) -> Any:
+    """解析响应体（通常传入 ``resp.content``）。"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def gzip_payload(raw: bytes) -> Tuple[bytes, bool]:
+    """大于 GZIP_MIN_BYTES 的请求体用 gzip（level 1）压缩，返回 (请求体, 是否已压缩)。"""
+    if len(raw) <= GZIP_MIN_BYTES:
+        return raw, False
+    return gzip.compress(raw, compresslevel=1), True
+
+
+def gzip_rejected(resp: Any) -> bool:
+    """已压缩的请求是否因服务端不接受 gzip 请求体而失败（411/415，或响应体提到编码的 400）。"""
+    if resp.status_code in GZIP_REJECT_STATUS:
+        return True
+    if resp.status_code != 400:
+        return False
+    body = resp.content.lower()
+    return any(hint in body for hint in GZIP_REJECT_HINTS)
@@ -22,11 +22,21 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Union
+
+from feishu_kit._base import FEISHU_API_BASE
 
 if TYPE_CHECKING:
     pass
 
+# 多维表格接口前缀（后接 /{app_token}/tables...）
+BITABLE_API_BASE = f"{FEISHU_API_BASE}/bitable/v1/apps"
+# BitableNode.query_many 的最大并发数
+QUERY_MAX_WORKERS = 8
+# SheetNode.write_many 的最大并发数（每次写入自身还可能分块并发）
+WRITE_MANY_MAX_WORKERS = 4
+
 
 class WikiNode:
     """
@@ -42,6 +52,12 @@ class WikiNode:
         parent_node_token: 父节点 token
     """
 
+    # ls() 一次可能构造上千个节点，固定属性省去每个实例的 __dict__
+    __slots__ = (
+        "space_id", "node_token", "title", "obj_type", "obj_token", "has_child",
+        "parent_node_token", "_api", "_children", "_children_by_title",
+    )
+
     def __init__(
         self,
         space_id: str,
@@ -61,6 +77,9 @@ class WikiNode:
         self.has_child = has_child
         self.parent_node_token = parent_node_token
         self._api = _wiki_api  # FeishuWikiAPI 实例（懒注入）
+        # ls() 结果缓存，及其中 WikiNode 的 标题 → 节点 索引（get 精确匹配用）
+        self._children: Optional[List[Union["WikiNode", "BitableNode", "SheetNode"]]] = None
+        self._children_by_title: Dict[str, "WikiNode"] = {}
 
     # ──────────────────────────────────────────
     # 内部：API 懒加载
@@ -91,16 +110,29 @@ class WikiNode:
     # 导航操作
     # ──────────────────────────────────────────
 
-    def ls(self) -> List[Union["WikiNode", "BitableNode", "SheetNode"]]:
+    def ls(self, refresh: bool = False) -> List[Union["WikiNode", "BitableNode", "SheetNode"]]:
         """
-        列出当前节点的所有直接子节点。
+        列出当前节点的所有直接子节点。结果缓存在节点上，之后的 ls / get / cd 不再请求；
+        子节点在别处发生变化时传 refresh=True 或调用 refresh()。
 
         Returns:
             子节点列表，根据 obj_type 自动返回对应节点类型。
         """
-        api = self._get_api()
-        raws = api.list_nodes(self.space_id, parent_node_token=self.node_token)
-        return [_make_node(r, api) for r in raws]
+        if self._children is None or refresh:
+            api = self._get_api()
+            raws = api.list_nodes(self.space_id, parent_node_token=self.node_token)
+            children = [_make_node(r, api) for r in raws]
+            by_title: Dict[str, WikiNode] = {}
+            for child in children:
+                if isinstance(child, WikiNode):
+                    by_title.setdefault(child.title, child)
+            self._children, self._children_by_title = children, by_title
+        return list(self._children)
+
+    def refresh(self) -> None:
+        """丢弃子节点缓存，下次 ls / get / cd 时重新获取。"""
+        self._children = None
+        self._children_by_title = {}
 
     def get(self, name: str) -> Union["WikiNode", "BitableNode", "SheetNode"]:
         """
@@ -115,14 +147,20 @@ class WikiNode:
         Raises:
             KeyError: 未找到名称匹配的子节点
         """
-        children = self.ls()
-        # 先精确匹配，再模糊匹配
-        for child in children:
-            if hasattr(child, "title") and child.title == name:
-                return child
-        for child in children:
-            if hasattr(child, "title") and name in child.title:
+        self.ls()
+        # 精确匹配先查索引；索引只收录 WikiNode，其余类型在同一趟扫描中精确 / 模糊一起比较
+        hit = self._children_by_title.get(name)
+        if hit is not None:
+            return hit
+        fuzzy = None
+        for child in self._children:
+            title = getattr(child, "title", "")
+            if title == name:
                 return child
+            if fuzzy is None and name in title:
+                fuzzy = child
+        if fuzzy is not None:
+            return fuzzy
         raise KeyError(f"在节点 '{self.title}' 下未找到名称包含 '{name}' 的子节点")
 
     def cd(self, name: str) -> "WikiNode":
@@ -205,6 +243,7 @@ class WikiNode:
             obj_type=obj_type,
             parent_node_token=self.node_token,
         )
+        self.refresh()
         return WikiNode._from_raw(raw, api)
 
     def delete(self) -> None:
@@ -238,9 +277,13 @@ class BitableNode:
         app_token: 多维表格的 app_token
     """
 
+    __slots__ = ("app_token", "_builder", "_table_ids")
+
     def __init__(self, app_token: str, _builder: Any = None):
         self.app_token = app_token
         self._builder = _builder  # FeishuBitableBuilder 实例（懒注入）
+        # 数据表名称 → table_id（"" 对应第一个数据表），首次按名称查找时填充
+        self._table_ids: Optional[Dict[str, str]] = None
 
     def _get_builder(self):
         """懒加载 FeishuBitableBuilder。"""
@@ -260,12 +303,9 @@ class BitableNode:
         Returns:
             数据表列表，每项含 table_id、name 等
         """
-        import requests
         builder = self._get_builder()
-        url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{self.app_token}/tables"
-        resp = requests.get(url, headers=builder._headers(), timeout=15)
-        resp.raise_for_status()
-        data = builder._check_resp(resp.json(), "列出数据表")
+        url = f"{BITABLE_API_BASE}/{self.app_token}/tables"
+        data = builder._get(url, "列出数据表", timeout=15)
         return data.get("data", {}).get("items", [])
 
     def get_table_id(self, table_name: str) -> str:
@@ -281,13 +321,11 @@ class BitableNode:
         Raises:
             KeyError: 未找到对应名称的数据表
         """
-        tables = self.list_tables()
-        for t in tables:
-            if t.get("name") == table_name:
-                return t["table_id"]
-        # 若 table_name 为空，返回第一个
-        if not table_name and tables:
-            return tables[0]["table_id"]
+        # 名称 → ID 映射缓存在实例上，重复读写同一数据表不再请求列表；未命中时重新拉取一次
+        if self._table_ids is None or table_name not in self._table_ids:
+            self._table_ids = _name_index(self.list_tables(), "name", "table_id")
+        if table_name in self._table_ids:
+            return self._table_ids[table_name]
         raise KeyError(f"多维表格 {self.app_token} 中未找到数据表 '{table_name}'")
 
     # ──────────────────────────────────────────
@@ -311,32 +349,63 @@ class BitableNode:
         Returns:
             记录列表，每项为 {字段名: 值} 的字典
         """
-        import requests
+        return list(self.iter_query(table_name, filter_formula, page_size))
+
+    def iter_query(
+        self,
+        table_name: str = "",
+        filter_formula: str = "",
+        page_size: int = 100,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        逐条产出记录，边翻页边产出：内存中只保留当前一页，适合对大表做过滤 / 聚合，
+        或找到目标后提前结束。参数与 query 相同。
+        """
         builder = self._get_builder()
         table_id = self.get_table_id(table_name)
-        url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{self.app_token}/tables/{table_id}/records"
+        url = f"{BITABLE_API_BASE}/{self.app_token}/tables/{table_id}/records"
 
-        all_records: List[Dict] = []
-        page_token: Optional[str] = None
+        params: Dict[str, Any] = {"page_size": min(page_size, 500)}
+        if filter_formula:
+            params["filter"] = filter_formula
 
         while True:
-            params: Dict[str, Any] = {"page_size": min(page_size, 500)}
-            if page_token:
-                params["page_token"] = page_token
-            if filter_formula:
-                params["filter"] = filter_formula
+            # 分页依赖上一页的 page_token，只能串行；经构建器的共享会话复用连接
+            data = builder._get(url, "查询记录", params=params, timeout=15)
+            payload = data.get("data") or {}
+            for item in payload.get("items") or ():
+                yield item.get("fields", {})
+
+            page_token = payload.get("page_token")
+            if not payload.get("has_more") or not page_token:
+                return
+            params["page_token"] = page_token
+
+    async def aquery(
+        self,
+        table_name: str = "",
+        filter_formula: str = "",
+        page_size: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """query 的 asyncio 版本：在工作线程中执行，不阻塞事件循环，可配合 asyncio.gather 并发。"""
+        import asyncio
+        return await asyncio.to_thread(self.query, table_name, filter_formula, page_size)
 
-            resp = requests.get(url, params=params, headers=builder._headers(), timeout=15)
-            resp.raise_for_status()
-            data = builder._check_resp(resp.json(), "查询记录")
-            items = data.get("data", {}).get("items", [])
-            all_records.extend(item.get("fields", {}) for item in items)
+    def query_many(self, specs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """
+        并发执行多个查询（如多个数据表 / 多个过滤条件），总耗时约等于最慢的一个。
 
-            if not data.get("data", {}).get("has_more"):
-                break
-            page_token = data.get("data", {}).get("page_token")
+        Args:
+            specs: 每项为 query 的关键字参数，如 [{"table_name": "A"}, {"filter_formula": "..."}]
 
-        return all_records
+        Returns:
+            与 specs 顺序一致的记录列表
+        """
+        if len(specs) <= 1:
+            return [self.query(**spec) for spec in specs]
+        workers = min(QUERY_MAX_WORKERS, len(specs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda spec: self.query(**spec), specs))
 
     def append_rows(
         self,
@@ -373,13 +442,18 @@ class BitableNode:
             新建数据表的 table_id
         """
         builder = self._get_builder()
-        table_id = builder.create_table(self.app_token, table_name)
-        if fields_config:
-            import time
-            time.sleep(0.5)
-            builder.setup_fields(self.app_token, table_id, fields_config)
+        # 字段随建表请求一次创建
+        table_id = builder.create_table(self.app_token, table_name, fields=fields_config)
+        # 直接把新表写入名称缓存，随后的读写不必再拉一次数据表列表
+        if self._table_ids is None:
+            self._table_ids = {}
+        self._table_ids.setdefault(table_name, table_id)
         return table_id
 
+    def invalidate(self) -> None:
+        """清空数据表名称 → ID 缓存（在别处增删 / 重命名数据表后调用）。"""
+        self._table_ids = None
+
     # ──────────────────────────────────────────
     # 属性
     # ──────────────────────────────────────────
@@ -407,9 +481,13 @@ class SheetNode:
         spreadsheet_token: 电子表格的 token
     """
 
+    __slots__ = ("spreadsheet_token", "_builder", "_sheet_ids")
+
     def __init__(self, spreadsheet_token: str, _builder: Any = None):
         self.spreadsheet_token = spreadsheet_token
         self._builder = _builder  # FeishuSheetBuilder 实例（懒注入）
+        # 工作表名称 → sheetId（"" 对应第一个工作表），首次按名称查找时填充
+        self._sheet_ids: Optional[Dict[str, str]] = None
 
     def _get_builder(self):
         """懒加载 FeishuSheetBuilder。"""
@@ -439,14 +517,13 @@ class SheetNode:
         Returns:
             sheetId 字符串
         """
-        sheets = self.get_sheets()
-        if not sheets:
-            raise RuntimeError(f"表格 {self.spreadsheet_token} 没有工作表")
-        if not sheet_name:
-            return sheets[0]["sheetId"]
-        for s in sheets:
-            if s.get("title") == sheet_name:
-                return s["sheetId"]
+        if self._sheet_ids is None or sheet_name not in self._sheet_ids:
+            sheets = self.get_sheets()
+            if not sheets:
+                raise RuntimeError(f"表格 {self.spreadsheet_token} 没有工作表")
+            self._sheet_ids = _name_index(sheets, "title", "sheetId")
+        if sheet_name in self._sheet_ids:
+            return self._sheet_ids[sheet_name]
         raise KeyError(f"未找到工作表 '{sheet_name}'")
 
     # ──────────────────────────────────────────
@@ -476,6 +553,37 @@ class SheetNode:
         sheet_id = self.get_sheet_id(sheet_name)
         return builder.write_data(self.spreadsheet_token, sheet_id, data, start_row, start_col)
 
+    async def awrite(
+        self,
+        data: List[List[Any]],
+        sheet_name: str = "",
+        start_row: int = 1,
+        start_col: str = "A",
+    ) -> dict:
+        """write 的 asyncio 版本：在工作线程中执行，不阻塞事件循环，可配合 asyncio.gather 并发。"""
+        import asyncio
+        return await asyncio.to_thread(self.write, data, sheet_name, start_row, start_col)
+
+    def write_many(self, specs: List[Dict[str, Any]]) -> List[dict]:
+        """
+        并发写入多个互不重叠的区间（如多个工作表 / 同一工作表的不同区域），
+        总耗时约等于最慢的一个。
+
+        Args:
+            specs: 每项为 write 的关键字参数，如 [{"data": [...], "sheet_name": "A"}, ...]
+
+        Returns:
+            与 specs 顺序一致的 API 响应列表
+        """
+        if len(specs) <= 1:
+            return [self.write(**spec) for spec in specs]
+        # 先串行解析工作表 ID，避免各线程同时因缓存未命中重复拉取工作表列表
+        for name in {spec.get("sheet_name", "") for spec in specs}:
+            self.get_sheet_id(name)
+        workers = min(WRITE_MANY_MAX_WORKERS, len(specs))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda spec: self.write(**spec), specs))
+
     def append(
         self,
         rows: List[List[Any]],
@@ -495,6 +603,17 @@ class SheetNode:
         sheet_id = self.get_sheet_id(sheet_name)
         return builder.append_rows(self.spreadsheet_token, sheet_id, rows)
 
+    def buffered_append(self, sheet_name: str = "") -> Any:
+        """
+        逐行追加的缓冲区（同 FeishuSheetBuilder.buffered_append），多行合并为一次请求::
+
+            with sheet.buffered_append() as buf:
+                for row in rows:
+                    buf.add(row)
+        """
+        builder = self._get_builder()
+        return builder.buffered_append(self.spreadsheet_token, self.get_sheet_id(sheet_name))
+
     # ──────────────────────────────────────────
     # 属性
     # ──────────────────────────────────────────
@@ -506,6 +625,10 @@ class SheetNode:
         domain = os.environ.get("FEISHU_DOMAIN", "open")
         return f"https://{domain}.feishu.cn/sheets/{self.spreadsheet_token}"
 
+    def invalidate(self) -> None:
+        """清空工作表名称 → ID 缓存（在别处增删 / 重命名工作表后调用）。"""
+        self._sheet_ids = None
+
     def __repr__(self) -> str:
         return f"SheetNode(spreadsheet_token={self.spreadsheet_token!r})"
 
@@ -514,6 +637,23 @@ class SheetNode:
 # 工厂函数
 # ──────────────────────────────────────────────────────────────
 
+def _name_index(items: List[Dict[str, Any]], name_key: str, id_key: str) -> Dict[str, str]:
+    """构造 名称 → ID 映射（重名时取第一个）；"" 映射到第一项，对应 "留空使用第一个" 的约定。"""
+    index: Dict[str, str] = {}
+    for item in items:
+        index.setdefault(item.get(name_key), item[id_key])
+    if items:
+        index.setdefault("", items[0][id_key])
+    return index
+
+
+# obj_type → 叶子节点类（构造参数为 obj_token）；不在表中的类型构造 WikiNode
+_LEAF_NODE_TYPES = {
+    "bitable": BitableNode,
+    "sheet": SheetNode,
+}
+
+
 def _make_node(
     raw: Dict[str, Any],
     api: Any = None,
@@ -522,11 +662,9 @@ def _make_node(
     根据节点的 obj_type 返回对应的节点对象。
     bitable / sheet 类型直接构造对应节点；其余类型构造 WikiNode。
     """
-    obj_type = raw.get("obj_type", "docx")
-    obj_token = raw.get("obj_token", "")
-
-    if obj_type == "bitable" and obj_token:
-        return BitableNode(app_token=obj_token)
-    if obj_type == "sheet" and obj_token:
-        return SheetNode(spreadsheet_token=obj_token)
+    leaf = _LEAF_NODE_TYPES.get(raw.get("obj_type"))
+    if leaf is not None:
+        obj_token = raw.get("obj_token")
+        if obj_token:
+            return leaf(obj_token)
     return WikiNode._from_raw(raw, api)
@@ -11,20 +11,59 @@ API 参考：
   - 追加行:        POST /open-apis/sheets/v2/spreadsheets/{token}/values_append
 """
 
-import os
+import functools
+import logging
 import time
-import requests
-from typing import List, Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
+from feishu_kit._base import FEISHU_API_BASE, _FeishuBaseClient
+from feishu_kit.http_session import gzip_payload, gzip_rejected, json_dumps, json_loads
 
-FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
-TOKEN_URL = f"{FEISHU_API_BASE}/auth/v3/tenant_access_token/internal"
+if TYPE_CHECKING:
+    import requests
 
-# 单次写入最多 5000 行
+
+# 单次写入最多 5000 行、5000 个单元格（超出时按行切块并发写入）
 WRITE_ROW_LIMIT = 5000
+WRITE_CELL_LIMIT = 5000
+# write_data 分块写入时的最大并发数
+WRITE_MAX_WORKERS = 4
+# get_sheets 结果缓存有效期（秒），重命名工作表时主动失效
+SCHEMA_CACHE_TTL = 60.0
+# buffered_append 缓冲的最长时间（秒），超过后下一次 add 即写出
+APPEND_MAX_DELAY = 2.0
+
+logger = logging.getLogger(__name__)
+
+
+def _as_rows(data: Any, header: bool = True) -> Any:
+    """
+    把 NumPy 二维数组 / pandas DataFrame 转为嵌套列表，NaN 转为 None（写入空单元格）；
+    其他输入原样返回。DataFrame 在 header=True 时以列名作为第一行。
+
+    tolist() 在 C 层把整块数组转成 Python 标量，浮点列的 NaN 用一次向量化掩码处理，
+    不必逐个单元格做类型判断。NumPy / pandas 不是依赖，只按鸭子类型识别。
+    """
+    columns = getattr(data, "columns", None)
+    to_numpy = getattr(data, "to_numpy", None)
+    if columns is not None and to_numpy is not None:
+        rows = _as_rows(to_numpy(), header=False)
+        return [[str(c) for c in columns], *rows] if header else rows
+    dtype = getattr(data, "dtype", None)
+    if dtype is None or not hasattr(data, "tolist"):
+        return data
+    if data.ndim != 2:
+        raise ValueError(f"写入数据需为二维数组，实际维度: {data.ndim}")
+    if dtype.kind in "fO":
+        mask = data != data          # NaN 与自身不等
+        if mask.any():
+            data = data.astype(object)
+            data[mask] = None
+    return data.tolist()
 
 
-class FeishuSheetBuilder:
+class FeishuSheetBuilder(_FeishuBaseClient):
     """
     飞书电子表格构建器：从零开始在指定文件夹创建电子表格并写入数据。
 
@@ -50,47 +89,13 @@ class FeishuSheetBuilder:
         self,
         app_id: Optional[str] = None,
         app_secret: Optional[str] = None,
+        session: Optional["requests.Session"] = None,
     ):
-        self.app_id = app_id or os.environ.get("FEISHU_APP_ID", "")
-        self.app_secret = app_secret or os.environ.get("FEISHU_APP_SECRET", "")
-        self._token: Optional[str] = None
-        self._token_expire_at: float = 0
-
-    # ──────────────────────────────────────────
-    # 内部：Token 与请求
-    # ──────────────────────────────────────────
-
-    def _get_token(self) -> str:
-        """获取并缓存 tenant_access_token（提前 60 秒刷新）。"""
-        if self._token and time.time() < self._token_expire_at - 60:
-            return self._token
-        resp = requests.post(
-            TOKEN_URL,
-            json={"app_id": self.app_id, "app_secret": self.app_secret},
-            headers={"Content-Type": "application/json"},
-            timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if data.get("code") != 0:
-            raise RuntimeError(f"获取 token 失败: {data}")
-        self._token = data["tenant_access_token"]
-        self._token_expire_at = time.time() + data.get("expire", 7200)
-        return self._token
-
-    def _headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self._get_token()}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
-
-    def _check_resp(self, data: dict, action: str) -> dict:
-        """统一检查响应 code，非 0 时抛出带上下文的异常。"""
-        if data.get("code") != 0:
-            raise RuntimeError(
-                f"{action} 失败 (code={data.get('code')}): {data.get('msg')} | 详情: {data}"
-            )
-        return data
+        super().__init__(app_id, app_secret, session)
+        # 工作表列表缓存 spreadsheet_token → (获取时刻 monotonic, 工作表列表)
+        self._sheets_cache: Dict[str, Tuple[float, List[Dict]]] = {}
+        # 大请求体是否 gzip 压缩；服务端拒收压缩请求体后自动关闭
+        self._gzip = True
 
     # ──────────────────────────────────────────
     # 电子表格
@@ -111,15 +116,14 @@ class FeishuSheetBuilder:
         body: Dict[str, Any] = {"title": title}
         if folder_token:
             body["folder_token"] = folder_token
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), f"创建电子表格「{title}」")
+        data = self._post(url, body, f"创建电子表格「{title}」")
         ss = data["data"]["spreadsheet"]
         spreadsheet_token = ss["spreadsheet_token"]
         sheet_url = ss.get("url", "")
-        print(f"[✓] 电子表格已创建: 「{title}」")
-        print(f"    spreadsheet_token : {spreadsheet_token}")
-        print(f"    url               : {sheet_url}")
+        logger.info(
+            "[✓] 电子表格已创建: 「%s」  spreadsheet_token=%s  url=%s",
+            title, spreadsheet_token, sheet_url,
+        )
         return spreadsheet_token
 
     # ──────────────────────────────────────────
@@ -129,16 +133,27 @@ class FeishuSheetBuilder:
     def get_sheets(self, spreadsheet_token: str) -> List[Dict]:
         """
         列出电子表格内的所有工作表。
-        使用 v2/metainfo 接口，返回 sheets 数组。
+        使用 v2/metainfo 接口，返回 sheets 数组（结果缓存 SCHEMA_CACHE_TTL 秒）。
 
         Returns:
             工作表列表，每项含 sheetId、title、index 等
         """
+        cached = self._sheets_cache.get(spreadsheet_token)
+        if cached is not None and time.monotonic() - cached[0] < SCHEMA_CACHE_TTL:
+            return list(cached[1])
         url = f"{FEISHU_API_BASE}/sheets/v2/spreadsheets/{spreadsheet_token}/metainfo"
-        resp = requests.get(url, headers=self._headers(), timeout=10)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), "获取表格元数据")
-        return data.get("data", {}).get("sheets", [])
+        data = self._get(url, "获取表格元数据")
+        sheets = data.get("data", {}).get("sheets", [])
+        self._sheets_cache[spreadsheet_token] = (time.monotonic(), sheets)
+        return list(sheets)
+
+    def _get_sheets_nonempty(self, spreadsheet_token: str) -> List[Dict]:
+        """get_sheets，列表为空时抛 RuntimeError（不写入缓存），供就绪重试使用。"""
+        sheets = self.get_sheets(spreadsheet_token)
+        if not sheets:
+            self._sheets_cache.pop(spreadsheet_token, None)
+            raise RuntimeError("未能获取到工作表列表")
+        return sheets
 
     def rename_sheet(
         self,
@@ -167,10 +182,9 @@ class FeishuSheetBuilder:
                 }
             ]
         }
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        self._check_resp(resp.json(), f"重命名工作表 → 「{new_title}」")
-        print(f"[✓] 工作表已重命名: 「{new_title}」  sheet_id={sheet_id}")
+        self._sheets_cache.pop(spreadsheet_token, None)
+        self._post(url, body, f"重命名工作表 → 「{new_title}」")
+        logger.info("[✓] 工作表已重命名: 「%s」  sheet_id=%s", new_title, sheet_id)
 
     # ──────────────────────────────────────────
     # 数据写入
@@ -190,31 +204,70 @@ class FeishuSheetBuilder:
         Args:
             spreadsheet_token: 表格 token
             sheet_id:          工作表 ID
-            data:              二维数组，第一行通常为表头
+            data:              二维数组，第一行通常为表头；也可传 NumPy 二维数组 /
+                               pandas DataFrame（列名写为第一行，NaN 写为空单元格）
             start_row:         起始行号（1-indexed）
             start_col:         起始列字母，默认 "A"
 
+        超过 WRITE_CELL_LIMIT 个单元格时按行切块，各块并发写入；较大的块以 gzip 压缩发送。
+
         Returns:
-            API 响应 JSON
+            API 响应 JSON（分块时为最后一块的响应）
         """
+        data = _as_rows(data)
         if not data:
             return {}
 
         # 计算结束单元格：列数转为字母列号
-        num_cols = max(len(row) for row in data)
+        num_cols = max(map(len, data))
         end_col = self._col_index_to_letter(
             self._letter_to_col_index(start_col) + num_cols - 1
         )
-        end_row = start_row + len(data) - 1
-        range_spec = f"{sheet_id}!{start_col}{start_row}:{end_col}{end_row}"
-
         url = f"{FEISHU_API_BASE}/sheets/v2/spreadsheets/{spreadsheet_token}/values"
-        body = {"valueRange": {"range": range_spec, "values": data}}
-        resp = requests.put(url, json=body, headers=self._headers(), timeout=20)
-        resp.raise_for_status()
-        result = self._check_resp(resp.json(), f"写入数据到 {range_spec}")
-        print(f"[✓] 已写入 {len(data)} 行 × {num_cols} 列  →  范围: {range_spec}")
-        return result
+
+        # 按单元格数切块，每块对应一段连续行区间
+        rows_per_chunk = self._rows_per_chunk(num_cols)
+        offsets = list(range(0, len(data), rows_per_chunk))
+
+        def put(offset: int) -> dict:
+            chunk = data[offset: offset + rows_per_chunk]
+            first = start_row + offset
+            range_spec = f"{sheet_id}!{start_col}{first}:{end_col}{first + len(chunk) - 1}"
+            result = self._put_values(url, range_spec, chunk)
+            logger.info("[✓] 已写入 %d 行 × %d 列  →  范围: %s", len(chunk), num_cols, range_spec)
+            return result
+
+        if len(offsets) == 1:
+            return put(0)
+        workers = min(WRITE_MAX_WORKERS, len(offsets))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(put, offsets))
+        return results[-1]
+
+    def _put_values(self, url: str, range_spec: str, values: List[List[Any]]) -> dict:
+        """写入单个区间；限流与 5xx 由会话按 RETRY_STATUS 退避重试（PUT 可安全重放）。"""
+        body = {"valueRange": {"range": range_spec, "values": values}}
+        return self._send_values("PUT", url, body, f"写入数据到 {range_spec}")
+
+    def _send_values(self, method: str, url: str, body: Dict[str, Any], action: str) -> dict:
+        """
+        发送单元格数据请求：较大的请求体以 gzip 压缩发送，服务端拒收压缩请求体后改发原文。
+        这里不再叠加重试：会话的重试策略已对 PUT 的限流与 5xx 退避重试，追加行的 POST 不可重放、不重试。
+        """
+        raw = json_dumps(body)  # 只序列化 / 压缩一次，改发原文时复用
+        payload, gzipped = gzip_payload(raw) if self._gzip else (raw, False)
+        while True:
+            headers = self._headers()
+            if gzipped:
+                headers = {**headers, "Content-Encoding": "gzip"}
+            resp = self._session.request(method, url, data=payload, headers=headers, timeout=20)
+            if gzipped and gzip_rejected(resp):
+                # 服务端不接受压缩请求体：之后都发未压缩的，本次立即重发
+                self._gzip = False
+                payload, gzipped = raw, False
+                continue
+            resp.raise_for_status()
+            return self._check_resp(json_loads(resp.content), action)
 
     def append_rows(
         self,
@@ -228,21 +281,44 @@ class FeishuSheetBuilder:
         Args:
             spreadsheet_token: 表格 token
             sheet_id:          工作表 ID
-            rows:              要追加的行（二维数组）
+            rows:              要追加的行（二维数组，或 NumPy 二维数组 / pandas DataFrame，
+                               DataFrame 不含列名）
+
+        超过 WRITE_ROW_LIMIT 行 / WRITE_CELL_LIMIT 个单元格时按行切块，按顺序逐块追加。
 
         Returns:
-            API 响应 JSON
+            API 响应 JSON（分块时为最后一块的响应）
         """
+        rows = _as_rows(rows, header=False)
         if not rows:
             return {}
         url = f"{FEISHU_API_BASE}/sheets/v2/spreadsheets/{spreadsheet_token}/values_append"
-        body = {"valueRange": {"range": f"{sheet_id}!A1", "values": rows}}
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=20)
-        resp.raise_for_status()
-        result = self._check_resp(resp.json(), "追加行")
-        print(f"[✓] 已追加 {len(rows)} 行")
+        rows_per_chunk = self._rows_per_chunk(max(map(len, rows)))
+        result: dict = {}
+        # 追加位置取决于已有数据末尾，各块必须串行
+        for offset in range(0, len(rows), rows_per_chunk):
+            chunk = rows[offset: offset + rows_per_chunk]
+            body = {"valueRange": {"range": f"{sheet_id}!A1", "values": chunk}}
+            result = self._send_values("POST", url, body, "追加行")
+        logger.info("[✓] 已追加 %d 行", len(rows))
         return result
 
+    def buffered_append(
+        self,
+        spreadsheet_token: str,
+        sheet_id: str,
+        max_delay: float = APPEND_MAX_DELAY,
+    ) -> "RowBuffer":
+        """
+        返回逐行追加用的缓冲区：攒够一块或缓冲超过 max_delay 秒时合并为一次 append_rows，
+        退出 with 块时写出剩余行。适合在循环里一行行产生数据的场景::
+
+            with builder.buffered_append(token, sheet_id) as buf:
+                for row in rows:
+                    buf.add(row)
+        """
+        return RowBuffer(self, spreadsheet_token, sheet_id, max_delay)
+
     # ──────────────────────────────────────────
     # 一键构建
     # ──────────────────────────────────────────
@@ -256,7 +332,7 @@ class FeishuSheetBuilder:
         folder_token: str = "",
     ) -> Dict[str, str]:
         """
-        一步完成：创建表格 → 重命名默认工作表 → 写入表头 + 数据。
+        一步完成：创建表格 → 重命名默认工作表 + 写入表头 + 数据（后两步并发）。
 
         Args:
             title:        表格文件名
@@ -268,40 +344,34 @@ class FeishuSheetBuilder:
         Returns:
             {"spreadsheet_token": ..., "sheet_id": ..., "url": ...}
         """
-        print(f"\n{'=' * 50}")
-        print(f"  开始构建: 「{title}」 > 「{sheet_title}」")
-        print(f"{'=' * 50}")
+        logger.info("开始构建: 「%s」 > 「%s」", title, sheet_title)
 
         # 第 1 步：创建表格
         spreadsheet_token = self.create_spreadsheet(title, folder_token=folder_token)
-        time.sleep(0.5)
 
-        # 第 2 步：获取默认工作表（新建表格自带一个）
-        sheets = self.get_sheets(spreadsheet_token)
-        if not sheets:
-            raise RuntimeError("未能获取到工作表列表")
+        # 第 2 步：获取默认工作表（新建表格自带一个，刚创建时可能短暂为空）
+        sheets = self._retry_not_ready(self._get_sheets_nonempty, spreadsheet_token)
         default_sheet = sheets[0]
         sheet_id = default_sheet["sheetId"]
-        print(f"[✓] 默认工作表: sheet_id={sheet_id}")
-        time.sleep(0.3)
-
-        # 第 3 步：重命名工作表
-        self.rename_sheet(spreadsheet_token, sheet_id, sheet_title)
-        time.sleep(0.3)
+        logger.info("[✓] 默认工作表: sheet_id=%s", sheet_id)
 
-        # 第 4 步：写入表头 + 数据
+        # 第 3、4 步：重命名工作表与写入表头 + 数据都按 sheet_id 定位，互不依赖，并发执行
         all_data = [headers] + rows
-        print(f"\n── 写入数据（{len(rows)} 行 × {len(headers)} 列）──")
-        self.write_data(spreadsheet_token, sheet_id, all_data)
+        logger.info("── 写入数据（%d 行 × %d 列）──", len(rows), len(headers))
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            renamed = pool.submit(
+                self._retry_not_ready, self.rename_sheet, spreadsheet_token, sheet_id, sheet_title,
+            )
+            written = pool.submit(
+                self._retry_not_ready, self.write_data, spreadsheet_token, sheet_id, all_data,
+            )
+            renamed.result()
+            written.result()
 
         # 拼出访问 URL
         sheet_url = f"https://open.feishu.cn/open-apis/drive/v1/files/{spreadsheet_token}"
 
-        print(f"\n{'=' * 50}")
-        print(f"  全部完成！")
-        print(f"  spreadsheet_token : {spreadsheet_token}")
-        print(f"  sheet_id          : {sheet_id}")
-        print(f"{'=' * 50}\n")
+        logger.info("全部完成！ spreadsheet_token=%s  sheet_id=%s", spreadsheet_token, sheet_id)
 
         return {
             "spreadsheet_token": spreadsheet_token,
@@ -313,6 +383,12 @@ class FeishuSheetBuilder:
     # ──────────────────────────────────────────
 
     @staticmethod
+    def _rows_per_chunk(num_cols: int) -> int:
+        """单次写入的行数上限：同时受 WRITE_ROW_LIMIT 与 WRITE_CELL_LIMIT 约束。"""
+        return max(1, min(WRITE_ROW_LIMIT, WRITE_CELL_LIMIT // max(num_cols, 1)))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _letter_to_col_index(col: str) -> int:
         """将列字母转为 1-indexed 整数，如 "A"→1, "Z"→26, "AA"→27。"""
         result = 0
@@ -321,6 +397,7 @@ class FeishuSheetBuilder:
         return result
 
     @staticmethod
+    @functools.lru_cache(maxsize=1024)
     def _col_index_to_letter(n: int) -> str:
         """将 1-indexed 整数转为列字母，如 1→"A", 26→"Z", 27→"AA"。"""
         result = ""
@@ -328,3 +405,58 @@ class FeishuSheetBuilder:
             n, remainder = divmod(n - 1, 26)
             result = chr(ord("A") + remainder) + result
         return result
+
+
+class RowBuffer:
+    """
+    FeishuSheetBuilder.buffered_append 返回的追加缓冲区（上下文管理器）。
+
+    add / extend 只在内存中累积，满一块（WRITE_ROW_LIMIT 行 / WRITE_CELL_LIMIT 个单元格）
+    或距上次写出超过 max_delay 秒时才调用一次 append_rows。
+    """
+
+    def __init__(
+        self,
+        builder: FeishuSheetBuilder,
+        spreadsheet_token: str,
+        sheet_id: str,
+        max_delay: float = APPEND_MAX_DELAY,
+    ):
+        self._builder = builder
+        self._token = spreadsheet_token
+        self._sheet_id = sheet_id
+        self._max_delay = max_delay
+        self._rows: List[List[Any]] = []
+        self._cells = 0
+        self._since = time.monotonic()
+
+    def add(self, row: List[Any]) -> None:
+        """缓冲一行。"""
+        self._rows.append(row)
+        self._cells += len(row)
+        if (len(self._rows) >= WRITE_ROW_LIMIT
+                or self._cells >= WRITE_CELL_LIMIT
+                or time.monotonic() - self._since > self._max_delay):
+            self.flush()
+
+    def extend(self, rows: List[List[Any]]) -> None:
+        """缓冲多行。"""
+        for row in rows:
+            self.add(row)
+
+    def flush(self) -> None:
+        """立即写出已缓冲的行。"""
+        rows, self._rows, self._cells = self._rows, [], 0
+        self._since = time.monotonic()
+        if rows:
+            self._builder.append_rows(self._token, self._sheet_id, rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __enter__(self) -> "RowBuffer":
+        return self
+
+    def __exit__(self, exc_type: Any, *exc: Any) -> None:
+        # with 块内抛异常时仍写出已缓冲的行，异常照常向上抛出
+        self.flush()
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+tenant_access_token 共享缓存
+
+token 有效期约 2 小时，同一个应用的所有实例 / 进程可以共用。查找顺序：
+
+  1. 进程内缓存
+  2. 持久缓存：默认 ``~/.cache/feishu_kit/<hash>.json``（文件锁保证多进程只换取一次）；
+     环境变量 ``FEISHU_TOKEN_CACHE`` 可改为 Redis 地址（``redis://...``）、
+     其他缓存目录，或 ``off`` 关闭持久缓存
+  3. 请求 /auth/v3/tenant_access_token/internal 换取新 token 并写回缓存
+
+典型用法::
+
+    from feishu_kit.token_cache import get_tenant_token
+
+    token, expire_at = get_tenant_token(app_id, app_secret)
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, Optional, Tuple
+
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+TOKEN_URL = "https://open.feishu.cn/open-apis/auth/v3/tenant_access_token/internal"
+
+# 距过期不足该秒数时视为失效，重新换取
+REFRESH_MARGIN = 60
+
+DEFAULT_CACHE_DIR = Path("~/.cache/feishu_kit").expanduser()
+
+# 进程内缓存：缓存键 → (token, 过期时刻 time.time())
+_memory: Dict[str, Tuple[str, float]] = {}
+_memory_lock = threading.Lock()
+
+
+def cache_key(app_id: str, app_secret: str) -> str:
+    """
+    应用的缓存键（app_id + secret 的摘要，16 位十六进制）。
+
+    secret 变更后不会误用旧 token，文件名也不暴露 app_id；
+    其他按应用区分的缓存文件（如 CLI 的目录缓存）也用它命名。
+    """
+    return hashlib.sha256(f"{app_id}:{app_secret}".encode()).hexdigest()[:16]
+
+
+def _fresh(entry: Optional[Tuple[str, float]]) -> bool:
+    return bool(entry and entry[0] and time.time() < entry[1] - REFRESH_MARGIN)
+
+
+def _fetch(app_id: str, app_secret: str, session: Optional["requests.Session"]) -> Tuple[str, float]:
+    """向开放平台换取新 token，返回 (token, 过期时刻)。"""
+    import requests
+    resp = (session or requests).post(
+        TOKEN_URL,
+        json={"app_id": app_id, "app_secret": app_secret},
+        headers={"Content-Type": "application/json"},
+        timeout=10,
+    )
+    resp.raise_for_status()
+    data = resp.json()
+    if data.get("code") != 0:
+        raise RuntimeError(f"获取 token 失败: {data}")
+    return data["tenant_access_token"], time.time() + data.get("expire", 7200)
+
+
+# ──────────────────────────────────────────
+# 文件缓存
+# ──────────────────────────────────────────
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    """独占文件锁（POSIX 用 fcntl.flock，Windows 用 msvcrt.locking）。"""
+    with open(path, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        else:
+            import msvcrt
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_file(path: Path) -> Optional[Tuple[str, float]]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return data["token"], float(data["expire_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_file(path: Path, token: str, expire_at: float) -> None:
+    """先写临时文件再原子替换，权限 0600（token 属于凭证）。"""
+    tmp = path.with_suffix(".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump({"token": token, "expire_at": expire_at}, f)
+    os.replace(tmp, path)
+
+
+def _via_file(
+    cache_dir: Path, key: str, app_id: str, app_secret: str,
+    session: Optional["requests.Session"],
+) -> Tuple[str, float]:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / f"{key}.json"
+    entry = _read_file(path)
+    if _fresh(entry):
+        return entry
+    # 加锁后再检查一次：并发进程中只有第一个真正去换取 token
+    with _file_lock(cache_dir / f"{key}.lock"):
+        entry = _read_file(path)
+        if _fresh(entry):
+            return entry
+        entry = _fetch(app_id, app_secret, session)
+        _write_file(path, *entry)
+        return entry
+
+
+# ──────────────────────────────────────────
+# Redis 缓存
+# ──────────────────────────────────────────
+
+def _via_redis(
+    url: str, key: str, app_id: str, app_secret: str,
+    session: Optional["requests.Session"],
+) -> Tuple[str, float]:
+    try:
+        import redis
+    except ImportError:
+        raise RuntimeError("FEISHU_TOKEN_CACHE 指向 Redis，但未安装 redis：pip install redis")
+    client = redis.Redis.from_url(url)
+    rkey = f"feishu_kit:token:{key}"
+    cached = client.get(rkey)
+    if cached:
+        ttl = client.ttl(rkey)
+        # 写入时已扣掉 REFRESH_MARGIN，剩余 ttl 即可用时长
+        return cached.decode(), time.time() + max(ttl, 0) + REFRESH_MARGIN
+    token, expire_at = _fetch(app_id, app_secret, session)
+    ex = int(expire_at - time.time()) - REFRESH_MARGIN
+    if ex > 0:
+        client.set(rkey, token, ex=ex)
+    return token, expire_at
+
+
+# ──────────────────────────────────────────
+# 对外接口
+# ──────────────────────────────────────────
+
+def get_tenant_token(
+    app_id: str,
+    app_secret: str,
+    session: Optional["requests.Session"] = None,
+) -> Tuple[str, float]:
+    """
+    获取 tenant_access_token，优先复用进程内 / 磁盘 / Redis 中未过期的 token。
+
+    Args:
+        app_id:     飞书应用 ID
+        app_secret: 飞书应用 Secret
+        session:    换取 token 时使用的 HTTP 会话（可选）
+
+    Returns:
+        (token, 过期时刻)，过期时刻为 time.time() 时间戳
+    """
+    key = cache_key(app_id, app_secret)
+    with _memory_lock:
+        entry = _memory.get(key)
+    if _fresh(entry):
+        return entry
+
+    backend = os.environ.get("FEISHU_TOKEN_CACHE", "").strip()
+    if backend.lower() in ("off", "0", "none"):
+        entry = _fetch(app_id, app_secret, session)
+    elif backend.startswith(("redis://", "rediss://", "unix://")):
+        entry = _via_redis(backend, key, app_id, app_secret, session)
+    else:
+        import requests
+        cache_dir = Path(backend).expanduser() if backend else DEFAULT_CACHE_DIR
+        try:
+            entry = _via_file(cache_dir, key, app_id, app_secret, session)
+        except requests.RequestException:
+            raise
+        except OSError:
+            # 缓存目录不可写（只读 HOME、沙箱等）时退化为仅进程内缓存
+            entry = _fetch(app_id, app_secret, session)
+
+    with _memory_lock:
+        _memory[key] = entry
+    return entry
+
+
+def invalidate_tenant_token(app_id: str, app_secret: str) -> None:
+    """丢弃进程内与磁盘上缓存的 token（例如应用被停用、token 被提前吊销时）。"""
+    key = cache_key(app_id, app_secret)
+    with _memory_lock:
+        _memory.pop(key, None)
+    backend = os.environ.get("FEISHU_TOKEN_CACHE", "").strip()
+    if backend.startswith(("redis://", "rediss://", "unix://")):
+        try:
+            import redis
+            redis.Redis.from_url(backend).delete(f"feishu_kit:token:{key}")
+        except ImportError:
+            pass
+    elif backend.lower() not in ("off", "0", "none"):
+        cache_dir = Path(backend).expanduser() if backend else DEFAULT_CACHE_DIR
+        try:
+            (cache_dir / f"{key}.json").unlink()
+        except OSError:
+            pass
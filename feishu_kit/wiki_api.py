@@ -15,12 +15,26 @@ API 参考：
 """
 
 import os
+import threading
 import time
-import requests
-from typing import List, Dict, Optional, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple, TYPE_CHECKING
+
+from feishu_kit._base import FEISHU_API_BASE, _FeishuBaseClient
+
+if TYPE_CHECKING:
+    import requests
+
+# get_nodes_batch / batch_delete_nodes 的最大并发数
+BATCH_MAX_WORKERS = 8
+# get_ancestor_chain 缓存的祖先节点数上限（LRU）
+ANCESTOR_CACHE_SIZE = 1024
+# 祖先节点缓存有效期（秒）：网页端重命名 / 移动后，过期即重新获取
+ANCESTOR_CACHE_TTL = 60.0
+# 列出空间 / 子节点时的每页数量：两个接口的 page_size 上限均为 50，默认取上限以减少翻页请求
+WIKI_PAGE_SIZE = 50
 
-FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
-TOKEN_URL = f"{FEISHU_API_BASE}/auth/v3/tenant_access_token/internal"
 
 # 节点类型 → 显示图标
 NODE_TYPE_ICONS: Dict[str, str] = {
@@ -35,7 +49,7 @@ NODE_TYPE_ICONS: Dict[str, str] = {
 }
 
 
-class FeishuWikiAPI:
+class FeishuWikiAPI(_FeishuBaseClient):
     """
     飞书知识库操作封装。
 
@@ -52,78 +66,59 @@ class FeishuWikiAPI:
         app_id: Optional[str] = None,
         app_secret: Optional[str] = None,
         domain: Optional[str] = None,
+        session: Optional["requests.Session"] = None,
     ):
-        self.app_id     = app_id     or os.environ.get("FEISHU_APP_ID", "")
-        self.app_secret = app_secret or os.environ.get("FEISHU_APP_SECRET", "")
-        self.domain     = domain     or os.environ.get("FEISHU_DOMAIN", "")
-        self._token: Optional[str] = None
-        self._token_expire_at: float = 0
+        super().__init__(app_id, app_secret, session)
+        self.domain = domain or os.environ.get("FEISHU_DOMAIN", "")
+        # node_token → parent_node_token，get_node / list_nodes 时顺带记录，
+        # 供 get_ancestor_chain 推测祖先链并并发拉取
+        self._parent_cache: Dict[str, str] = {}
+        # node_token → (获取时刻 monotonic, 节点信息)，get_ancestor_chain 拉取过的节点；
+        # 同一空间下各条链共享上层祖先，命中后整段上游直接取缓存。
+        # 条目 ANCESTOR_CACHE_TTL 秒后过期；移动 / 删除节点或调用 invalidate_ancestors 时清空
+        self._ancestor_cache: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._ancestor_lock = threading.Lock()
 
     # ──────────────────────────────────────────
     # 内部：Token 与请求
     # ──────────────────────────────────────────
 
-    def _get_token(self) -> str:
-        """获取并缓存 tenant_access_token（提前 60 秒刷新）。"""
-        if self._token and time.time() < self._token_expire_at - 60:
-            return self._token
-        resp = requests.post(
-            TOKEN_URL,
-            json={"app_id": self.app_id, "app_secret": self.app_secret},
-            headers={"Content-Type": "application/json"},
-            timeout=10,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        if data.get("code") != 0:
-            raise RuntimeError(f"获取 token 失败: {data}")
-        self._token = data["tenant_access_token"]
-        self._token_expire_at = time.time() + data.get("expire", 7200)
-        return self._token
-
-    def _headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self._get_token()}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
-
     def _check_resp(self, data: dict, action: str) -> dict:
-        if data.get("code") != 0:
-            raise RuntimeError(
-                f"{action} 失败 (code={data.get('code')}): {data.get('msg')}"
-            )
-        return data
+        """与基类相同，但异常信息不附带完整响应（CLI 会直接展示给用户）。"""
+        code = data.get("code")
+        if code == 0:
+            return data
+        raise RuntimeError(f"{action} 失败 (code={code}): {data.get('msg')}")
 
     # ──────────────────────────────────────────
     # 知识库空间
     # ──────────────────────────────────────────
 
-    def list_spaces(self) -> List[Dict[str, Any]]:
+    def list_spaces(self, page_size: int = WIKI_PAGE_SIZE) -> List[Dict[str, Any]]:
         """
         列出应用可访问的所有知识库空间。
 
+        Args:
+            page_size: 每页数量，超过 WIKI_PAGE_SIZE 时按上限取
+
         Returns:
             每项包含 space_id, name, description 等
         """
         url = f"{FEISHU_API_BASE}/wiki/v2/spaces"
         all_spaces: List[Dict] = []
-        page_token: Optional[str] = None
+        # 翻页时只更新 page_token，其余参数在循环外构造一次
+        params: Dict[str, Any] = {"page_size": min(page_size, WIKI_PAGE_SIZE)}
 
         while True:
-            params: Dict[str, Any] = {"page_size": 50}
-            if page_token:
-                params["page_token"] = page_token
-
-            resp = requests.get(url, params=params, headers=self._headers(), timeout=15)
-            resp.raise_for_status()
-            data = self._check_resp(resp.json(), "列出知识库空间")
+            data = self._request("GET", url, "列出知识库空间", params=params, timeout=15)
 
-            items = data.get("data", {}).get("items", [])
-            all_spaces.extend(items)
+            payload = data.get("data") or {}
+            all_spaces.extend(payload.get("items", ()))
 
-            if not data.get("data", {}).get("has_more"):
+            page_token = payload.get("page_token")
+            if not payload.get("has_more") or not page_token:
                 break
-            page_token = data.get("data", {}).get("page_token")
+            params["page_token"] = page_token
 
         return all_spaces
 
@@ -135,6 +130,7 @@ class FeishuWikiAPI:
         self,
         space_id: str,
         parent_node_token: str = "",
+        page_size: int = WIKI_PAGE_SIZE,
     ) -> List[Dict[str, Any]]:
         """
         列出指定空间（或节点）下的子节点。
@@ -142,38 +138,71 @@ class FeishuWikiAPI:
         Args:
             space_id:          知识库空间 ID
             parent_node_token: 父节点 token，空字符串表示根目录
+            page_size:         每页数量，超过 WIKI_PAGE_SIZE 时按上限取
 
         Returns:
             节点列表，每项包含 node_token, title, obj_type, has_child 等
         """
+        nodes, _ = self.list_nodes_if_changed(space_id, parent_node_token, page_size=page_size)
+        return nodes or []
+
+    def list_nodes_if_changed(
+        self,
+        space_id: str,
+        parent_node_token: str = "",
+        etag: Optional[str] = None,
+        page_size: int = WIKI_PAGE_SIZE,
+    ) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        条件列出子节点：带上次的 ETag 发送 If-None-Match，服务端返回 304 时不重新下载列表。
+
+        Returns:
+            (节点列表, 新 ETag)；未变化时节点列表为 None。
+            仅单页列表才返回 ETag（多页时首页 ETag 不能代表整个目录）。
+        """
         url = f"{FEISHU_API_BASE}/wiki/v2/spaces/{space_id}/nodes"
         all_nodes: List[Dict] = []
         page_token: Optional[str] = None
+        new_etag: Optional[str] = None
+
+        # 翻页时只更新 page_token，其余参数在循环外构造一次
+        params: Dict[str, Any] = {"page_size": min(page_size, WIKI_PAGE_SIZE)}
+        if parent_node_token:
+            params["parent_node_token"] = parent_node_token
 
         while True:
-            params: Dict[str, Any] = {"page_size": 50}
-            if parent_node_token:
-                params["parent_node_token"] = parent_node_token
             if page_token:
                 params["page_token"] = page_token
-
-            resp = requests.get(url, params=params, headers=self._headers(), timeout=15)
-            resp.raise_for_status()
-            data = self._check_resp(resp.json(), "列出节点")
-
-            items = data.get("data", {}).get("items", [])
+            # 只有首页带 If-None-Match
+            data, page_etag = self._get_conditional(url, "列出节点", params, None if page_token else etag)
+            if data is None:
+                return None, etag
+            if not page_token:
+                new_etag = page_etag
+
+            payload = data.get("data") or {}
+            items = payload.get("items", ())
             all_nodes.extend(items)
+            for item in items:
+                if item.get("node_token"):
+                    self._parent_cache[item["node_token"]] = item.get("parent_node_token", "")
 
-            if not data.get("data", {}).get("has_more"):
+            if not payload.get("has_more"):
                 break
-            page_token = data.get("data", {}).get("page_token")
+            page_token = payload.get("page_token")
+            new_etag = None
 
-        return all_nodes
+        return all_nodes, new_etag
 
     def get_ancestor_chain(self, node_token: str) -> List[Dict[str, Any]]:
         """
         从给定节点出发，向上回溯父节点，返回从根到当前节点的完整链。
 
+        已知的父指针（之前 get_node / list_nodes 见过的节点）会被用来推测整段祖先链，
+        一次并发拉取；若拉回的父指针与推测不符，则从分歧处继续回溯。
+        之前的调用拉取过的祖先节点取自 LRU 缓存（ANCESTOR_CACHE_TTL 秒内有效），
+        起始节点本身总是重新获取。
+
         Returns:
             List[{node_token, title, space_id}]，index 0 为最顶层祖先，最后一项为当前节点。
         """
@@ -181,16 +210,90 @@ class FeishuWikiAPI:
         token = node_token
         visited = set()
         while token and token not in visited:
-            visited.add(token)
-            try:
-                node = self.get_node(token)
-            except Exception:
-                break
-            chain.append(node)
-            token = node.get("parent_node_token", "")
+            cached = self._cached_ancestor(token) if token != node_token else None
+            if cached is not None:
+                visited.add(token)
+                chain.append(cached)
+                token = cached.get("parent_node_token", "")
+                continue
+
+            # 推测到已缓存的祖先为止，之后由缓存接上
+            speculative: List[str] = []
+            t = token
+            while (t and t not in visited and t not in speculative
+                   and (t == node_token or self._cached_ancestor(t) is None)):
+                speculative.append(t)
+                t = self._parent_cache.get(t, "")
+
+            for expected, node in zip(speculative, self.get_nodes_batch(speculative)):
+                if expected != token:
+                    break  # 父指针已变化，推测失效，从 token 重新拉取
+                if node is None:
+                    token = ""
+                    break
+                visited.add(token)
+                chain.append(node)
+                self._remember_ancestor(token, node)
+                token = node.get("parent_node_token", "")
         chain.reverse()
         return chain
 
+    def get_ancestor_chains(self, node_tokens: List[str]) -> List[List[Dict[str, Any]]]:
+        """
+        并发获取多个节点的祖先链（如 list_nodes 之后逐个解析路径），各链共用祖先缓存。
+
+        Returns:
+            与 node_tokens 顺序一致的祖先链列表
+        """
+        if len(node_tokens) <= 1:
+            return [self.get_ancestor_chain(t) for t in node_tokens]
+        workers = min(BATCH_MAX_WORKERS, len(node_tokens))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(self.get_ancestor_chain, node_tokens))
+
+    def _cached_ancestor(self, node_token: str) -> Optional[Dict[str, Any]]:
+        """取未过期的缓存节点；过期条目顺带删除。"""
+        with self._ancestor_lock:
+            entry = self._ancestor_cache.get(node_token)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= ANCESTOR_CACHE_TTL:
+                del self._ancestor_cache[node_token]
+                return None
+            self._ancestor_cache.move_to_end(node_token)
+            return entry[1]
+
+    def _remember_ancestor(self, node_token: str, node: Dict[str, Any]) -> None:
+        with self._ancestor_lock:
+            self._ancestor_cache[node_token] = (time.monotonic(), node)
+            self._ancestor_cache.move_to_end(node_token)
+            if len(self._ancestor_cache) > ANCESTOR_CACHE_SIZE:
+                self._ancestor_cache.popitem(last=False)
+
+    def invalidate_ancestors(self) -> None:
+        """清空祖先节点缓存（节点移动 / 删除后自动调用；在别处改名、移动节点后也可手动调用）。"""
+        with self._ancestor_lock:
+            self._ancestor_cache.clear()
+
+    def get_nodes_batch(self, node_tokens: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        并发获取多个节点信息（开放平台没有批量 get_node 接口，这里用线程池并发）。
+
+        Returns:
+            与 node_tokens 顺序一致的列表；获取失败的位置为 None
+        """
+        def fetch(token: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self.get_node(token)
+            except Exception:
+                return None
+
+        if len(node_tokens) <= 1:
+            return [fetch(t) for t in node_tokens]
+        workers = min(BATCH_MAX_WORKERS, len(node_tokens))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fetch, node_tokens))
+
     def get_node(self, node_token: str) -> Dict[str, Any]:
         """
         通过 node_token 获取单个节点的详细信息（无需知道 space_id）。
@@ -200,15 +303,15 @@ class FeishuWikiAPI:
             parent_node_token, has_child 等
         """
         url = f"{FEISHU_API_BASE}/wiki/v2/spaces/get_node"
-        resp = requests.get(
-            url,
+        data = self._request(
+            "GET", url, "获取节点信息",
             params={"token": node_token, "obj_type": "wiki"},
-            headers=self._headers(),
             timeout=15,
         )
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), "获取节点信息")
-        return data.get("data", {}).get("node", {})
+        node = data.get("data", {}).get("node", {})
+        if node.get("node_token"):
+            self._parent_cache[node["node_token"]] = node.get("parent_node_token", "")
+        return node
 
     # ──────────────────────────────────────────
     # 节点写操作（需要 wiki:wiki 权限 + 应用为知识库编辑成员）
@@ -242,9 +345,7 @@ class FeishuWikiAPI:
         if parent_node_token:
             body["parent_node_token"] = parent_node_token
 
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), f"创建节点「{title}」")
+        data = self._request("POST", url, f"创建节点「{title}」", body=body, timeout=15)
         return data.get("data", {}).get("node", {})
 
     def delete_node(self, space_id: str, node_token: str) -> None:
@@ -256,9 +357,28 @@ class FeishuWikiAPI:
             node_token:  要删除的节点 token
         """
         url = f"{FEISHU_API_BASE}/wiki/v2/spaces/{space_id}/nodes/{node_token}"
-        resp = requests.delete(url, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        self._check_resp(resp.json(), f"删除节点 {node_token}")
+        self._request("DELETE", url, f"删除节点 {node_token}", timeout=15)
+        self.invalidate_ancestors()
+
+    def batch_delete_nodes(self, space_id: str, node_tokens: List[str]) -> Dict[str, Optional[str]]:
+        """
+        并发删除多个节点（含各自子节点，不可恢复）。
+
+        Returns:
+            {node_token: None 表示成功，否则为错误信息}
+        """
+        def delete(token: str) -> Optional[str]:
+            try:
+                self.delete_node(space_id, token)
+                return None
+            except Exception as e:
+                return str(e)
+
+        if len(node_tokens) <= 1:
+            return {t: delete(t) for t in node_tokens}
+        workers = min(BATCH_MAX_WORKERS, len(node_tokens))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(node_tokens, pool.map(delete, node_tokens)))
 
     def move_node(
         self,
@@ -278,9 +398,8 @@ class FeishuWikiAPI:
         body: Dict[str, Any] = {"node_token": node_token}
         if target_parent_token:
             body["target_parent_token"] = target_parent_token
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        self._check_resp(resp.json(), f"移动节点 {node_token}")
+        self._request("POST", url, f"移动节点 {node_token}", body=body, timeout=15)
+        self.invalidate_ancestors()
 
     # ──────────────────────────────────────────
     # 文档内容
@@ -297,9 +416,7 @@ class FeishuWikiAPI:
             文档纯文本字符串
         """
         url = f"{FEISHU_API_BASE}/docx/v1/documents/{obj_token}/raw_content"
-        resp = requests.get(url, headers=self._headers(), timeout=15)
-        resp.raise_for_status()
-        data = self._check_resp(resp.json(), "读取文档内容")
+        data = self._request("GET", url, "读取文档内容", timeout=15)
         return data.get("data", {}).get("content", "")
 
     # ──────────────────────────────────────────
@@ -8,8 +8,16 @@
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Optional, Any
 
+# 安装了 feishu_kit 时与其共用磁盘 / Redis token 缓存，多个脚本进程只换取一次 token
+try:
+    from feishu_kit.token_cache import get_tenant_token
+except ImportError:
+    get_tenant_token = None
+
 
 # 飞书 API 基础 URL
 FEISHU_API_BASE = "https://open.feishu.cn/open-apis"
@@ -28,6 +36,7 @@ class FeishuSheetUploader:
         app_secret: Optional[str] = None,
         spreadsheet_token: Optional[str] = None,
         sheet_id: Optional[str] = None,
+        session: Optional[requests.Session] = None,
     ):
         """
         Args:
@@ -35,6 +44,7 @@ class FeishuSheetUploader:
             app_secret: 飞书应用 App Secret，也可通过环境变量 FEISHU_APP_SECRET 设置
             spreadsheet_token: 表格 token（URL 中 sheets/ 后面、? 前面的部分），也可用 FEISHU_SPREADSHEET_TOKEN
             sheet_id: 工作表 ID（URL 中 sheet= 后面的值），也可用 FEISHU_SHEET_ID
+            session: 复用的 requests.Session；留空则自建一个（带连接池与自动重试），close() 时关闭
         """
         self.app_id = app_id or os.environ.get("FEISHU_APP_ID", "")
         self.app_secret = app_secret or os.environ.get("FEISHU_APP_SECRET", "")
@@ -44,12 +54,45 @@ class FeishuSheetUploader:
         self.sheet_id = sheet_id or os.environ.get("FEISHU_SHEET_ID", "")
         self._token: Optional[str] = None
         self._token_expire_at: float = 0
+        self._auth_headers: tuple = ("", {})  # (token, headers)，token 不变时复用同一个 dict
+        self._owns_session = session is None
+        self._session: requests.Session = session or self._build_session()
+
+    @staticmethod
+    def _build_session() -> requests.Session:
+        """keep-alive 连接池 + 限流/5xx 自动重试（POST 不重试，避免重复插入行）。"""
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "PUT"}),
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+        return session
+
+    def close(self) -> None:
+        """关闭自建的 HTTP 会话（外部传入的会话由调用方负责关闭）。"""
+        if self._owns_session:
+            self._session.close()
+
+    def __enter__(self) -> "FeishuSheetUploader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
 
     def _get_token(self) -> str:
         """获取并缓存 tenant_access_token，过期前自动复用。"""
         if self._token and time.time() < self._token_expire_at - 60:
             return self._token
-        resp = requests.post(
+        if get_tenant_token is not None:
+            self._token, self._token_expire_at = get_tenant_token(
+                self.app_id, self.app_secret, self._session
+            )
+            return self._token
+        resp = self._session.post(
             TOKEN_URL,
             json={"app_id": self.app_id, "app_secret": self.app_secret},
             headers={"Content-Type": "application/json"},
@@ -64,10 +107,13 @@ class FeishuSheetUploader:
         return self._token
 
     def _headers(self) -> dict:
-        return {
-            "Authorization": f"Bearer {self._get_token()}",
-            "Content-Type": "application/json; charset=utf-8",
-        }
+        token = self._get_token()
+        if self._auth_headers[0] != token:
+            self._auth_headers = (token, {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json; charset=utf-8",
+            })
+        return self._auth_headers[1]
 
     def write_range(self, range_spec: str, values: List[List[Any]]) -> dict:
         """
@@ -82,7 +128,7 @@ class FeishuSheetUploader:
         """
         url = f"{FEISHU_API_BASE}/sheets/v2/spreadsheets/{self.spreadsheet_token}/values"
         body = {"valueRange": {"range": range_spec, "values": values}}
-        resp = requests.put(url, json=body, headers=self._headers(), timeout=15)
+        resp = self._session.put(url, json=body, headers=self._headers(), timeout=15)
         resp.raise_for_status()
         return resp.json()
 
@@ -108,7 +154,7 @@ class FeishuSheetUploader:
             range_spec = f"{self.sheet_id}!A1"
         url = f"{FEISHU_API_BASE}/sheets/v2/spreadsheets/{self.spreadsheet_token}/values_prepend"
         body = {"valueRange": {"range": range_spec, "values": rows}}
-        resp = requests.post(url, json=body, headers=self._headers(), timeout=15)
+        resp = self._session.post(url, json=body, headers=self._headers(), timeout=15)
         resp.raise_for_status()
         return resp.json()
 
@@ -40,11 +40,26 @@ from typing import Optional
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE = "https://open.feishu.cn/open-apis"
 
+# 整个脚本共用一个会话：复用到 open.feishu.cn 的 TCP/TLS 连接（轮询导入任务时尤其明显）；
+# GET 等幂等请求遇到限流或 5xx 时自动退避重试（POST 不重试，避免重复创建任务）
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
+# 安装了 feishu_kit 时与其共用磁盘 / Redis token 缓存，反复运行脚本时不必每次重新换取 token
+try:
+    from feishu_kit.token_cache import get_tenant_token
+except ImportError:
+    get_tenant_token = None
+
 # 轮询参数
-_POLL_INTERVAL_INIT = 1.5   # 首次等待秒数
+_POLL_INTERVAL_INIT = 0.3   # 首次等待秒数（小文档通常很快完成，起点取小，之后指数退避）
 _POLL_INTERVAL_MAX  = 10.0  # 最大等待间隔（指数退避上限）
 _POLL_TIMEOUT       = 120   # 最长等待秒数
 
@@ -70,7 +85,9 @@ def load_creds(env_path: str = "") -> tuple:
 
 
 def get_token(app_id: str, app_secret: str) -> str:
-    r = requests.post(
+    if get_tenant_token is not None:
+        return get_tenant_token(app_id, app_secret, _SESSION)[0]
+    r = _SESSION.post(
         f"{API_BASE}/auth/v3/tenant_access_token/internal",
         json={"app_id": app_id, "app_secret": app_secret},
         timeout=10,
@@ -100,7 +117,7 @@ def _chk(d: dict, action: str) -> dict:
 
 def get_root_folder_token(tok: str) -> str:
     """获取云空间根目录的 folder_token（上传文件时用作 parent_node）。"""
-    r = requests.get(
+    r = _SESSION.get(
         f"{API_BASE}/drive/explorer/v2/root_folder/meta",
         headers=_hj(tok), timeout=10,
     )
@@ -122,7 +139,7 @@ def upload_file(tok: str, file_path: Path, folder_token: str) -> str:
     _log(f"上传文件: {file_path.name}  ({file_size / 1024:.1f} KB) → 云空间目录 {folder_token}")
 
     with open(file_path, "rb") as f:
-        r = requests.post(
+        r = _SESSION.post(
             f"{API_BASE}/drive/v1/files/upload_all",
             headers=_h(tok),
             data={
@@ -170,7 +187,7 @@ def create_import_task(
         },
     }
     _log(f"创建导入任务: {title}")
-    r = requests.post(
+    r = _SESSION.post(
         f"{API_BASE}/drive/v1/import_tasks",
         headers=_hj(tok), json=payload, timeout=15,
     )
@@ -198,7 +215,7 @@ def poll_import_task(tok: str, ticket: str) -> dict:
         attempt  += 1
         interval  = min(interval * 1.5, _POLL_INTERVAL_MAX)
 
-        r = requests.get(
+        r = _SESSION.get(
             f"{API_BASE}/drive/v1/import_tasks/{ticket}",
             headers=_hj(tok), timeout=10,
         )
@@ -236,7 +253,7 @@ def wiki_url_to_token(url: str) -> str:
 
 
 def get_wiki_node_info(tok: str, node_token: str) -> dict:
-    r = requests.get(
+    r = _SESSION.get(
         f"{API_BASE}/wiki/v2/spaces/get_node",
         params={"token": node_token, "obj_type": "wiki"},
         headers=_hj(tok), timeout=10,
@@ -257,7 +274,7 @@ def move_doc_to_wiki(
     使用异步接口，简单轮询等待完成。
     """
     _log(f"将文档移入 Wiki 节点 {parent_node_token}…")
-    r = requests.post(
+    r = _SESSION.post(
         f"{API_BASE}/wiki/v2/spaces/{space_id}/nodes/move_docs_to_wiki",
         headers=_hj(tok),
         json={
@@ -288,11 +305,11 @@ def _poll_wiki_task(tok: str, task_id: str) -> str:
     轮询 wiki 移动任务直到完成，返回新 wiki node_token。
     move_result[0].node.node_token 即为新节点 token。
     """
-    interval = 1.0
+    interval = _POLL_INTERVAL_INIT
     for _ in range(30):
         time.sleep(interval)
         interval = min(interval * 1.5, 5.0)
-        r = requests.get(
+        r = _SESSION.get(
             f"{API_BASE}/wiki/v2/tasks/{task_id}",
             params={"task_type": "move"},
             headers=_hj(tok), timeout=10,
@@ -114,3 +114,54 @@ class TestBitableNodeDirectApi:
         """repr 应包含 app_token。"""
         node = BitableNode(app_token=test_bitable)
         assert test_bitable in repr(node)
+
+
+# ──────────────────────────────────────────────
+# 离线测试：build 的就绪等待（不访问网络，请求函数被替换为预设结果）
+# ──────────────────────────────────────────────
+
+from feishu_kit import _base
+
+
+class TestBuildReadinessOffline:
+    @pytest.fixture
+    def offline_builder(self, monkeypatch):
+        """假凭证的构建器：建多维表格直接返回，_get 依次抛出 / 返回预设结果，记录建表次数。"""
+        b = FeishuBitableBuilder(app_id="cli_offline", app_secret="offline")
+        monkeypatch.setattr(_base.time, "sleep", lambda s: None)
+        monkeypatch.setattr(b, "create_bitable", lambda name, folder_token="": "app_x")
+        b.gets, b.creates = [], []
+
+        def fake_get(url, action, params=None, timeout=10):
+            result = b.gets.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        def fake_create_table(app_token, table_name, fields=None):
+            b.creates.append(table_name)
+            if isinstance(b.create_result, Exception):
+                raise b.create_result
+            return b.create_result
+
+        monkeypatch.setattr(b, "_get", fake_get)
+        monkeypatch.setattr(b, "create_table", fake_create_table)
+        return b
+
+    def test_waits_for_readiness_then_creates_once(self, offline_builder):
+        """多维表格未就绪时只重试读请求，就绪后建表一次。"""
+        ready = {"code": 0, "data": {"items": [{"table_id": "tbl_default"}]}}
+        offline_builder.gets = [RuntimeError("not ready"), {"code": 0, "data": {"items": []}}, ready]
+        offline_builder.create_result = "tbl_new"
+        result = offline_builder.build("bt", "t", [{"field_name": "名称", "type": FIELD_TYPE_TEXT}], [])
+        assert result == {"app_token": "app_x", "table_id": "tbl_new"}
+        assert offline_builder.creates == ["t"]
+        assert offline_builder.gets == []
+
+    def test_create_table_error_is_not_retried(self, offline_builder):
+        """建表本身的业务错误（如字段配置有误）直接抛出，不重发建表请求。"""
+        offline_builder.gets = [{"code": 0, "data": {"items": [{"table_id": "tbl_default"}]}}]
+        offline_builder.create_result = RuntimeError("新增数据表失败 (code=1254045)")
+        with pytest.raises(RuntimeError):
+            offline_builder.build("bt", "t", [{"field_name": "名称", "type": FIELD_TYPE_TEXT}], [])
+        assert offline_builder.creates == ["t"]
@@ -68,3 +68,17 @@ def test_env_override():
             os.environ.pop("FEISHU_APP_ID", None)
         else:
             os.environ["FEISHU_APP_ID"] = old_val
+
+
+def test_resolve_credentials_env_file_wins_over_shell(monkeypatch, tmp_path):
+    """resolve_credentials 与 load_config 优先级一致：参数 > .env > shell 环境变量。"""
+    from feishu_kit import config
+
+    env_file = tmp_path / ".env"
+    env_file.write_text("FEISHU_APP_ID=id_from_env_file\nFEISHU_APP_SECRET=secret_from_env_file\n")
+    monkeypatch.setattr(config, "get_env_path", lambda: env_file)
+    monkeypatch.setenv("FEISHU_APP_ID", "stale_id_from_shell")
+    monkeypatch.setenv("FEISHU_APP_SECRET", "stale_secret_from_shell")
+
+    assert config.resolve_credentials() == ("id_from_env_file", "secret_from_env_file")
+    assert config.resolve_credentials("explicit_id", "explicit_secret") == ("explicit_id", "explicit_secret")
@@ -122,3 +122,152 @@ class TestSheetNodeApi:
         assert test_sheet in url
         assert "feishu.cn" in url
         print(f"\n  url: {url}")
+
+
+# ──────────────────────────────────────────────
+# 离线测试：分块 / 缓冲逻辑（不访问网络，发送函数被替换为记录调用）
+# ──────────────────────────────────────────────
+
+from feishu_kit import sheet_builder as sb
+from feishu_kit.http_session import GZIP_MIN_BYTES
+
+
+@pytest.fixture
+def offline_builder(monkeypatch):
+    """使用假凭证的构建器，_send_values 只记录 (method, range, 行数)。"""
+    b = FeishuSheetBuilder(app_id="cli_offline", app_secret="offline")
+    sent = []
+
+    def fake_send(method, url, body, action):
+        value_range = body["valueRange"]
+        sent.append((method, value_range["range"], len(value_range["values"])))
+        return {"code": 0}
+
+    monkeypatch.setattr(b, "_send_values", fake_send)
+    b.sent = sent
+    return b
+
+
+class TestChunkingOffline:
+    def test_write_data_chunk_ranges_with_start_col(self, offline_builder):
+        """非 A 起始列时，各块的区间应覆盖连续行且列范围正确。"""
+        num_cols = 3
+        per_chunk = sb.WRITE_CELL_LIMIT // num_cols
+        data = [["x"] * num_cols for _ in range(per_chunk * 2 + 10)]
+        offline_builder.write_data("ss", "s1", data, start_row=2, start_col="C")
+        ranges = sorted(offline_builder.sent, key=lambda s: int(s[1].split("!C")[1].split(":")[0]))
+        assert ranges == [
+            ("PUT", f"s1!C2:E{per_chunk + 1}", per_chunk),
+            ("PUT", f"s1!C{per_chunk + 2}:E{2 * per_chunk + 1}", per_chunk),
+            ("PUT", f"s1!C{2 * per_chunk + 2}:E{2 * per_chunk + 11}", 10),
+        ]
+
+    def test_append_rows_chunks_in_order(self, offline_builder):
+        """append_rows 按 WRITE_ROW_LIMIT 切块，按顺序逐块 POST。"""
+        rows = [[i] for i in range(sb.WRITE_ROW_LIMIT * 2 + 3)]
+        offline_builder.append_rows("ss", "s1", rows)
+        assert [n for _, _, n in offline_builder.sent] == [sb.WRITE_ROW_LIMIT, sb.WRITE_ROW_LIMIT, 3]
+        assert {m for m, _, _ in offline_builder.sent} == {"POST"}
+
+    def test_rows_per_chunk_respects_both_limits(self):
+        assert FeishuSheetBuilder._rows_per_chunk(1) == min(sb.WRITE_ROW_LIMIT, sb.WRITE_CELL_LIMIT)
+        assert FeishuSheetBuilder._rows_per_chunk(7) == sb.WRITE_CELL_LIMIT // 7
+        assert FeishuSheetBuilder._rows_per_chunk(sb.WRITE_CELL_LIMIT * 2) == 1
+
+
+class TestRowBufferOffline:
+    @pytest.fixture
+    def appended(self, offline_builder, monkeypatch):
+        calls = []
+        monkeypatch.setattr(
+            offline_builder, "append_rows", lambda token, sheet_id, rows: calls.append(list(rows)),
+        )
+        return calls
+
+    def test_flush_at_cell_limit(self, offline_builder, appended):
+        """缓冲的单元格数达到 WRITE_CELL_LIMIT 时恰好写出一次。"""
+        width = 10
+        rows_at_limit = sb.WRITE_CELL_LIMIT // width
+        buf = offline_builder.buffered_append("ss", "s1", max_delay=3600)
+        for _ in range(rows_at_limit - 1):
+            buf.add(["v"] * width)
+        assert appended == [] and len(buf) == rows_at_limit - 1
+        buf.add(["v"] * width)
+        assert [len(rows) for rows in appended] == [rows_at_limit]
+        assert len(buf) == 0
+
+    def test_flush_on_exit_with_exception(self, offline_builder, appended):
+        """with 块内抛异常时仍写出已缓冲的行，异常照常抛出。"""
+        with pytest.raises(ValueError):
+            with offline_builder.buffered_append("ss", "s1", max_delay=3600) as buf:
+                buf.add(["a", 1])
+                buf.add(["b", 2])
+                raise ValueError("boom")
+        assert appended == [[["a", 1], ["b", 2]]]
+
+    def test_empty_buffer_does_not_append(self, offline_builder, appended):
+        with offline_builder.buffered_append("ss", "s1"):
+            pass
+        assert appended == []
+
+
+class TestAsRowsOffline:
+    def test_plain_lists_pass_through(self):
+        data = [["a", 1], ["b", None]]
+        assert sb._as_rows(data) is data
+
+    def test_ndarray_nan_becomes_none(self):
+        np = pytest.importorskip("numpy")
+        arr = np.array([[1.0, np.nan], [np.nan, 2.5]])
+        assert sb._as_rows(arr) == [[1.0, None], [None, 2.5]]
+
+    def test_dataframe_header_row(self):
+        pd = pytest.importorskip("pandas")
+        df = pd.DataFrame({"x": [1.0, float("nan")], "y": ["a", "b"]})
+        assert sb._as_rows(df) == [["x", "y"], [1.0, "a"], [None, "b"]]
+        assert sb._as_rows(df, header=False) == [[1.0, "a"], [None, "b"]]
+
+
+class _FakeResp:
+    def __init__(self, status_code, content=b'{"code": 0}'):
+        self.status_code = status_code
+        self.content = content
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class TestGzipFallbackOffline:
+    @pytest.fixture
+    def gz_builder(self, monkeypatch):
+        """_session.request 依次返回预设响应，并记录每次请求是否压缩。"""
+        b = FeishuSheetBuilder(app_id="cli_offline", app_secret="offline")
+        monkeypatch.setattr(b, "_headers", lambda: {})
+        b.responses, b.encodings = [], []
+
+        def fake_request(method, url, data=None, headers=None, timeout=None):
+            b.encodings.append(headers.get("Content-Encoding"))
+            return b.responses.pop(0)
+
+        monkeypatch.setattr(b._session, "request", fake_request)
+        return b
+
+    def _big_body(self):
+        return {"valueRange": {"range": "s1!A1:A1", "values": [["x" * (GZIP_MIN_BYTES + 1)]]}}
+
+    def test_business_400_keeps_gzip_and_is_not_resent(self, gz_builder):
+        """普通的 400 业务错误不应关闭压缩，也不应重发同一个无效请求。"""
+        gz_builder.responses = [_FakeResp(400, b'{"code": 90202, "msg": "invalid range"}')]
+        with pytest.raises(RuntimeError):
+            gz_builder._send_values("PUT", "u", self._big_body(), "写入")
+        assert gz_builder.encodings == ["gzip"]
+        assert gz_builder._gzip is True
+
+    @pytest.mark.parametrize("resp", [_FakeResp(415), _FakeResp(400, b"unsupported Content-Encoding: gzip")])
+    def test_encoding_rejection_falls_back_to_plain(self, gz_builder, resp):
+        """411/415 或提到编码的 400：之后都发未压缩请求体，本次立即重发。"""
+        gz_builder.responses = [resp, _FakeResp(200)]
+        gz_builder._send_values("PUT", "u", self._big_body(), "写入")
+        assert gz_builder.encodings == ["gzip", None]
+        assert gz_builder._gzip is False
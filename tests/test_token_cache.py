@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+测试：feishu_kit.token_cache 跨实例 / 跨进程 token 缓存
+不访问网络：_fetch 被替换为计数的假实现，缓存目录指向 pytest 临时目录。
+"""
+
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from feishu_kit import token_cache as tc
+
+
+APP_ID, APP_SECRET = "cli_test", "secret_test"
+
+
+@pytest.fixture
+def fetches(monkeypatch, tmp_path):
+    """隔离进程内缓存、缓存目录指向临时目录，返回 _fetch 的调用记录。"""
+    calls = []
+
+    def fake_fetch(app_id, app_secret, session):
+        calls.append(app_id)
+        time.sleep(0.05)  # 放大并发窗口
+        return f"t-{len(calls)}", time.time() + 7200
+
+    monkeypatch.setattr(tc, "_memory", {})
+    monkeypatch.setattr(tc, "_fetch", fake_fetch)
+    monkeypatch.setenv("FEISHU_TOKEN_CACHE", str(tmp_path))
+    return calls
+
+
+def _cache_file(tmp_path):
+    return tmp_path / f"{tc.cache_key(APP_ID, APP_SECRET)}.json"
+
+
+def test_file_cache_written_with_0600(fetches, tmp_path):
+    """换取的 token 写入 <缓存目录>/<hash>.json，权限 0600，不残留临时文件。"""
+    token, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    path = _cache_file(tmp_path)
+    assert path.exists()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert tc._read_file(path)[0] == token
+    assert not path.with_suffix(".tmp").exists()
+    assert APP_ID not in path.name, "文件名不应暴露 app_id"
+
+
+def test_file_cache_shared_across_processes(fetches, tmp_path, monkeypatch):
+    """进程内缓存清空后（模拟新进程）直接读磁盘，不再换取。"""
+    first, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    monkeypatch.setattr(tc, "_memory", {})
+    second, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    assert first == second
+    assert len(fetches) == 1
+
+
+def test_file_lock_fetches_once_under_concurrency(fetches, tmp_path):
+    """多个调用方同时未命中时，文件锁保证只有一个去换取 token。"""
+    results = []
+
+    def worker():
+        results.append(tc._via_file(tmp_path, tc.cache_key(APP_ID, APP_SECRET), APP_ID, APP_SECRET, None))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(fetches) == 1
+    assert len({token for token, _ in results}) == 1
+
+
+def test_expired_file_entry_is_refetched(fetches, tmp_path):
+    """磁盘上距过期不足 REFRESH_MARGIN 的 token 不会被返回。"""
+    tc._write_file(_cache_file(tmp_path), "stale", time.time() + tc.REFRESH_MARGIN - 1)
+    token, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    assert token != "stale"
+    assert len(fetches) == 1
+
+
+def test_unwritable_cache_dir_falls_back_to_memory(fetches, tmp_path, monkeypatch):
+    """缓存目录不可用（OSError）时退化为仅进程内缓存。"""
+    blocker = tmp_path / "not_a_dir"
+    blocker.write_text("")
+    monkeypatch.setenv("FEISHU_TOKEN_CACHE", str(blocker / "cache"))
+    first, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    second, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    assert first == second
+    assert len(fetches) == 1
+
+
+def test_off_backend_skips_disk(fetches, tmp_path, monkeypatch):
+    """FEISHU_TOKEN_CACHE=off 时不读写磁盘，仅保留进程内缓存。"""
+    monkeypatch.setenv("FEISHU_TOKEN_CACHE", "off")
+    tc.get_tenant_token(APP_ID, APP_SECRET)
+    tc.get_tenant_token(APP_ID, APP_SECRET)
+    assert len(fetches) == 1
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_invalidate_drops_memory_and_file(fetches, tmp_path):
+    """invalidate_tenant_token 同时丢弃进程内与磁盘缓存，下次重新换取。"""
+    first, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    tc.invalidate_tenant_token(APP_ID, APP_SECRET)
+    assert not _cache_file(tmp_path).exists()
+    second, _ = tc.get_tenant_token(APP_ID, APP_SECRET)
+    assert second != first
+    assert len(fetches) == 2
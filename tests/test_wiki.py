@@ -121,3 +121,90 @@ class TestCreateDeleteNode:
         # 验证节点已被删除（再查询应抛出异常）
         with pytest.raises((RuntimeError, Exception)):
             api.get_node(node_token)
+
+
+# ──────────────────────────────────────────────
+# 离线测试：祖先链推测 / 批量获取 / 祖先缓存（不访问网络，get_node 被替换为查本地树）
+# ──────────────────────────────────────────────
+
+from feishu_kit import wiki_api as wa
+
+
+@pytest.fixture
+def offline_api(monkeypatch):
+    """假凭证的 API：节点树 root ← mid ← leaf，get_node 查 api.tree 并记录调用，时钟可拨动。"""
+    a = FeishuWikiAPI(app_id="cli_offline", app_secret="offline")
+    a.tree = {
+        "root": "",
+        "mid":  "root",
+        "leaf": "mid",
+    }
+    a.calls = []
+    a.clock = [1000.0]
+
+    def fake_get_node(token):
+        a.calls.append(token)
+        if token not in a.tree:
+            raise RuntimeError(f"获取节点信息 失败: {token}")
+        node = {"node_token": token, "parent_node_token": a.tree[token], "title": token}
+        a._parent_cache[token] = node["parent_node_token"]
+        return node
+
+    monkeypatch.setattr(a, "get_node", fake_get_node)
+    monkeypatch.setattr(wa.time, "monotonic", lambda: a.clock[0])
+    return a
+
+
+def _tokens(chain):
+    return [n["node_token"] for n in chain]
+
+
+class TestAncestorChainOffline:
+    def test_get_nodes_batch_keeps_order(self, offline_api):
+        """结果与传入顺序一致，无效 token 的位置为 None。"""
+        result = offline_api.get_nodes_batch(["leaf", "root", "INVALID", "mid"])
+        assert [n and n["node_token"] for n in result] == ["leaf", "root", None, "mid"]
+
+    def test_chain_from_root_to_node(self, offline_api):
+        assert _tokens(offline_api.get_ancestor_chain("leaf")) == ["root", "mid", "leaf"]
+
+    def test_invalid_token_gives_empty_chain(self, offline_api):
+        assert offline_api.get_ancestor_chain("INVALID") == []
+
+    def test_speculation_fetches_known_chain_in_one_batch(self, offline_api, monkeypatch):
+        """父指针已知时整条链作为一批推测拉取。"""
+        offline_api._parent_cache.update(offline_api.tree)
+        batches = []
+        real_batch = offline_api.get_nodes_batch
+        monkeypatch.setattr(offline_api, "get_nodes_batch", lambda ts: batches.append(list(ts)) or real_batch(ts))
+        assert _tokens(offline_api.get_ancestor_chain("leaf")) == ["root", "mid", "leaf"]
+        assert batches == [["leaf", "mid", "root"]]
+
+    def test_divergent_speculation_follows_real_parent(self, offline_api):
+        """推测的父指针已过时（节点被移动）时，从分歧处按真实父节点继续回溯。"""
+        offline_api.tree["old_parent"] = "root"
+        offline_api._parent_cache.update({"leaf": "old_parent", "old_parent": "root"})
+        assert _tokens(offline_api.get_ancestor_chain("leaf")) == ["root", "mid", "leaf"]
+
+    def test_ancestors_cached_until_ttl(self, offline_api):
+        """祖先节点在 ANCESTOR_CACHE_TTL 内取自缓存，过期后重新获取；起始节点总是重新获取。"""
+        offline_api.get_ancestor_chain("leaf")
+        offline_api.calls.clear()
+
+        offline_api.clock[0] += wa.ANCESTOR_CACHE_TTL - 1
+        assert _tokens(offline_api.get_ancestor_chain("leaf")) == ["root", "mid", "leaf"]
+        assert offline_api.calls == ["leaf"]
+
+        offline_api.calls.clear()
+        offline_api.clock[0] += wa.ANCESTOR_CACHE_TTL
+        offline_api.get_ancestor_chain("leaf")
+        assert sorted(offline_api.calls) == ["leaf", "mid", "root"]
+
+    def test_invalidate_ancestors_drops_cache(self, offline_api):
+        """invalidate_ancestors 之后祖先节点重新获取，能看到期间的改动。"""
+        offline_api.get_ancestor_chain("leaf")
+        offline_api.tree["mid"] = ""   # mid 被移动到顶层
+        offline_api.invalidate_ancestors()
+        offline_api.calls.clear()
+        assert _tokens(offline_api.get_ancestor_chain("leaf")) == ["mid", "leaf"]
+        assert "mid" in offline_api.calls
@@ -32,9 +32,18 @@ from pathlib import Path
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE = "https://open.feishu.cn/open-apis"
 
+# 整个脚本共用一个会话：复用到 open.feishu.cn 的 TCP/TLS 连接；
+# GET 等幂等请求遇到限流或 5xx 时自动退避重试（POST / PATCH 不重试，避免重复写入）
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
 
 # ── 凭证与 Token ─────────────────────────────────────────────────────────────
 
@@ -50,7 +59,7 @@ def load_credentials(env_path: str = "") -> tuple[str, str]:
 
 
 def get_tenant_token(app_id: str, app_secret: str) -> str:
-    resp = requests.post(
+    resp = _SESSION.post(
         f"{API_BASE}/auth/v3/tenant_access_token/internal",
         json={"app_id": app_id, "app_secret": app_secret},
         timeout=10,
@@ -88,7 +97,7 @@ def wiki_url_to_token(url: str) -> str:
 
 def resolve_wiki_token(token: str, node_token: str) -> str:
     """通过 wiki node_token 查询对应文档的 document_id（obj_token）。"""
-    resp = requests.get(
+    resp = _SESSION.get(
         f"{API_BASE}/wiki/v2/spaces/get_node",
         params={"token": node_token, "obj_type": "wiki"},
         headers=json_headers(token),
@@ -105,7 +114,7 @@ def resolve_wiki_token(token: str, node_token: str) -> str:
 
 def get_root_children_count(token: str, document_id: str) -> int:
     """获取根 Block 当前的子节点数量，用于计算追加位置。"""
-    resp = requests.get(
+    resp = _SESSION.get(
         f"{API_BASE}/docx/v1/documents/{document_id}/blocks/{document_id}",
         headers=json_headers(token),
         timeout=10,
@@ -125,7 +134,7 @@ def create_empty_file_block(token: str, document_id: str, file_name: str) -> str
     内层 block_id 才是后续 replace_file 的目标。
     """
     index = get_root_children_count(token, document_id)
-    resp = requests.post(
+    resp = _SESSION.post(
         f"{API_BASE}/docx/v1/documents/{document_id}/blocks/{document_id}/children",
         headers=json_headers(token),
         json={
@@ -158,7 +167,7 @@ def upload_media(token: str, inner_block_id: str, file_path: Path, mime: str) ->
     file_size = file_path.stat().st_size
     _log(f"上传文件: {file_path.name}  ({file_size / 1024 / 1024:.2f} MB)")
     with open(file_path, "rb") as f:
-        resp = requests.post(
+        resp = _SESSION.post(
             f"{API_BASE}/drive/v1/medias/upload_all",
             headers=auth_headers(token),
             data={
@@ -181,7 +190,7 @@ def replace_file(token: str, document_id: str, inner_block_id: str, file_token:
     """
     Step 3：patch replace_file，将 file_token 正式写入 Block，文件变为可访问状态。
     """
-    resp = requests.patch(
+    resp = _SESSION.patch(
         f"{API_BASE}/docx/v1/documents/{document_id}/blocks/{inner_block_id}",
         headers=json_headers(token),
         json={"replace_file": {"token": file_token}},
@@ -11,6 +11,8 @@ import sys
 import time
 import requests
 from pathlib import Path
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 # ── 加载 .env ───────────────────────────────────────────────────────────────
@@ -21,6 +23,13 @@ APP_ID     = os.environ["FEISHU_APP_ID"]
 APP_SECRET = os.environ["FEISHU_APP_SECRET"]
 API_BASE   = "https://open.feishu.cn/open-apis"
 
+# 整个脚本共用一个会话：复用到 open.feishu.cn 的 TCP/TLS 连接；
+# GET 等幂等请求遇到限流或 5xx 时自动退避重试（POST / PATCH 不重试，避免重复写入）
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
 # ── 参数 ────────────────────────────────────────────────────────────────────
 PDF_PATH        = Path("/home/test/.openclaw/workspace/GenAI_for_Systems.pdf")
 WIKI_NODE_TOKEN = "N5ZtwQB7NiGTETkPliacVB32n9f"   # URL 中 /wiki/ 后的部分
@@ -28,7 +37,7 @@ WIKI_NODE_TOKEN = "N5ZtwQB7NiGTETkPliacVB32n9f"   # URL 中 /wiki/ 后的部分
 
 # ── Token ───────────────────────────────────────────────────────────────────
 def get_token() -> str:
-    resp = requests.post(
+    resp = _SESSION.post(
         f"{API_BASE}/auth/v3/tenant_access_token/internal",
         json={"app_id": APP_ID, "app_secret": APP_SECRET},
         timeout=10,
@@ -54,7 +63,7 @@ def check(data: dict, action: str) -> dict:
 def get_doc_token(token: str, node_token: str) -> str:
     """从 Wiki 节点信息中提取对应文档的 obj_token。"""
     url = f"{API_BASE}/wiki/v2/spaces/get_node"
-    resp = requests.get(
+    resp = _SESSION.get(
         url,
         params={"token": node_token, "obj_type": "wiki"},
         headers={**headers(token), "Content-Type": "application/json"},
@@ -90,7 +99,7 @@ def create_empty_file_block(token: str, document_id: str, file_name: str) -> str
         ],
     }
     print(f"\n[+] 在文档中创建空文件 Block …")
-    resp = requests.post(
+    resp = _SESSION.post(
         url,
         headers={**headers(token), "Content-Type": "application/json"},
         json=payload,
@@ -117,7 +126,7 @@ def upload_media(token: str, inner_block_id: str, pdf_path: Path) -> str:
     print(f"\n[↑] 上传素材: {pdf_path.name}  ({file_size/1024/1024:.2f} MB)")
 
     with open(pdf_path, "rb") as f:
-        resp = requests.post(
+        resp = _SESSION.post(
             url,
             headers=headers(token),
             data={
@@ -142,7 +151,7 @@ def insert_file_block(token: str, document_id: str, inner_block_id: str, file_to
     url = f"{API_BASE}/docx/v1/documents/{document_id}/blocks/{inner_block_id}"
     payload = {"replace_file": {"token": file_token}}
     print(f"\n[✎] 关联文件 token 到 Block …")
-    resp = requests.patch(
+    resp = _SESSION.patch(
         url,
         headers={**headers(token), "Content-Type": "application/json"},
         json=payload,